@@ -18,6 +18,12 @@ class Config(object):
     SESSION_TYPE = "redis"
     # WTF_CSRF_TIME_LIMIT this wasn't set causing inconsistenices with sessions
     PERMANENT_SESSION_LIFETIME = int(os.getenv("PERMANENT_SESSION_LIFETIME", 43200))
+    # Sessions expire PERMANENT_SESSION_LIFETIME after the last request.  With SESSION_SLIDING_EXPIRY on, a request
+    # that doesn't change the session only moves its expiry on in redis, rather than writing the whole session again
+    SESSION_SLIDING_EXPIRY = bool(strtobool(os.getenv("SESSION_SLIDING_EXPIRY", "True")))
+    # Paths handled without a session, CSRF checks or loading the user, so static assets and the health probe don't
+    # call redis.  One ending with a / covers everything below it, otherwise only that path is
+    SESSIONLESS_PATHS = os.getenv("SESSIONLESS_PATHS", "/static/,/info")
     WTF_CSRF_TIME_LIMIT = int(os.getenv("WTF_CSRF_TIME_LIMIT", PERMANENT_SESSION_LIFETIME))
     REDIS_SERVICE = os.getenv("REDIS_SERVICE")
     REDIS_HOST = os.getenv("REDIS_HOST")
@@ -40,6 +46,122 @@ class Config(object):
         "RESPONSE_OPERATIONS_UI_URL", f"{RESPONSE_OPERATIONS_UI_HOST}:{RESPONSE_OPERATIONS_UI_PORT}"
     )
 
+    # Pooled keep-alive sessions used for every call to a backend service, one pool per *_URL entry
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+    HTTP_POOL_BLOCK = strtobool(os.getenv("HTTP_POOL_BLOCK", "False"))
+    HTTP_KEEP_ALIVE = strtobool(os.getenv("HTTP_KEEP_ALIVE", "True"))
+
+    # Maximum number of threads, per worker, used to make independent backend calls at the same time.  Set it to 1 to
+    # make every call one after another.
+    FAN_OUT_MAX_WORKERS = int(os.getenv("FAN_OUT_MAX_WORKERS", 8))
+
+    # Seconds a worker waits for another worker already making the same backend read (see common/single_flight.py)
+    # before making it itself, 0 stops workers coordinating
+    SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", 2))
+
+    # Seconds a collection exercise is cached in redis for, 0 turns the cache off.  Live and ended collection exercises
+    # rarely change, so are kept for longer than those still being set up, though live ones not past their scheduled end
+    COLLECTION_EXERCISE_CACHE_EXPIRY = int(os.getenv("COLLECTION_EXERCISE_CACHE_EXPIRY", 60))
+    COLLECTION_EXERCISE_LIVE_CACHE_EXPIRY = int(os.getenv("COLLECTION_EXERCISE_LIVE_CACHE_EXPIRY", 3600))
+    COLLECTION_EXERCISE_ENDED_CACHE_EXPIRY = int(os.getenv("COLLECTION_EXERCISE_ENDED_CACHE_EXPIRY", 86400))
+
+    # The codec cached values are written with (see common/cache_codec.py), and the size in bytes above which they're
+    # compressed.  Every codec can always be read, but workers on releases before the codecs were added only read 0
+    # (plain JSON), so it stays the default until they've all been replaced.  The following release can then write 2
+    CACHE_CODEC_VERSION = int(os.getenv("CACHE_CODEC_VERSION", 0))
+    CACHE_COMPRESSION_THRESHOLD = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", 1024))
+
+    # Number of surveys `flask cache warm` fills the cache for at the same time.  CACHE_WARM_ON_START has one gunicorn
+    # worker warm the cache in the background when the workers start (see gunicorn.conf.py)
+    CACHE_WARM_MAX_WORKERS = int(os.getenv("CACHE_WARM_MAX_WORKERS", 4))
+    CACHE_WARM_ON_START = bool(strtobool(os.getenv("CACHE_WARM_ON_START", "False")))
+
+    # Seconds a business looked up in bulk is cached in redis for, 0 turns the cache off
+    BUSINESS_CACHE_EXPIRY = int(os.getenv("BUSINESS_CACHE_EXPIRY", 60))
+
+    # The survey index is held in memory by each worker for SURVEY_INDEX_LOCAL_EXPIRY seconds, in front of the survey
+    # list in redis.  Turning SURVEY_INDEX_REDIS_ENABLED off makes each worker load it from the survey service itself
+    SURVEY_INDEX_REDIS_ENABLED = bool(strtobool(os.getenv("SURVEY_INDEX_REDIS_ENABLED", "True")))
+    SURVEY_INDEX_LOCAL_EXPIRY = int(os.getenv("SURVEY_INDEX_LOCAL_EXPIRY", 60))
+
+    # Hits, misses, errors, latency and refresh time of each cache namespace.  Each worker counts them in memory and
+    # adds them to the counters in redis at most once every CACHE_METRICS_FLUSH_INTERVAL seconds.  They're shown on
+    # /info/metrics
+    CACHE_METRICS_ENABLED = bool(strtobool(os.getenv("CACHE_METRICS_ENABLED", "True")))
+    CACHE_METRICS_FLUSH_INTERVAL = int(os.getenv("CACHE_METRICS_FLUSH_INTERVAL", 10))
+
+    # Connect and read timeouts, in seconds, for calls to the backend services.  These can be overridden per service
+    # with <SERVICE>_CONNECT_TIMEOUT and <SERVICE>_READ_TIMEOUT, named after the service's *_URL entry.
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 3.05))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 30))
+    # Total time a request can spend waiting on backend services, kept below the gunicorn worker timeout
+    HTTP_REQUEST_BUDGET = float(os.getenv("HTTP_REQUEST_BUDGET", 50))
+
+    # Retries for idempotent calls (GET, HEAD, OPTIONS) to the backend services that fail to connect or get one of
+    # HTTP_RETRY_STATUS_CODES back.  Attempts include the first call.  The backoff before each retry is a random time up
+    # to HTTP_RETRY_BACKOFF doubled for every attempt so far, capped at HTTP_RETRY_MAX_BACKOFF.  These can be overridden
+    # per service in the same way as the timeouts, e.g. PARTY_RETRY_ATTEMPTS or CASE_RETRY_STATUS_CODES.
+    HTTP_RETRY_ENABLED = strtobool(os.getenv("HTTP_RETRY_ENABLED", "True"))
+    HTTP_RETRY_ATTEMPTS = int(os.getenv("HTTP_RETRY_ATTEMPTS", 3))
+    HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", 0.1))
+    HTTP_RETRY_MAX_BACKOFF = float(os.getenv("HTTP_RETRY_MAX_BACKOFF", 1))
+    HTTP_RETRY_STATUS_CODES = os.getenv("HTTP_RETRY_STATUS_CODES", "502,503,504")
+
+    # Client side http cache, shared between workers through redis, for GETs to the services (named by their *_URL
+    # entry) whose data rarely changes.  Responses are kept for HTTP_CACHE_EXPIRY seconds but are only used without
+    # asking the service again while its Cache-Control allows, otherwise they're revalidated with its ETag or
+    # Last-Modified.
+    HTTP_CACHE_ENABLED = strtobool(os.getenv("HTTP_CACHE_ENABLED", "True"))
+    HTTP_CACHE_SERVICES = os.getenv(
+        "HTTP_CACHE_SERVICES", "SURVEY_URL,COLLECTION_EXERCISE_URL,COLLECTION_INSTRUMENT_URL"
+    )
+    HTTP_CACHE_EXPIRY = int(os.getenv("HTTP_CACHE_EXPIRY", 86400))
+    HTTP_CACHE_MAX_ENTRY_BYTES = int(os.getenv("HTTP_CACHE_MAX_ENTRY_BYTES", 1048576))
+
+    # Circuit breakers for the backend services, with their state shared between workers through redis.  Each worker
+    # reads the state at most once a sync interval and batches its successful calls into one write per interval, so a
+    # healthy service costs a worker two redis round trips per service per interval rather than two per call.  Failed
+    # calls and opening or closing a circuit are still written straight away
+    CIRCUIT_BREAKER_ENABLED = strtobool(os.getenv("CIRCUIT_BREAKER_ENABLED", "True"))
+    CIRCUIT_BREAKER_WINDOW_SECONDS = int(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", 30))
+    CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", 10))
+    CIRCUIT_BREAKER_FAILURE_RATE = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", 0.5))
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", 10))
+    CIRCUIT_BREAKER_OPEN_SECONDS = int(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", 30))
+    CIRCUIT_BREAKER_SYNC_SECONDS = float(os.getenv("CIRCUIT_BREAKER_SYNC_SECONDS", 1))
+
+    BANNER_SERVICE_CONNECT_TIMEOUT = float(os.getenv("BANNER_SERVICE_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    BANNER_SERVICE_READ_TIMEOUT = float(os.getenv("BANNER_SERVICE_READ_TIMEOUT", 5))
+    CASE_CONNECT_TIMEOUT = float(os.getenv("CASE_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    CASE_READ_TIMEOUT = float(os.getenv("CASE_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+    COLLECTION_EXERCISE_CONNECT_TIMEOUT = float(os.getenv("COLLECTION_EXERCISE_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    COLLECTION_EXERCISE_READ_TIMEOUT = float(os.getenv("COLLECTION_EXERCISE_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+    COLLECTION_INSTRUMENT_CONNECT_TIMEOUT = float(
+        os.getenv("COLLECTION_INSTRUMENT_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT)
+    )
+    COLLECTION_INSTRUMENT_READ_TIMEOUT = float(os.getenv("COLLECTION_INSTRUMENT_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+    PARTY_CONNECT_TIMEOUT = float(os.getenv("PARTY_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    PARTY_READ_TIMEOUT = float(os.getenv("PARTY_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+    SAMPLE_CONNECT_TIMEOUT = float(os.getenv("SAMPLE_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    SAMPLE_READ_TIMEOUT = float(os.getenv("SAMPLE_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+    SECURE_MESSAGE_CONNECT_TIMEOUT = float(os.getenv("SECURE_MESSAGE_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    SECURE_MESSAGE_READ_TIMEOUT = float(os.getenv("SECURE_MESSAGE_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+    SURVEY_CONNECT_TIMEOUT = float(os.getenv("SURVEY_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    SURVEY_READ_TIMEOUT = float(os.getenv("SURVEY_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+    UAA_SERVICE_CONNECT_TIMEOUT = float(os.getenv("UAA_SERVICE_CONNECT_TIMEOUT", HTTP_CONNECT_TIMEOUT))
+    UAA_SERVICE_READ_TIMEOUT = float(os.getenv("UAA_SERVICE_READ_TIMEOUT", HTTP_READ_TIMEOUT))
+
+    BANNER_SERVICE_RETRY_ATTEMPTS = int(os.getenv("BANNER_SERVICE_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    CASE_RETRY_ATTEMPTS = int(os.getenv("CASE_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    COLLECTION_EXERCISE_RETRY_ATTEMPTS = int(os.getenv("COLLECTION_EXERCISE_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    COLLECTION_INSTRUMENT_RETRY_ATTEMPTS = int(os.getenv("COLLECTION_INSTRUMENT_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    PARTY_RETRY_ATTEMPTS = int(os.getenv("PARTY_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    SAMPLE_RETRY_ATTEMPTS = int(os.getenv("SAMPLE_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    SECURE_MESSAGE_RETRY_ATTEMPTS = int(os.getenv("SECURE_MESSAGE_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    SURVEY_RETRY_ATTEMPTS = int(os.getenv("SURVEY_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+    UAA_SERVICE_RETRY_ATTEMPTS = int(os.getenv("UAA_SERVICE_RETRY_ATTEMPTS", HTTP_RETRY_ATTEMPTS))
+
     # Service Configs
     CASE_URL = os.getenv("CASE_URL")
     MAX_CASES_RETRIEVED_PER_SURVEY = os.getenv("MAX_CASES_RETRIEVED_PER_SURVEY", 12)
@@ -90,6 +212,14 @@ class Config(object):
     UAA_SERVICE_URL = os.getenv("UAA_SERVICE_URL")
     UAA_CLIENT_ID = os.getenv("UAA_CLIENT_ID")
     UAA_CLIENT_SECRET = os.getenv("UAA_CLIENT_SECRET")
+    # The keys UAA signs tokens with are shared between workers through redis and fetched again in the background once
+    # they're UAA_SIGNING_KEY_REFRESH_INTERVAL seconds old.  A token signed with a key that isn't known makes them be
+    # fetched straight away, but no more than once every UAA_SIGNING_KEY_REFETCH_INTERVAL seconds
+    UAA_SIGNING_KEY_REFRESH_INTERVAL = int(os.getenv("UAA_SIGNING_KEY_REFRESH_INTERVAL", 300))
+    UAA_SIGNING_KEY_REFETCH_INTERVAL = int(os.getenv("UAA_SIGNING_KEY_REFETCH_INTERVAL", 30))
+    # The admin client credentials token is shared between workers through redis until this many seconds before it
+    # expires
+    UAA_ADMIN_TOKEN_EXPIRY_MARGIN = int(os.getenv("UAA_ADMIN_TOKEN_EXPIRY_MARGIN", 60))
 
     EMAIL_TOKEN_SALT = os.getenv("EMAIL_TOKEN_SALT", "aardvark")
     # 24 hours in seconds
@@ -183,6 +313,14 @@ class TestingConfig(DevelopmentConfig):
     SESSION_TYPE = "filesystem"
     SESSION_PERMANENT = False
     SEND_EMAIL_TO_GOV_NOTIFY = True
+    CIRCUIT_BREAKER_ENABLED = False
+    HTTP_RETRY_ENABLED = False
+    SINGLE_FLIGHT_WAIT_SECONDS = 0
+    HTTP_CACHE_ENABLED = False
+    COLLECTION_EXERCISE_CACHE_EXPIRY = 0
+    BUSINESS_CACHE_EXPIRY = 0
+    SURVEY_INDEX_REDIS_ENABLED = False
+    CACHE_METRICS_ENABLED = False
     UAA_PUBLIC_KEY = """-----BEGIN PUBLIC KEY-----
 MFswDQYJKoZIhvcNAQEBBQADSgAwRwJAeeLysb2I2n86Ya+W3vqCxUM1j5sRdlFN
 U9yf2b38ppt3rf2xHJYTfjSvezXOMEJusFbhH9LeH4V8kr4k4ZmdewIDAQAB
@@ -0,0 +1,7 @@
+from response_operations_ui.common.cache_warmer import warm_cache_in_background
+
+
+def post_worker_init(worker):
+    """Has one worker warm the cache once the workers have started, if CACHE_WARM_ON_START is set"""
+    if worker.wsgi.config["CACHE_WARM_ON_START"]:
+        warm_cache_in_background(worker.wsgi)
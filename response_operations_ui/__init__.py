@@ -12,7 +12,27 @@ from jinja2 import ChainableUndefined
 from structlog import wrap_logger
 
 from config import Config
+from response_operations_ui.common.cache_metrics import CacheMetrics
+from response_operations_ui.common.cache_warmer import cache_cli
+from response_operations_ui.common.deadline import start_deadline
+from response_operations_ui.common.fan_out import in_fan_out
+from response_operations_ui.common.http_session import ServiceSessionRegistry
 from response_operations_ui.common.jinja_filters import filter_blueprint
+from response_operations_ui.common.request_memo import (
+    log_duplicates_eliminated,
+    start_request_memo,
+)
+from response_operations_ui.common.sessionless import (
+    SessionlessPathsInterface,
+    get_sessionless_paths,
+    is_sessionless_request,
+)
+from response_operations_ui.common.sliding_session import (
+    create_sliding_session_interface,
+)
+from response_operations_ui.common.survey_index import SurveyIndex
+from response_operations_ui.common.uaa import SigningKeyCache
+from response_operations_ui.controllers.survey_controllers import get_business_surveys
 from response_operations_ui.controllers.uaa_controller import user_has_permission
 from response_operations_ui.logger_config import logger_initial_config
 from response_operations_ui.oidc.gcp_oidc import OIDCCredentialsServiceGCP
@@ -97,6 +117,12 @@ def create_app(config_name=None):
 
         app.redis = fakeredis.FakeRedis()
 
+    app.cache_metrics = CacheMetrics(app.config)
+    app.http_sessions = ServiceSessionRegistry(app)
+    app.survey_index = SurveyIndex(get_business_surveys)
+    app.uaa_signing_keys = SigningKeyCache()
+    app.sessionless_paths = get_sessionless_paths(app)
+
     if not app.config["DEBUG"]:
         app.wsgi_app = GCPLoadBalancer(app.wsgi_app)
 
@@ -126,8 +152,14 @@ def create_app(config_name=None):
 
     @app.before_request
     def before_request():
-        session.permanent = True  # set session to use PERMANENT_SESSION_LIFETIME
-        session.modified = True  # reset the session timer on every request
+        if is_sessionless_request(app):
+            return
+        if not session.permanent:
+            session.permanent = True  # set session to use PERMANENT_SESSION_LIFETIME
+        if not app.config["SESSION_SLIDING_EXPIRY"]:
+            session.modified = True  # reset the session timer on every request
+        start_deadline(app.config["HTTP_REQUEST_BUDGET"])
+        start_request_memo()
         try:
             csrf.protect()
 
@@ -136,6 +168,12 @@ def create_app(config_name=None):
                 logger.warning(e.description)
             logger.warning(e)
 
+    @app.teardown_request
+    def teardown_request(_):
+        if in_fan_out():
+            return
+        log_duplicates_eliminated()
+
     @app.context_processor
     def inject_availability_message():
         redis_avail_msg = app.config["SESSION_REDIS"]
@@ -160,9 +198,14 @@ def create_app(config_name=None):
         app.jinja_env.auto_reload = True
 
     Session(app)
+    if app.config["SESSION_SLIDING_EXPIRY"] and app.config["SESSION_TYPE"] == "redis":
+        # reset the session timer on every request without writing the whole session every time
+        app.session_interface = create_sliding_session_interface(app)
+    app.session_interface = SessionlessPathsInterface(app.session_interface)
 
     setup_blueprints(app)
     setup_oidc(app)
+    app.cli.add_command(cache_cli)
 
     return app
 
@@ -0,0 +1,73 @@
+import json
+import zlib
+from typing import Any, Callable, NamedTuple
+
+from flask import current_app
+
+# Values written before there was a version byte are plain JSON text, which never starts with a byte below 0x20, so
+# versions are kept below that to tell the two apart
+LEGACY_JSON = 0
+COMPACT_JSON = 1
+ZLIB_JSON = 2
+
+
+class Codec(NamedTuple):
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _dumps_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _dumps_zlib_json(value: Any) -> bytes:
+    return zlib.compress(_dumps_json(value), level=6)
+
+
+def _loads_zlib_json(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data))
+
+
+CODECS = {
+    COMPACT_JSON: Codec(_dumps_json, json.loads),
+    ZLIB_JSON: Codec(_dumps_zlib_json, _loads_zlib_json),
+}
+
+
+def register_codec(version: int, codec: Codec) -> None:
+    """
+    Adds a codec (e.g., one built on orjson or msgpack) that values can be written and read with.  Once every worker
+    can read a version, CACHE_CODEC_VERSION can be changed to start writing it.
+    """
+    if not LEGACY_JSON < version < 0x20:
+        raise ValueError("Codec version must be between 1 and 31")
+    CODECS[version] = codec
+
+
+def encode(value: Any) -> bytes:
+    """
+    Serialises a value for the cache with the codec CACHE_CODEC_VERSION names, prefixed with its version.  If that's
+    the compressed codec, values under CACHE_COMPRESSION_THRESHOLD bytes are written uncompressed, as compressing them
+    costs more than it saves.  A CACHE_CODEC_VERSION of 0 writes plain JSON, which is all a worker running an older
+    release can read, so it can be used while a release is rolled out.
+    """
+    version = current_app.config["CACHE_CODEC_VERSION"]
+    if version == LEGACY_JSON:
+        return json.dumps(value).encode("utf-8")
+    if version == ZLIB_JSON:
+        data = _dumps_json(value)
+        if len(data) < current_app.config["CACHE_COMPRESSION_THRESHOLD"]:
+            return bytes([COMPACT_JSON]) + data
+        return bytes([ZLIB_JSON]) + zlib.compress(data, level=6)
+    return bytes([version]) + CODECS[version].dumps(value)
+
+
+def decode(data: bytes | str) -> Any:
+    """Deserialises a value read from the cache, whichever version it was written with"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if not data or data[0] >= 0x20:
+        return json.loads(data)
+    if data[0] not in CODECS:
+        raise ValueError(f"Unknown cache codec version {data[0]}")
+    return CODECS[data[0]].loads(data[1:])
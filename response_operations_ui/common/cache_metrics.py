@@ -0,0 +1,161 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from flask import current_app
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+HIT = "hits"
+MISS = "misses"
+ERROR = "errors"
+
+# Upper bounds, in seconds, of the latency and refresh time histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+REFRESH_BUCKETS = (0.05, 0.1, 0.5, 1, 5, 30)
+
+KEY_PREFIX = "response-operations-ui:cache-metrics"
+
+
+class CacheMetrics:
+    """
+    Counts the hits, misses and errors of every cache namespace, along with histograms of how long reads from the
+    cache and refreshes from the backend service take, and how many bytes were read.
+
+    They're counted in memory, so recording them doesn't cost a call to redis, and added to counters in redis that
+    every worker shares at most once every CACHE_METRICS_FLUSH_INTERVAL seconds.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self._lock = threading.Lock()
+        self._counters = defaultdict(Counter)
+        self._flushed_at = time.monotonic()
+        self._pid = os.getpid()
+
+    def record(self, namespace: str, outcome: str, seconds: float, payload_bytes: int = 0, count: int = 1) -> None:
+        """
+        Records reads from the cache
+
+        :param namespace: The namespace read from, e.g. survey
+        :param outcome: Whether the reads were a hit, a miss or an error
+        :param seconds: How long the reads took
+        :param payload_bytes: The size of what was read
+        :param count: The number of values read, for reads of more than one at a time
+        """
+        if not self.config["CACHE_METRICS_ENABLED"]:
+            return
+        with self._lock:
+            counters = self._counters[namespace]
+            counters[outcome] += count
+            counters["bytes"] += payload_bytes
+            counters["latency_sum_us"] += int(seconds * 1_000_000)
+            counters[f"latency:{_get_bucket(seconds, LATENCY_BUCKETS)}"] += 1
+        self.flush()
+
+    def record_refresh(self, namespace: str, seconds: float) -> None:
+        """Records how long it took to get what was missing from the cache from the backend service"""
+        if not self.config["CACHE_METRICS_ENABLED"]:
+            return
+        with self._lock:
+            counters = self._counters[namespace]
+            counters["refreshes"] += 1
+            counters["refresh_sum_ms"] += int(seconds * 1000)
+            counters[f"refresh:{_get_bucket(seconds, REFRESH_BUCKETS)}"] += 1
+        self.flush()
+
+    def flush(self, force: bool = False) -> None:
+        """Adds what's been counted in memory to the counters in redis, if it's been long enough since it last was"""
+        if self._pid != os.getpid():
+            # Counts made before a fork belong to the parent process
+            with self._lock:
+                self._counters.clear()
+                self._pid = os.getpid()
+
+        if not force and time.monotonic() - self._flushed_at < self.config["CACHE_METRICS_FLUSH_INTERVAL"]:
+            return
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(Counter)
+            self._flushed_at = time.monotonic()
+        if not counters:
+            return
+
+        try:
+            pipeline = current_app.redis.pipeline(transaction=False)
+            pipeline.sadd(KEY_PREFIX, *counters)
+            for namespace, namespace_counters in counters.items():
+                for name, value in namespace_counters.items():
+                    pipeline.hincrby(f"{KEY_PREFIX}:{namespace}", name, value)
+            pipeline.execute()
+        except RedisError:
+            # The counts are lost rather than kept, so they can't grow without limit while redis is down
+            logger.error("Error storing cache metrics", exc_info=True)
+
+
+def get_cache_metrics(redis) -> dict:
+    """
+    Gets the metrics of every cache namespace, added up across every worker, in two redis round trips
+
+    :param redis: The redis connection the metrics are shared through
+    :return: A dict of namespace to its counters, hit ratio, mean latency and refresh time, and histograms
+    """
+    namespaces = sorted(namespace.decode() for namespace in redis.smembers(KEY_PREFIX))
+    pipeline = redis.pipeline(transaction=False)
+    for namespace in namespaces:
+        pipeline.hgetall(f"{KEY_PREFIX}:{namespace}")
+
+    metrics = {}
+    for namespace, counters in zip(namespaces, pipeline.execute()):
+        counters = {name.decode(): int(value) for name, value in counters.items()}
+        reads = sum(counters.get(outcome, 0) for outcome in (HIT, MISS, ERROR))
+        refreshes = counters.get("refreshes", 0)
+        metrics[namespace] = {
+            HIT: counters.get(HIT, 0),
+            MISS: counters.get(MISS, 0),
+            ERROR: counters.get(ERROR, 0),
+            "hit_ratio": round(counters.get(HIT, 0) / reads, 3) if reads else None,
+            "bytes": counters.get("bytes", 0),
+            "mean_latency_ms": _get_mean(counters.get("latency_sum_us", 0) / 1000, counters, "latency"),
+            "latency_ms": _get_histogram(counters, "latency", LATENCY_BUCKETS),
+            "refreshes": refreshes,
+            "mean_refresh_ms": round(counters.get("refresh_sum_ms", 0) / refreshes, 1) if refreshes else None,
+            "refresh_ms": _get_histogram(counters, "refresh", REFRESH_BUCKETS),
+        }
+    return metrics
+
+
+def record_cache_read(namespace: str, outcome: str, seconds: float, payload_bytes: int = 0, count: int = 1) -> None:
+    current_app.cache_metrics.record(namespace, outcome, seconds, payload_bytes, count)
+
+
+def record_cache_refresh(namespace: str, seconds: float) -> None:
+    current_app.cache_metrics.record_refresh(namespace, seconds)
+
+
+@contextmanager
+def timed_refresh(namespace: str):
+    """Records how long the block takes as a refresh of the namespace, if it doesn't raise"""
+    start = time.perf_counter()
+    yield
+    record_cache_refresh(namespace, time.perf_counter() - start)
+
+
+def _get_bucket(seconds: float, buckets: tuple) -> str:
+    return next((str(bucket) for bucket in buckets if seconds <= bucket), "inf")
+
+
+def _get_mean(total_ms: float, counters: dict, histogram: str) -> float | None:
+    count = sum(value for name, value in counters.items() if name.startswith(f"{histogram}:"))
+    return round(total_ms / count, 2) if count else None
+
+
+def _get_histogram(counters: dict, histogram: str, buckets: tuple) -> dict:
+    """The number of values in each bucket, labelled with the bucket's upper bound in milliseconds"""
+    labels = {str(bucket): f"<={bucket * 1000:g}" for bucket in buckets}
+    labels["inf"] = f">{buckets[-1] * 1000:g}"
+    return {label: counters.get(f"{histogram}:{bucket}", 0) for bucket, label in labels.items()}
@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
+from response_operations_ui.common.controller_cache import get_cache_key
+from response_operations_ui.common.filters import get_current_collection_exercise
+from response_operations_ui.common.redis_cache import RedisCache
+from response_operations_ui.controllers import (
+    collection_exercise_controllers,
+    collection_instrument_controllers,
+)
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+WARM_LOCK_EXPIRY = 300
+
+cache_cli = AppGroup("cache", help="Manage what's cached in redis")
+
+
+@dataclass
+class WarmReport:
+    """What a cache warm loaded, by what it is, and what it failed to load"""
+
+    loaded: Counter = field(default_factory=Counter)
+    failed: Counter = field(default_factory=Counter)
+    seconds: float = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+def warm_cache(max_workers: int) -> WarmReport:
+    """
+    Fills the cache with what the busiest pages read, so the first users after a deploy or a redis flush don't pay for
+    every miss.  That's the survey list, then for each survey (max_workers at a time) the survey itself, its
+    collection exercises, the current collection exercise's events and, for EQ surveys if the CIR is enabled, the CIR
+    metadata of the form types on its collection instruments.
+
+    Anything that fails to load is logged and counted, and the rest is carried on with.
+    """
+    start = time.perf_counter()
+    report = WarmReport()
+    redis_cache = RedisCache()
+    # The surveys' own short names, as views look them up by those rather than the formatted ones they show
+    surveys = redis_cache.reload_survey_list()
+    report.loaded["survey list"] += 1
+
+    app = current_app._get_current_object()
+
+    def warm_survey(survey):
+        with app.app_context():
+            _warm_survey(redis_cache, survey, report)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-warm") as executor:
+        list(executor.map(warm_survey, surveys))
+
+    report.seconds = time.perf_counter() - start
+    logger.info("Warmed cache", loaded=dict(report.loaded), failed=dict(report.failed), seconds=report.seconds)
+    return report
+
+
+def _warm_survey(redis_cache: RedisCache, survey: dict, report: WarmReport) -> None:
+    def load(name, call, *args):
+        try:
+            result = call(*args)
+        except Exception:
+            logger.warning("Failed to warm cache", what=name, survey_id=survey["id"], exc_info=True)
+            with report.lock:
+                report.failed[name] += 1
+            return None
+        with report.lock:
+            report.loaded[name] += 1
+        return result
+
+    load("survey", redis_cache.get_survey_by_shortname, survey["shortName"])
+    collection_exercises = load(
+        "collection exercises", collection_exercise_controllers.get_collection_exercises_by_survey, survey["id"]
+    )
+    collection_exercise = get_current_collection_exercise(collection_exercises or [])
+    if not collection_exercise:
+        return
+
+    load(
+        "collection exercise events",
+        collection_exercise_controllers.get_collection_exercise_events_by_id,
+        collection_exercise["id"],
+    )
+
+    if not current_app.config["CIR_ENABLED"] or "EQ" not in survey.get("surveyMode", ""):
+        return
+    collection_instruments = load(
+        "collection instruments",
+        collection_instrument_controllers.get_collection_instruments_by_classifier,
+        survey["id"],
+        collection_exercise["id"],
+        "EQ",
+    )
+    form_types = {ci["classifiers"].get("form_type") for ci in collection_instruments or []} - {None}
+    for form_type in sorted(form_types):
+        load("cir metadata", redis_cache.get_cir_metadata, survey["surveyRef"], form_type)
+
+
+def warm_cache_in_background(app: Flask) -> None:
+    """
+    Warms the cache in a background thread, unless another worker has done so in the last WARM_LOCK_EXPIRY seconds,
+    so that when every worker starts at once only one of them does it.
+    """
+    with app.app_context():
+        try:
+            if not app.redis.set(get_cache_key("cache-warm-lock"), os.getpid(), nx=True, ex=WARM_LOCK_EXPIRY):
+                return
+        except RedisError:
+            logger.error("Error taking cache warm lock, not warming the cache", exc_info=True)
+            return
+
+    def warm():
+        with app.app_context():
+            try:
+                warm_cache(app.config["CACHE_WARM_MAX_WORKERS"])
+            except Exception:
+                logger.exception("Failed to warm the cache")
+
+    threading.Thread(target=warm, name="cache-warm", daemon=True).start()
+
+
+@cache_cli.command("warm")
+@click.option("--workers", type=int, help="Number of surveys warmed at the same time [default: CACHE_WARM_MAX_WORKERS]")
+def warm_command(workers):
+    """Fills the cache with what the busiest pages read"""
+    report = warm_cache(workers or current_app.config["CACHE_WARM_MAX_WORKERS"])
+    for name, count in sorted(report.loaded.items()):
+        click.echo(f"Loaded {count} {name}")
+    for name, count in sorted(report.failed.items()):
+        click.echo(f"Failed to load {count} {name}", err=True)
+    click.echo(f"Warmed cache in {report.seconds:.1f}s")
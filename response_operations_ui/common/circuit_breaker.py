@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+
+from flask import current_app
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
+from response_operations_ui.exceptions.error_codes import (
+    ErrorCode,
+    get_error_code_message,
+)
+from response_operations_ui.exceptions.exceptions import ExternalApiError
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker for a single backend service, with its state held in redis so every worker shares it.
+
+    Calls are counted in fixed windows of CIRCUIT_BREAKER_WINDOW_SECONDS.  A call fails if it raises, the service
+    returns a 5XX, or it takes longer than CIRCUIT_BREAKER_SLOW_CALL_SECONDS.  Once a window has at least
+    CIRCUIT_BREAKER_MIN_CALLS calls and CIRCUIT_BREAKER_FAILURE_RATE of them have failed, the circuit opens and
+    every call fails fast for CIRCUIT_BREAKER_OPEN_SECONDS.  After that the circuit is half-open, a single worker is
+    allowed to probe the service and the result of that call either closes the circuit or opens it again.
+
+    So that a call doesn't cost extra redis round trips, each worker keeps its own copy of the state and call counts.
+    The state is read from redis at most every CIRCUIT_BREAKER_SYNC_SECONDS, and while the circuit is known to be open
+    calls are rejected without reading it at all.  Successful calls are counted locally and written to redis at most
+    once a sync interval, while a failed call is written straight away along with any counts that haven't been, as
+    it's the one that can open the circuit.  Opening or closing the circuit is written immediately.  The cost is that
+    a worker can take up to a sync interval to notice another worker opened the circuit, and the failure rate can be
+    judged against up to a sync interval's worth of successes less than were made.
+
+    If redis can't be reached the breaker stays out of the way and lets the call through.
+    """
+
+    KEY_PREFIX = "response-operations-ui:circuit-breaker"
+
+    def __init__(self, target_service: str, config):
+        self.target_service = target_service
+        self.window = config["CIRCUIT_BREAKER_WINDOW_SECONDS"]
+        self.min_calls = config["CIRCUIT_BREAKER_MIN_CALLS"]
+        self.failure_rate = config["CIRCUIT_BREAKER_FAILURE_RATE"]
+        self.slow_call_seconds = config["CIRCUIT_BREAKER_SLOW_CALL_SECONDS"]
+        self.open_seconds = config["CIRCUIT_BREAKER_OPEN_SECONDS"]
+        self.open_key = f"{self.KEY_PREFIX}:{target_service}:open"
+        self.tripped_key = f"{self.KEY_PREFIX}:{target_service}:tripped"
+        self.probe_key = f"{self.KEY_PREFIX}:{target_service}:probe"
+        self.sync_seconds = config["CIRCUIT_BREAKER_SYNC_SECONDS"]
+        self._lock = threading.Lock()
+        self._opened_at = None
+        self._is_tripped = False
+        self._read_at = None
+        self._pending = {}
+        self._flushed_at = None
+
+    def before_call(self) -> bool:
+        """
+        Checks the circuit before a call is made
+
+        :return: True if this call is the probe for a half-open circuit
+        :raises ExternalApiError: Raised with API_CIRCUIT_OPEN if the call isn't allowed through
+        """
+        try:
+            is_open, is_tripped = self._read_state()
+            if is_open:
+                self._reject()
+            if is_tripped:
+                if not current_app.redis.set(self.probe_key, 1, nx=True, ex=self.open_seconds):
+                    self._reject()
+                logger.info("Circuit half-open, probing service", target_service=self.target_service)
+                return True
+        except RedisError:
+            logger.error("Error reading circuit breaker state", target_service=self.target_service, exc_info=True)
+        return False
+
+    def after_call(self, succeeded: bool, elapsed: float, probe: bool) -> None:
+        """
+        Records the outcome of a call and opens or closes the circuit as needed
+
+        :param succeeded: Whether the service returned a response that wasn't a 5XX
+        :param elapsed: How long the call took, in seconds
+        :param probe: Whether the call was the probe for a half-open circuit
+        """
+        failed = not succeeded or elapsed > self.slow_call_seconds
+        try:
+            if probe:
+                if failed:
+                    self._open()
+                else:
+                    self._close()
+                return
+
+            bucket = int(time.time() // self.window)
+            pending = self._count(bucket, failed)
+            if pending:
+                calls, failures = self._flush(pending)[bucket]
+                if failed and calls >= self.min_calls and failures / calls >= self.failure_rate:
+                    self._open(calls=calls, failures=failures)
+        except RedisError:
+            logger.error("Error recording circuit breaker call", target_service=self.target_service, exc_info=True)
+
+    def state(self) -> str:
+        return to_state(*current_app.redis.mget(self.open_key, self.tripped_key))
+
+    def _read_state(self) -> tuple:
+        """
+        Gets whether the circuit is open and whether it has tripped, from redis unless this worker read or changed them
+        less than a sync interval ago, or knows the circuit is still open
+        """
+        now = time.monotonic()
+        with self._lock:
+            still_open = self._opened_at is not None and time.time() < self._opened_at + self.open_seconds
+            if still_open or (self._read_at is not None and now - self._read_at < self.sync_seconds):
+                return still_open, self._is_tripped
+
+        is_open, is_tripped = current_app.redis.mget(self.open_key, self.tripped_key)
+        self._remember(float(is_open) if is_open else None, bool(is_tripped))
+        return bool(is_open), bool(is_tripped)
+
+    def _remember(self, opened_at, is_tripped):
+        with self._lock:
+            self._opened_at = opened_at
+            self._is_tripped = is_tripped
+            self._read_at = time.monotonic()
+
+    def _count(self, bucket: int, failed: bool) -> dict:
+        """
+        Counts a call in this worker, handing back every count not yet written to redis once they're due to be
+
+        :return: The calls and failures to write by window, empty if they aren't due yet
+        """
+        now = time.monotonic()
+        with self._lock:
+            calls, failures = self._pending.get(bucket, (0, 0))
+            self._pending[bucket] = (calls + 1, failures + int(failed))
+            if not failed and self._flushed_at is not None and now - self._flushed_at < self.sync_seconds:
+                return {}
+            pending, self._pending = self._pending, {}
+            self._flushed_at = now
+            return pending
+
+    def _flush(self, pending: dict) -> dict:
+        """
+        Adds this worker's counts to those in redis, in a single round trip
+
+        :return: The calls and failures every worker has made by window
+        """
+        pipeline = current_app.redis.pipeline()
+        for bucket, (calls, failures) in pending.items():
+            calls_key = f"{self.KEY_PREFIX}:{self.target_service}:calls:{bucket}"
+            failures_key = f"{self.KEY_PREFIX}:{self.target_service}:failures:{bucket}"
+            pipeline.incrby(calls_key, calls)
+            pipeline.incrby(failures_key, failures)
+            pipeline.expire(calls_key, self.window * 2)
+            pipeline.expire(failures_key, self.window * 2)
+        results = pipeline.execute()
+        return {bucket: tuple(results[i * 4 : i * 4 + 2]) for i, bucket in enumerate(pending)}
+
+    def _reject(self):
+        logger.warning(get_error_code_message(ErrorCode.API_CIRCUIT_OPEN), target_service=self.target_service)
+        raise ExternalApiError(None, ErrorCode.API_CIRCUIT_OPEN, self.target_service)
+
+    def _open(self, **kwargs):
+        logger.error("Opening circuit breaker", target_service=self.target_service, **kwargs)
+        now = time.time()
+        pipeline = current_app.redis.pipeline()
+        pipeline.set(self.open_key, now, ex=self.open_seconds)
+        pipeline.set(self.tripped_key, now)
+        pipeline.delete(self.probe_key)
+        pipeline.execute()
+        self._remember(now, True)
+
+    def _close(self):
+        logger.info("Closing circuit breaker", target_service=self.target_service)
+        current_app.redis.delete(self.open_key, self.tripped_key, self.probe_key)
+        self._remember(None, False)
+
+
+def to_state(is_open, is_tripped) -> str:
+    if is_open:
+        return OPEN
+    return HALF_OPEN if is_tripped else CLOSED
@@ -15,9 +15,14 @@ from response_operations_ui.exceptions.exceptions import ExternalApiError
 logger = wrap_logger(logging.getLogger(__name__))
 
 
-def get_response_json_from_service(request_url: str, target_service: str, session: Session = None) -> json:
+def get_response_json_from_service(
+    request_url: str, target_service: str, session: Session = None, auth: tuple = None
+) -> json:
     try:
-        response = session.get(request_url) if session else requests.get(request_url, auth=app.config["BASIC_AUTH"])
+        if session:
+            response = session.get(request_url, auth=auth)
+        else:
+            response = requests.get(request_url, auth=app.config["BASIC_AUTH"])
 
     except (requests.ConnectionError, requests.exceptions.Timeout) as e:
         error_code = (
@@ -0,0 +1,210 @@
+import logging
+import time
+from functools import wraps
+from typing import Any, Callable
+
+from flask import current_app
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
+from response_operations_ui.common.cache_codec import decode, encode
+from response_operations_ui.common.cache_metrics import (
+    ERROR,
+    HIT,
+    MISS,
+    record_cache_read,
+    record_cache_refresh,
+)
+from response_operations_ui.common.request_memo import clear_request_memo
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+KEY_PREFIX = "response-operations-ui"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidations"
+
+
+def cached(namespace: str, ttl: int | Callable[[Any], int], key: Callable = None):
+    """
+    Decorator that keeps the result of a read in redis for ttl seconds, under
+    response-operations-ui:<namespace>:<key>.  Pair it with invalidates on the functions that change what's read, so
+    that the next read after a write goes to the service.
+
+    :param namespace: What's being cached, e.g. survey
+    :param ttl: How long, in seconds, a result is kept for, or a callable taking a result that returns it (e.g., to
+                keep empty results for less time)
+    :param key: A callable taking the same arguments as the read that returns what identifies the result within the
+                namespace.  By default it's the positional arguments joined with ':'
+    """
+    if not ttl:
+        raise ValueError("Expiry must be provided")
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            cache_key = get_cache_key(namespace, _get_key(key, args, kwargs))
+            start = time.perf_counter()
+            try:
+                result = current_app.redis.get(cache_key)
+                if result:
+                    value = decode(result)
+                    record_cache_read(namespace, HIT, time.perf_counter() - start, len(result))
+                    return value
+                record_cache_read(namespace, MISS, time.perf_counter() - start)
+            except (RedisError, ValueError):
+                record_cache_read(namespace, ERROR, time.perf_counter() - start)
+                logger.error("Error getting value from cache, please investigate", key=cache_key, exc_info=True)
+
+            logger.info("Key not in cache, getting value from service", key=cache_key)
+            start = time.perf_counter()
+            result = f(*args, **kwargs)
+            record_cache_refresh(namespace, time.perf_counter() - start)
+            expiry = ttl(result) if callable(ttl) else ttl
+            pipeline = current_app.redis.pipeline(transaction=False)
+            pipeline.set(cache_key, encode(result), ex=expiry)
+            _track_keys(pipeline, namespace, {cache_key: expiry})
+            try:
+                pipeline.execute()
+            except RedisError:
+                # Not throwing an exception as the cache isn't fatal
+                logger.error("Error setting key, please investigate", key=cache_key, exc_info=True)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(namespace: str, key: Callable = None):
+    """
+    Decorator for a write that removes what it changes from the cache once it's been made (or has failed, as it may
+    still have changed something), so the next read sees the change.
+
+    :param namespace: The namespace of the cached reads the write affects
+    :param key: A callable taking the same arguments as the write that returns the key of the result it changes.  If
+                it's not given, everything in the namespace is removed
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            finally:
+                if key:
+                    invalidate(namespace, str(key(*args, **kwargs)))
+                else:
+                    invalidate(namespace)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(namespace: str, key: str = None) -> None:
+    """
+    Removes a single result, or everything in the namespace if key isn't given, from the cache.  The invalidation is
+    published on INVALIDATION_CHANNEL as <namespace> or <namespace>:<key>, for anything that holds what's been read in
+    memory as well, and this worker's survey index is told straight away.  Anything memoized for the current request
+    is forgotten too.
+    """
+    clear_request_memo()
+    try:
+        if key is None:
+            cache_keys = [get_cache_key(namespace), *_pop_tracked_keys(namespace)]
+        else:
+            cache_keys = [get_cache_key(namespace, key)]
+        pipeline = current_app.redis.pipeline()
+        pipeline.delete(*cache_keys)
+        pipeline.publish(INVALIDATION_CHANNEL, namespace if key is None else f"{namespace}:{key}")
+        pipeline.execute()
+    except RedisError:
+        logger.error("Error invalidating cache, please investigate", namespace=namespace, key=key, exc_info=True)
+    else:
+        logger.info("Invalidated cache", namespace=namespace, key=key)
+    finally:
+        # Not left to the published invalidation, so whoever made the write sees it on their next request
+        current_app.survey_index.invalidate(namespace)
+
+
+def get_many(namespace: str, keys: list) -> dict:
+    """
+    Gets a number of results from the cache in a single round trip to redis.
+
+    :param namespace: What's being read, e.g. collection-exercise
+    :param keys: What identifies each result within the namespace
+    :return: The results that are cached, by key.  If redis can't be reached nothing is returned, so every result is
+             read from the service
+    """
+    if not keys:
+        return {}
+    start = time.perf_counter()
+    try:
+        values = current_app.redis.mget([get_cache_key(namespace, str(key)) for key in keys])
+        results = {key: decode(value) for key, value in zip(keys, values) if value is not None}
+    except (RedisError, ValueError):
+        record_cache_read(namespace, ERROR, time.perf_counter() - start, count=len(keys))
+        logger.error("Error getting values from cache, please investigate", namespace=namespace, exc_info=True)
+        return {}
+    seconds = time.perf_counter() - start
+    if results:
+        payload_bytes = sum(len(value) for value in values if value is not None)
+        record_cache_read(namespace, HIT, seconds, payload_bytes, count=len(results))
+    if len(results) < len(keys):
+        record_cache_read(namespace, MISS, seconds, count=len(keys) - len(results))
+    return results
+
+
+def set_many(namespace: str, results: dict, ttl: int | Callable[[Any], int]) -> None:
+    """
+    Caches a number of results in a single round trip to redis.
+
+    :param namespace: What's being cached, e.g. collection-exercise
+    :param results: The results to cache, by what identifies each of them within the namespace
+    :param ttl: How long, in seconds, each result is kept for, or a callable taking a result that returns it
+    """
+    if not results:
+        return
+    pipeline = current_app.redis.pipeline(transaction=False)
+    expiries = {}
+    for key, result in results.items():
+        cache_key = get_cache_key(namespace, str(key))
+        expiries[cache_key] = ttl(result) if callable(ttl) else ttl
+        pipeline.set(cache_key, encode(result), ex=expiries[cache_key])
+    _track_keys(pipeline, namespace, expiries)
+    try:
+        pipeline.execute()
+    except RedisError:
+        # Not throwing an exception as the cache isn't fatal
+        logger.error("Error setting keys, please investigate", namespace=namespace, exc_info=True)
+
+
+def get_cache_key(namespace: str, key: str = None) -> str:
+    if key is None:
+        return f"{KEY_PREFIX}:{namespace}"
+    return f"{KEY_PREFIX}:{namespace}:{key}"
+
+
+def _get_key(key: Callable | None, args: tuple, kwargs: dict) -> str:
+    if key:
+        return str(key(*args, **kwargs))
+    return ":".join(map(str, args))
+
+
+def _track_keys(pipeline, namespace: str, expiries: dict) -> None:
+    """
+    Adds what's being cached to the sorted set of the namespace's keys, scored by when they expire, so invalidating
+    the whole namespace doesn't have to scan redis for them.  Keys that have expired are dropped from it as it's
+    written to, so it only grows with what's cached.
+    """
+    now = time.time()
+    tracking_key = get_cache_key("cache-keys", namespace)
+    pipeline.zadd(tracking_key, {cache_key: now + expiry for cache_key, expiry in expiries.items()})
+    pipeline.zremrangebyscore(tracking_key, "-inf", now)
+
+
+def _pop_tracked_keys(namespace: str) -> list:
+    pipeline = current_app.redis.pipeline()
+    pipeline.zrangebyscore(get_cache_key("cache-keys", namespace), time.time(), "+inf")
+    pipeline.delete(get_cache_key("cache-keys", namespace))
+    cache_keys, _ = pipeline.execute()
+    return cache_keys
@@ -0,0 +1,49 @@
+import time
+from functools import wraps
+
+from flask import g, has_app_context
+
+
+def start_deadline(budget: float) -> None:
+    """
+    Sets the time by which all calls to backend services for the current request must have finished.  If a deadline
+    has already been set, the earlier of the two is kept so that a budget can only ever be tightened.
+
+    :param budget: The number of seconds, from now, the request may spend waiting on backend services
+    """
+    deadline = time.monotonic() + budget
+    current_deadline = g.get("request_deadline")
+    g.request_deadline = deadline if current_deadline is None else min(deadline, current_deadline)
+
+
+def time_remaining() -> float | None:
+    """
+    Gets the time left before the deadline for the current request
+
+    :return: The number of seconds left, which is negative once the deadline has passed, or None if there's no deadline
+    """
+    if not has_app_context():
+        return None
+    deadline = g.get("request_deadline")
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def request_budget(seconds: float):
+    """
+    Decorator that gives a view a total budget for the calls it makes to backend services.  Each call is only given
+    the time left in the budget and fails fast once it has run out.
+
+    :param seconds: The budget for the view, in seconds
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            start_deadline(seconds)
+            return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
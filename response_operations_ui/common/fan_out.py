@@ -0,0 +1,109 @@
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable
+
+from flask import current_app, g, has_request_context
+from flask.globals import request_ctx
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_in_fan_out = threading.local()
+
+
+def fan_out(calls: dict[str, Callable]) -> dict:
+    """
+    Runs independent controller calls at the same time on a bounded thread pool and waits for them all to finish.
+    Each call runs inside the current app and request context, with a copy of flask.g, so it sees the same config,
+    session, logged-in user and request deadline as the view that made it.
+
+    If any call raises, the remaining calls that haven't started are cancelled and the exception (e.g., an ApiError)
+    is re-raised here, so the error handlers behave exactly as if the calls had been made one after another.
+
+    Calls fanned out from inside a fan out use whatever threads the pool has spare, and the thread that made them runs
+    any that haven't been picked up itself, rather than waiting on them, so a pool full of threads waiting on each
+    other can't deadlock.  Setting FAN_OUT_MAX_WORKERS below 2 runs every call one after another.
+
+    :param calls: A dict of name to a callable taking no arguments (e.g., functools.partial(get_survey_by_id, id))
+    :return: A dict of name to the value returned by that call
+    """
+    if len(calls) < 2 or current_app.config["FAN_OUT_MAX_WORKERS"] < 2:
+        return {name: call() for name, call in calls.items()}
+    if in_fan_out():
+        return _fan_out_nested(calls)
+
+    executor = _get_executor()
+    futures = {name: executor.submit(_with_context(call)) for name, call in calls.items()}
+    done, not_done = wait(futures.values(), return_when=FIRST_EXCEPTION)
+    for future in not_done:
+        future.cancel()
+    wait(not_done)
+
+    for name, future in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is not None:
+            logger.info("Fanned out call failed", call=name)
+            raise future.exception()
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _fan_out_nested(calls: dict[str, Callable]) -> dict:
+    executor = _get_executor()
+    futures = {name: executor.submit(_with_context(call)) for name, call in calls.items()}
+    results = {}
+    try:
+        for name, future in futures.items():
+            # A call no other thread has started is taken back and run here
+            results[name] = calls[name]() if future.cancel() else future.result()
+    except BaseException:
+        for future in futures.values():
+            future.cancel()
+        wait(futures.values())
+        logger.info("Fanned out call failed", call=name)
+        raise
+    return results
+
+
+def in_fan_out() -> bool:
+    """
+    Whether this thread is running a fanned out call.  Each call pushes and pops a copy of the request context, which
+    runs the app's teardown_request handlers as well, so those that should only run once per request check this.
+    """
+    return getattr(_in_fan_out, "active", False)
+
+
+def _with_context(call: Callable) -> Callable:
+    app = current_app._get_current_object()
+    g_values = dict(g.__dict__)
+    copied_request_ctx = request_ctx.copy() if has_request_context() else None
+
+    def run():
+        _in_fan_out.active = True
+        try:
+            with app.app_context():
+                g.__dict__.update(g_values)
+                if copied_request_ctx is None:
+                    return call()
+                with copied_request_ctx:
+                    return call()
+        finally:
+            _in_fan_out.active = False
+
+    return run
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Threads don't survive a fork, so each gunicorn worker needs its own pool
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config["FAN_OUT_MAX_WORKERS"], thread_name_prefix="fan-out"
+                )
+                _executor_pid = os.getpid()
+    return _executor
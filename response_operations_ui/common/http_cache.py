@@ -0,0 +1,179 @@
+import json
+import logging
+import time
+
+import requests
+from flask import current_app
+from redis.exceptions import RedisError
+from requests.structures import CaseInsensitiveDict
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+KEY_PREFIX = "response-operations-ui:http-cache"
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+HIT = "hits"
+REVALIDATED = "revalidated"
+MISS = "misses"
+
+
+class CachedResponse:
+    """A response to a GET, as stored in the http cache, along with when it was last known to be current"""
+
+    def __init__(self, headers: dict, body: bytes, stored_at: float):
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+        self.stored_at = stored_at
+
+    def is_fresh(self) -> bool:
+        """Whether the backend's Cache-Control allows the response to be used without asking it again"""
+        cache_control = parse_cache_control(self.headers.get("Cache-Control"))
+        if "no-cache" in cache_control or "max-age" not in cache_control:
+            return False
+        try:
+            return time.time() - self.stored_at < int(cache_control["max-age"])
+        except ValueError:
+            return False
+
+    def get_conditional_headers(self) -> dict:
+        headers = {}
+        if "ETag" in self.headers:
+            headers["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def to_response(self, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+
+class HttpCache:
+    """
+    A client side HTTP cache for the GETs made to a single backend service, stored in redis so every worker shares it.
+
+    A response is stored if it can be revalidated (it has an ETag or Last-Modified) or the backend says how long it
+    stays fresh (Cache-Control max-age), unless the backend forbids it (no-store) or the response varies on anything
+    other than its encoding.  While a stored response is fresh it's used without calling the backend at all.  Once
+    it isn't, the call is made conditional and a 304 from the backend is answered with the stored response.
+
+    The outcome of every call (hit, revalidated or miss) is counted per service, along with the bytes that didn't
+    have to be downloaded.  If redis can't be reached the cache stays out of the way.
+    """
+
+    def __init__(self, target_service: str, config):
+        self.target_service = target_service
+        self.expiry = config["HTTP_CACHE_EXPIRY"]
+        self.max_entry_bytes = config["HTTP_CACHE_MAX_ENTRY_BYTES"]
+        self.stats_key = f"{KEY_PREFIX}:stats:{target_service}"
+
+    def get(self, url: str) -> CachedResponse | None:
+        try:
+            entry = current_app.redis.hgetall(self._get_key(url))
+        except RedisError:
+            logger.error("Error getting response from http cache", target_service=self.target_service, exc_info=True)
+            return None
+        if not entry:
+            return None
+        return CachedResponse(json.loads(entry[b"headers"]), entry[b"body"], float(entry[b"stored_at"]))
+
+    def store(self, url: str, response: requests.Response) -> None:
+        if not self._is_storable(response):
+            self.record(MISS)
+            return
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        key = self._get_key(url)
+        try:
+            pipeline = current_app.redis.pipeline()
+            pipeline.hset(
+                key, mapping={"headers": json.dumps(headers), "body": response.content, "stored_at": time.time()}
+            )
+            pipeline.expire(key, self.expiry)
+            pipeline.hincrby(self.stats_key, MISS, 1)
+            pipeline.execute()
+        except RedisError:
+            logger.error("Error storing response in http cache", target_service=self.target_service, exc_info=True)
+
+    def revalidate(self, url: str, entry: CachedResponse, not_modified: requests.Response) -> None:
+        """Marks a stored response as current again after a 304, taking any updated validators from it"""
+        for name in STORED_HEADERS:
+            if name in not_modified.headers and name != "Content-Type":
+                entry.headers[name] = not_modified.headers[name]
+        entry.stored_at = time.time()
+        key = self._get_key(url)
+        try:
+            pipeline = current_app.redis.pipeline()
+            pipeline.hset(key, mapping={"headers": json.dumps(dict(entry.headers)), "stored_at": entry.stored_at})
+            pipeline.expire(key, self.expiry)
+            pipeline.hincrby(self.stats_key, REVALIDATED, 1)
+            pipeline.hincrby(self.stats_key, "bytes_saved", len(entry.body))
+            pipeline.execute()
+        except RedisError:
+            logger.error("Error revalidating response in http cache", target_service=self.target_service, exc_info=True)
+
+    def record(self, outcome: str, bytes_saved: int = 0) -> None:
+        try:
+            pipeline = current_app.redis.pipeline()
+            pipeline.hincrby(self.stats_key, outcome, 1)
+            if bytes_saved:
+                pipeline.hincrby(self.stats_key, "bytes_saved", bytes_saved)
+            pipeline.execute()
+        except RedisError:
+            logger.error("Error recording http cache outcome", target_service=self.target_service, exc_info=True)
+
+    def _is_storable(self, response: requests.Response) -> bool:
+        cache_control = parse_cache_control(response.headers.get("Cache-Control"))
+        if "no-store" in cache_control:
+            return False
+        if response.headers.get("Vary", "").strip().lower() not in ("", "accept-encoding"):
+            return False
+        if len(response.content) > self.max_entry_bytes:
+            return False
+        return "ETag" in response.headers or "Last-Modified" in response.headers or "max-age" in cache_control
+
+    def _get_key(self, url: str) -> str:
+        return f"{KEY_PREFIX}:{self.target_service}:{url}"
+
+
+def parse_cache_control(value: str | None) -> dict:
+    """Parses a Cache-Control header into a dict of lower case directive to its argument (or None)"""
+    directives = {}
+    for directive in (value or "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def get_http_cache_stats(redis, target_services: list[str]) -> dict:
+    """
+    Gets the http cache counters for each service, in a single redis round trip
+
+    :param redis: The redis connection the caches share
+    :param target_services: The names of the services with an http cache
+    :return: A dict of service name to its hits, revalidated, misses, hit ratio and bytes saved
+    """
+    pipeline = redis.pipeline()
+    for target_service in target_services:
+        pipeline.hgetall(f"{KEY_PREFIX}:stats:{target_service}")
+
+    stats = {}
+    for target_service, counters in zip(target_services, pipeline.execute()):
+        counters = {name.decode(): int(value) for name, value in counters.items()}
+        hits, revalidated, misses = counters.get(HIT, 0), counters.get(REVALIDATED, 0), counters.get(MISS, 0)
+        total = hits + revalidated + misses
+        stats[target_service] = {
+            HIT: hits,
+            REVALIDATED: revalidated,
+            MISS: misses,
+            "hit_ratio": round((hits + revalidated) / total, 3) if total else None,
+            "bytes_saved": counters.get("bytes_saved", 0),
+        }
+    return stats
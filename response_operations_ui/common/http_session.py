@@ -0,0 +1,335 @@
+import logging
+import os
+import threading
+import time
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from structlog import wrap_logger
+
+from response_operations_ui.common.circuit_breaker import CircuitBreaker, to_state
+from response_operations_ui.common.deadline import time_remaining
+from response_operations_ui.common.http_cache import (
+    HIT,
+    MISS,
+    HttpCache,
+    get_http_cache_stats,
+)
+from response_operations_ui.common.retry import RetryPolicy, parse_status_codes
+from response_operations_ui.exceptions.error_codes import (
+    ErrorCode,
+    get_error_code_message,
+)
+from response_operations_ui.exceptions.exceptions import ExternalApiError
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+class ServiceSession(requests.Session):
+    """
+    A session for a single backend service.  Every call made through it is given the service's connect and read
+    timeouts (unless the caller passes its own), clipped to whatever is left of the current request's deadline, and
+    goes through the service's circuit breaker if one is enabled.  Idempotent calls that fail are retried according
+    to the service's retry policy, with every attempt and backoff coming out of the same deadline.  GETs to services
+    with an http cache are answered from it while fresh and made conditional once they aren't.
+
+    A call that times out, once any retries are used up, raises an ExternalApiError with API_TIMEOUT_ERROR, so the
+    view fails fast in the same way as when the deadline has passed.
+    """
+
+    def __init__(
+        self,
+        service_url_key: str,
+        timeout: tuple[float, float],
+        circuit_breaker: CircuitBreaker = None,
+        retry_policy: RetryPolicy = None,
+        http_cache: HttpCache = None,
+    ):
+        super().__init__()
+        self.service_url_key = service_url_key
+        self.target_service = get_target_service(service_url_key)
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+        self.retry_policy = retry_policy
+        self.http_cache = http_cache
+
+    def request(self, method, url, *args, **kwargs):
+        if self.http_cache is None or method.upper() != "GET" or args or kwargs.get("stream"):
+            return self._request_with_retries(method, url, *args, **kwargs)
+        return self._cached_get(url, **kwargs)
+
+    def _cached_get(self, url, **kwargs):
+        cache_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        entry = self.http_cache.get(cache_url)
+        if entry is not None and entry.is_fresh():
+            self.http_cache.record(HIT, bytes_saved=len(entry.body))
+            return entry.to_response(cache_url)
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **entry.get_conditional_headers()}
+
+        response = self._request_with_retries("GET", url, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self.http_cache.revalidate(cache_url, entry, response)
+            return entry.to_response(cache_url)
+        if response.status_code == 200:
+            self.http_cache.store(cache_url, response)
+        else:
+            self.http_cache.record(MISS)
+        return response
+
+    def _request_with_retries(self, method, url, *args, **kwargs):
+        timeout = kwargs.pop("timeout", None) or self.timeout
+        attempt = 1
+        while True:
+            try:
+                response = self._request_once(method, url, timeout, *args, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                # Connect timeouts are connection errors too, so they're retried.  Read timeouts aren't
+                if not self._retry(method, url, attempt, error=e):
+                    self._raise_failed_call(url, e)
+            except requests.exceptions.Timeout as e:
+                self._raise_failed_call(url, e)
+            else:
+                if not self._retry(method, url, attempt, status_code=response.status_code):
+                    return response
+                response.close()
+            attempt += 1
+
+    def _request_once(self, method, url, timeout, *args, **kwargs):
+        timeout = self._get_timeout_within_deadline(url, timeout)
+        probe = self.circuit_breaker.before_call() if self.circuit_breaker else False
+
+        start = time.monotonic()
+        try:
+            response = super().request(method, url, *args, timeout=timeout, **kwargs)
+        except Exception:
+            if self.circuit_breaker:
+                self.circuit_breaker.after_call(False, time.monotonic() - start, probe)
+            raise
+
+        if self.circuit_breaker:
+            self.circuit_breaker.after_call(response.status_code < 500, time.monotonic() - start, probe)
+        return response
+
+    def _raise_failed_call(self, url, error: requests.exceptions.RequestException):
+        """
+        Raises the error a call that won't be retried failed with
+
+        :raises ExternalApiError: Raised with API_TIMEOUT_ERROR in place of a timeout
+        """
+        if not isinstance(error, requests.exceptions.Timeout):
+            raise error
+        logger.error(
+            get_error_code_message(ErrorCode.API_TIMEOUT_ERROR),
+            error=str(error),
+            request_url=url,
+            target_service=self.target_service,
+            remaining=time_remaining(),
+        )
+        raise ExternalApiError(None, ErrorCode.API_TIMEOUT_ERROR, self.target_service) from error
+
+    def _retry(self, method, url, attempt, status_code=None, error=None) -> bool:
+        """
+        Decides whether a failed call is retried and, if it is, waits out the backoff before returning
+
+        :return: True if the call should be made again
+        """
+        if self.retry_policy is None or not self.retry_policy.is_retryable(method, attempt, status_code):
+            return False
+
+        backoff = self.retry_policy.get_backoff(attempt)
+        remaining = time_remaining()
+        if remaining is not None and remaining <= backoff:
+            logger.warning(
+                "Not retrying call to service, request deadline too close",
+                request_url=url,
+                target_service=self.target_service,
+                attempt=attempt,
+                remaining=remaining,
+            )
+            return False
+
+        # Logged with a fixed metric name so retries can be counted per service from the logs
+        logger.warning(
+            "Retrying call to service",
+            metric="backend_call_retry",
+            method=method,
+            request_url=url,
+            target_service=self.target_service,
+            attempt=attempt,
+            status_code=status_code,
+            error=str(error) if error else None,
+            backoff=backoff,
+        )
+        time.sleep(backoff)
+        return True
+
+    def _get_timeout_within_deadline(self, url, timeout) -> tuple[float, float]:
+        """
+        Clips the timeout to the time left before the request's deadline
+
+        :return: The timeout to use
+        :raises ExternalApiError: Raised with API_TIMEOUT_ERROR if the deadline has already passed
+        """
+        connect_timeout, read_timeout = timeout
+        remaining = time_remaining()
+        if remaining is None or remaining >= max(connect_timeout, read_timeout):
+            return connect_timeout, read_timeout
+
+        if remaining <= 0:
+            logger.error(
+                "Request deadline exceeded before calling service",
+                request_url=url,
+                target_service=self.target_service,
+            )
+            raise ExternalApiError(None, ErrorCode.API_TIMEOUT_ERROR, self.target_service)
+
+        return min(connect_timeout, remaining), min(read_timeout, remaining)
+
+
+class ServiceSessionRegistry:
+    """
+    Holds one pooled, keep-alive ServiceSession per backend service, keyed by the service's *_URL config entry
+    (e.g., PARTY_URL, CASE_URL).
+
+    Sessions are created lazily on first use, so under gunicorn they are built inside each worker after it has
+    forked.  The process id is recorded against the sessions and if it changes (i.e., the app was created in the
+    master and then forked) the inherited sessions are discarded, as sockets must never be shared between processes.
+    """
+
+    def __init__(self, app):
+        self.config = app.config
+        self._sessions = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def get(self, service_url_key: str) -> ServiceSession:
+        """
+        Gets the pooled session for a service, creating it if this worker doesn't have one yet
+
+        :param service_url_key: The config key holding the base url of the service (e.g., PARTY_URL)
+        :return: A ServiceSession with a connection pool mounted for the service
+        :raises KeyError: Raised if the key isn't a *_URL entry in the app config
+        """
+        if not service_url_key.endswith("_URL") or service_url_key not in self.config:
+            raise KeyError(f"{service_url_key} is not a service url in the config")
+
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+
+        session = self._sessions.get(service_url_key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(service_url_key)
+                if session is None:
+                    session = self._create_session(service_url_key)
+                    self._sessions[service_url_key] = session
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+    def get_circuit_breaker_states(self, redis) -> dict:
+        """
+        Gets the state of the circuit breaker for every backend service in the config, in a single redis round trip
+
+        :param redis: The redis connection the breakers share
+        :return: A dict of service name to closed, open or half-open
+        """
+        services = sorted(
+            get_target_service(key)
+            for key, value in self.config.items()
+            if key.endswith("_URL") and value and key != "RESPONSE_OPERATIONS_UI_URL"
+        )
+        breakers = [CircuitBreaker(service, self.config) for service in services]
+        pipeline = redis.pipeline()
+        for breaker in breakers:
+            pipeline.mget(breaker.open_key, breaker.tripped_key)
+        return {breaker.target_service: to_state(*result) for breaker, result in zip(breakers, pipeline.execute())}
+
+    def get_http_cache_stats(self, redis) -> dict:
+        """
+        Gets the http cache counters for every service with an http cache, in a single redis round trip
+
+        :param redis: The redis connection the caches share
+        :return: A dict of service name to its hits, revalidated, misses, hit ratio and bytes saved
+        """
+        return get_http_cache_stats(redis, sorted(get_target_service(key) for key in self._get_http_cache_services()))
+
+    def _get_http_cache_services(self) -> set[str]:
+        return {key.strip() for key in self.config["HTTP_CACHE_SERVICES"].split(",") if key.strip()}
+
+    def _create_session(self, service_url_key: str) -> ServiceSession:
+        timeout = self._get_timeout(service_url_key)
+        logger.debug(
+            "Creating pooled session for service",
+            service=service_url_key,
+            pool_connections=self.config["HTTP_POOL_CONNECTIONS"],
+            pool_maxsize=self.config["HTTP_POOL_MAXSIZE"],
+            keep_alive=self.config["HTTP_KEEP_ALIVE"],
+            timeout=timeout,
+            pid=os.getpid(),
+        )
+        circuit_breaker = None
+        if self.config["CIRCUIT_BREAKER_ENABLED"]:
+            circuit_breaker = CircuitBreaker(get_target_service(service_url_key), self.config)
+        retry_policy = self._get_retry_policy(service_url_key) if self.config["HTTP_RETRY_ENABLED"] else None
+        http_cache = None
+        if self.config["HTTP_CACHE_ENABLED"] and service_url_key in self._get_http_cache_services():
+            http_cache = HttpCache(get_target_service(service_url_key), self.config)
+        session = ServiceSession(service_url_key, timeout, circuit_breaker, retry_policy, http_cache)
+        adapter = HTTPAdapter(
+            pool_connections=self.config["HTTP_POOL_CONNECTIONS"],
+            pool_maxsize=self.config["HTTP_POOL_MAXSIZE"],
+            pool_block=self.config["HTTP_POOL_BLOCK"],
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.config["HTTP_KEEP_ALIVE"]:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _get_timeout(self, service_url_key: str) -> tuple[float, float]:
+        # Per service overrides are named after the url key, e.g. PARTY_URL -> PARTY_CONNECT_TIMEOUT
+        prefix = service_url_key.removesuffix("_URL")
+        return (
+            self.config.get(f"{prefix}_CONNECT_TIMEOUT", self.config["HTTP_CONNECT_TIMEOUT"]),
+            self.config.get(f"{prefix}_READ_TIMEOUT", self.config["HTTP_READ_TIMEOUT"]),
+        )
+
+    def _get_retry_policy(self, service_url_key: str) -> RetryPolicy:
+        prefix = service_url_key.removesuffix("_URL")
+        return RetryPolicy(
+            attempts=self.config.get(f"{prefix}_RETRY_ATTEMPTS", self.config["HTTP_RETRY_ATTEMPTS"]),
+            backoff=self.config.get(f"{prefix}_RETRY_BACKOFF", self.config["HTTP_RETRY_BACKOFF"]),
+            max_backoff=self.config.get(f"{prefix}_RETRY_MAX_BACKOFF", self.config["HTTP_RETRY_MAX_BACKOFF"]),
+            status_codes=parse_status_codes(
+                self.config.get(f"{prefix}_RETRY_STATUS_CODES", self.config["HTTP_RETRY_STATUS_CODES"])
+            ),
+        )
+
+    def _reset_after_fork(self) -> None:
+        # Don't close the inherited sessions, the sockets still belong to the parent process
+        logger.info("Process has forked, discarding inherited sessions", parent_pid=self._pid, pid=os.getpid())
+        self._sessions = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+
+def get_target_service(service_url_key: str) -> str:
+    """Names a service after its url config key, e.g. COLLECTION_INSTRUMENT_URL -> collection-instrument"""
+    return service_url_key.removesuffix("_URL").lower().replace("_", "-")
+
+
+def get_session(service_url_key: str) -> ServiceSession:
+    """
+    Gets the pooled session for a backend service from the registry on the current app
+
+    :param service_url_key: The config key holding the base url of the service (e.g., PARTY_URL)
+    :return: A ServiceSession to make the call with
+    """
+    return current_app.http_sessions.get(service_url_key)
@@ -1,47 +1,65 @@
-import json
 import logging
 
 from flask import current_app
 from redis.exceptions import RedisError
 from structlog import wrap_logger
 
+from response_operations_ui.common.controller_cache import cached, get_many, set_many
+from response_operations_ui.common.survey_index import (
+    read_survey_list,
+    store_survey_list,
+)
 from response_operations_ui.controllers.cir_controller import get_cir_metadata
 from response_operations_ui.controllers.survey_controllers import (
+    format_survey_list,
+    get_business_surveys,
     get_survey_by_shortname,
-    get_surveys_list,
 )
+from response_operations_ui.exceptions.error_codes import ErrorCode
+from response_operations_ui.exceptions.exceptions import ExternalApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
 
 
 class RedisCache:
     EXPIRY = 600  # 10 mins
+    NEGATIVE_EXPIRY = 30  # 30 secs
     APPLICATION_KEY = "response-operations-ui"
 
+    @cached(
+        "cir",
+        lambda result: RedisCache.EXPIRY if result else RedisCache.NEGATIVE_EXPIRY,
+        key=lambda self, survey_ref, formtype: f"{survey_ref}:{formtype}",
+    )
     def get_cir_metadata(self, survey_ref: str, formtype: str) -> dict:
         """
-        Gets the cir_metadata from redis or the cir service
+        Gets the cir_metadata from redis or the cir service.  Empty results, and the errors the CIR service returns,
+        are only kept for NEGATIVE_EXPIRY seconds, so a form type with nothing published yet or a CIR outage isn't
+        asked about again on every page view, but isn't remembered for long either.
 
         :param survey_ref: str: the qualifying part of the redis key
-                                (response-operations-ui:survey:<SURVEY_REF>:<FORMTYPE>)
+                                (response-operations-ui:cir:<SURVEY_REF>:<FORMTYPE>)
         :param formtype: str: the formtype of the instrument
         :return: Result from either the cache or the CIR service
+        :raises ExternalApiError: Raised when the CIR service, or the last call to it, failed
         """
-        redis_key = f"{self.APPLICATION_KEY}:cir:{survey_ref}:{formtype}"
-        try:
-            result = current_app.redis.get(redis_key)
-        except RedisError:
-            logger.error("Error getting value from cache", key=redis_key, exc_info=True)
-            result = None
-
-        if not result:
-            logger.info("Key not in cache, getting value from CIR service", key=redis_key)
-            result = get_cir_metadata(survey_ref, formtype)
-            self.set(redis_key, json.dumps(result), self.EXPIRY)
-            return result
-
-        return json.loads(result.decode("utf-8"))
+        key = f"{survey_ref}:{formtype}"
+        error = get_many("cir-error", [key]).get(key)
+        if error:
+            logger.info("CIR error in cache, not calling the CIR service", key=key, error_code=error["error_code"])
+            raise ExternalApiError(None, ErrorCode(error["error_code"]), error["target_service"])
 
+        try:
+            return get_cir_metadata(survey_ref, formtype)
+        except ExternalApiError as e:
+            set_many(
+                "cir-error",
+                {key: {"error_code": e.error_code.value, "target_service": e.target_service}},
+                self.NEGATIVE_EXPIRY,
+            )
+            raise
+
+    @cached("survey", EXPIRY, key=lambda self, short_name: short_name)
     def get_survey_by_shortname(self, short_name: str) -> dict:
         """
         Gets the survey from redis or the survey service
@@ -49,36 +67,25 @@ class RedisCache:
         :param short_name: str: the qualifying part of the redis key (response-operations-ui:survey:<SURVEY_SHORT_NAME>)
         :return: Result from either the cache or survey service
         """
-        redis_key = f"{self.APPLICATION_KEY}:survey:{short_name}"
-        try:
-            result = current_app.redis.get(redis_key)
-        except RedisError:
-            logger.error("Error getting value from cache, please investigate", key=redis_key, exc_info=True)
-            result = None
-
-        if not result:
-            logger.info("Key not in cache, getting value from survey service", key=redis_key)
-            result = get_survey_by_shortname(short_name)
-            self.set(redis_key, json.dumps(result), self.EXPIRY)
-            return result
-
-        return json.loads(result.decode("utf-8"))
+        return get_survey_by_shortname(short_name)
 
     def refresh_survey_list(self) -> dict:
         """
-        Refreshes the survey list cached in redis by retrieving it from the survey service
+        Refreshes the survey list cached in redis by retrieving it from the survey service.  The survey list is what
+        the survey index is loaded from, so every worker's index is invalidated too.
+        """
+        return sorted(format_survey_list(self.reload_survey_list()), key=lambda k: k["surveyRef"])
+
+    def reload_survey_list(self) -> list:
+        """
+        Refreshes the survey list cached in redis as refresh_survey_list does, but returns the surveys as the survey
+        service returns them, with the short names surveys are looked up by rather than the ones shown
         """
         redis_key = f"{self.APPLICATION_KEY}:survey-list"
         logger.info("Refreshing cached survey list", redis_key=redis_key)
-        current_app.redis.delete(redis_key)
-        result = get_surveys_list()
-        redis_hash_mapping = {}
-
-        for survey in result:
-            redis_hash_mapping[f'{survey["id"]}:{survey["shortName"]}:{survey["surveyRef"]}'] = json.dumps(survey)
-
-        current_app.redis.hset(redis_key, mapping=redis_hash_mapping)
-        current_app.redis.expire(redis_key, self.EXPIRY)
+        result = get_business_surveys()
+        store_survey_list(result)
+        current_app.survey_index.clear()
 
         return result
 
@@ -86,18 +93,14 @@ class RedisCache:
         """
         Gets the survey list from redis or the survey service
         """
-        redis_key = f"{self.APPLICATION_KEY}:survey-list"
-        try:
-            result = [json.loads(survey) for survey in current_app.redis.hvals(redis_key)]
-        except RedisError:
-            logger.error("Error getting value from cache, please investigate", redis_key=redis_key)
-            result = None
-
+        result = read_survey_list(get_business_surveys)
         if not result:
-            logger.info("Key not in cache, getting values from survey service", redis_key=redis_key)
-            result = self.refresh_survey_list()
+            logger.info(
+                "Key not in cache, getting values from survey service", redis_key=f"{self.APPLICATION_KEY}:survey-list"
+            )
+            return self.refresh_survey_list()
 
-        return result
+        return format_survey_list(result)
 
     def set(self, key, value, expiry):
         if not expiry:
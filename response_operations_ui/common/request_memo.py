@@ -0,0 +1,85 @@
+import copy
+import logging
+import threading
+from collections import Counter
+from functools import wraps
+
+from flask import g, has_app_context
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+class RequestMemo:
+    """The results of the memoized calls made while handling a request, and how many duplicate calls they saved"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results = {}
+        self.duplicates = Counter()
+
+
+def start_request_memo() -> None:
+    """
+    Starts an empty memo for the current request.  It's kept on flask.g, so it's thrown away with the request and is
+    shared with the threads fan_out runs calls in.
+    """
+    g.request_memo = RequestMemo()
+
+
+def get_request_memo() -> RequestMemo:
+    if "request_memo" not in g:
+        start_request_memo()
+    return g.request_memo
+
+
+def clear_request_memo() -> None:
+    """Forgets everything memoized so far in the current request, e.g. after a write has changed it"""
+    if has_app_context() and "request_memo" in g:
+        with g.request_memo.lock:
+            g.request_memo.results.clear()
+
+
+def memoize_per_request(f):
+    """
+    Decorator that makes a controller call at most once per request for each set of arguments it's called with.
+    Later calls get a copy of the first call's result, so callers are free to change what they get back.  Exceptions
+    aren't remembered, so a failed call is made again the next time it's asked for.
+
+    Outside of an app context, or if the arguments can't be hashed, the call is made every time.
+    """
+    name = f"{f.__module__}.{f.__qualname__}"
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if not has_app_context():
+            return f(*args, **kwargs)
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return f(*args, **kwargs)
+
+        memo = get_request_memo()
+        with memo.lock:
+            if key in memo.results:
+                memo.duplicates[name] += 1
+                return copy.deepcopy(memo.results[key])
+
+        result = f(*args, **kwargs)
+        with memo.lock:
+            memo.results[key] = copy.deepcopy(result)
+        return result
+
+    return wrapper
+
+
+def log_duplicates_eliminated() -> None:
+    """Logs, at debug, how many duplicate calls the memo saved during the current request"""
+    memo = g.get("request_memo")
+    if memo and memo.duplicates:
+        logger.debug(
+            "Duplicate calls eliminated for request",
+            duplicates_eliminated=sum(memo.duplicates.values()),
+            by_call=dict(memo.duplicates),
+        )
@@ -0,0 +1,41 @@
+import random
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class RetryPolicy:
+    """
+    How failed calls to a single backend service are retried.  Only idempotent calls are retried, and only when they
+    fail to connect or the service returns one of the retryable status codes.
+
+    The backoff uses full jitter, a random time between zero and the exponential backoff for the attempt, so that
+    workers retrying after the same blip don't all call the service again at the same moment.
+    """
+
+    def __init__(self, attempts: int, backoff: float, max_backoff: float, status_codes: set[int]):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.status_codes = status_codes
+
+    def is_retryable(self, method: str, attempt: int, status_code: int = None) -> bool:
+        """
+        :param method: The HTTP method of the call
+        :param attempt: The number of attempts made so far, starting at 1
+        :param status_code: The status code the service returned, or None if the call failed to connect
+        :return: True if another attempt is allowed
+        """
+        if attempt >= self.attempts or method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        return status_code is None or status_code in self.status_codes
+
+    def get_backoff(self, attempt: int) -> float:
+        """Gets the number of seconds to wait before the retry that follows the given attempt"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+def parse_status_codes(status_codes) -> set[int]:
+    """Parses retryable status codes from a comma separated string (e.g., '502,503,504') or an iterable of codes"""
+    if isinstance(status_codes, str):
+        status_codes = status_codes.split(",")
+    return {int(status_code) for status_code in status_codes if str(status_code).strip()}
@@ -0,0 +1,39 @@
+from flask import Flask, Request, request
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.wrappers import Response
+
+
+def get_sessionless_paths(app: Flask) -> tuple[str, ...]:
+    return tuple(path.strip() for path in app.config["SESSIONLESS_PATHS"].split(",") if path.strip())
+
+
+def is_sessionless_request(app: Flask, req: Request = None) -> bool:
+    """
+    Whether the request is for a path in SESSIONLESS_PATHS, e.g. the /info probe, or below one that ends with a /,
+    e.g. static assets.  They're handled without a session, CSRF checks or the user being loaded, so they don't call
+    redis.
+    """
+    path = (req or request).path
+    return any(
+        path.startswith(sessionless_path) if sessionless_path.endswith("/") else path.rstrip("/") == sessionless_path
+        for sessionless_path in app.sessionless_paths
+    )
+
+
+class SessionlessPathsInterface(SessionInterface):
+    """
+    Wraps the app's session interface so requests for SESSIONLESS_PATHS get flask's null session, which is never
+    loaded from or saved to the session store (and can't be written to), rather than a session of their own.  The
+    session is opened before the url is matched to an endpoint, so they're told apart by their path.
+    """
+
+    def __init__(self, interface: SessionInterface):
+        self.interface = interface
+
+    def open_session(self, app: Flask, req: Request) -> SessionMixin | None:
+        if is_sessionless_request(app, req):
+            return None
+        return self.interface.open_session(app, req)
+
+    def save_session(self, app: Flask, session: SessionMixin, response: Response) -> None:
+        self.interface.save_session(app, session, response)
@@ -0,0 +1,182 @@
+import copy
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial, wraps
+from typing import Callable
+from uuid import uuid4
+
+from flask import current_app
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
+from response_operations_ui.common.deadline import time_remaining
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+KEY_PREFIX = "response-operations-ui:single-flight"
+POLL_INTERVAL = 0.05
+
+# Deletes the lock only if it's still the one this worker took.  If the call outlasted the lock another worker may
+# have taken it since, and that worker's lock mustn't be released
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls made at the same time by threads in this worker.  The first thread to ask for a key
+    makes the call and every thread that asks for the same key while it's in flight waits for, and gets a copy of,
+    its result (or exception).  The result is copied before it's shared, so what the first thread does with its own
+    doesn't change what the others get.  Nothing is kept once the call has finished.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+
+    def do(self, key: str, call: Callable):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            logger.debug("Waiting on in-flight call", key=key)
+            # Callers are free to change what they get back, so they mustn't share it
+            return copy.deepcopy(future.result())
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(copy.deepcopy(result))
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+_in_flight = SingleFlight()
+
+
+def single_flight(key: str, fetch: Callable):
+    """
+    Makes a backend read once for everyone asking for the same thing at the same time.  Threads in this worker share
+    the call already in flight.  Across workers, the first to take a short redis lock on the key makes the call and
+    publishes its result in redis, while the others wait up to SINGLE_FLIGHT_WAIT_SECONDS (and never past the
+    request deadline) for it before giving up and making the call themselves.
+
+    Results are only shared with callers that were waiting on the call, so nothing is served that's older than the
+    call itself.  If redis can't be reached, or SINGLE_FLIGHT_WAIT_SECONDS is 0, workers don't coordinate.
+
+    :param key: Identifies the read, e.g. collection-exercises-by-survey:<survey_id>
+    :param fetch: A callable taking no arguments that makes the read and returns something json serialisable
+    :return: The result of the read
+    """
+    return _in_flight.do(key, partial(_fetch_across_workers, key, fetch))
+
+
+def coalesce(key_prefix: str):
+    """
+    Decorator that puts a controller read through single_flight, keyed by key_prefix and the positional arguments
+    it's called with
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args):
+            return single_flight(":".join([key_prefix, *map(str, args)]), partial(f, *args))
+
+        return wrapper
+
+    return decorator
+
+
+def _fetch_across_workers(key: str, fetch: Callable):
+    wait_seconds = current_app.config["SINGLE_FLIGHT_WAIT_SECONDS"]
+    if not wait_seconds:
+        return fetch()
+
+    lock_key = f"{KEY_PREFIX}:{key}:lock"
+    token = uuid4().hex
+    try:
+        pipeline = current_app.redis.pipeline()
+        pipeline.set(lock_key, token, nx=True, px=int(wait_seconds * 1000))
+        pipeline.get(lock_key)
+        acquired, leader_token = pipeline.execute()
+    except RedisError:
+        logger.error("Error taking single flight lock", key=key, exc_info=True)
+        return fetch()
+
+    if acquired:
+        return _fetch_and_publish(key, lock_key, token, fetch, wait_seconds)
+    if leader_token is None:
+        return fetch()
+
+    result = _wait_for_result(key, lock_key, leader_token, wait_seconds)
+    if result is not None:
+        return json.loads(result)
+    logger.info("Gave up waiting on another worker, making the call", key=key)
+    return fetch()
+
+
+def _fetch_and_publish(key: str, lock_key: str, token: str, fetch: Callable, wait_seconds: float):
+    try:
+        result = fetch()
+    except BaseException:
+        _release(lock_key, token)
+        raise
+
+    try:
+        pipeline = current_app.redis.pipeline()
+        pipeline.set(f"{KEY_PREFIX}:{key}:result:{token}", json.dumps(result), px=int(wait_seconds * 1000))
+        _delete_lock(pipeline, lock_key, token)
+        pipeline.execute()
+    except RedisError:
+        # Not throwing an exception as the waiting workers will make the call themselves
+        logger.error("Error publishing single flight result", key=key, exc_info=True)
+    return result
+
+
+def _wait_for_result(key: str, lock_key: str, leader_token: bytes, wait_seconds: float) -> bytes | None:
+    remaining = time_remaining()
+    if remaining is not None:
+        wait_seconds = min(wait_seconds, remaining)
+    result_key = f"{KEY_PREFIX}:{key}:result:{leader_token.decode()}"
+    give_up_at = time.monotonic() + wait_seconds
+
+    while time.monotonic() < give_up_at:
+        time.sleep(POLL_INTERVAL)
+        try:
+            result, current_token = current_app.redis.mget(result_key, lock_key)
+        except RedisError:
+            logger.error("Error waiting for single flight result", key=key, exc_info=True)
+            return None
+        if result is not None:
+            return result
+        if current_token != leader_token:
+            # The other worker's call failed, or its lock expired, without publishing a result
+            return None
+    return None
+
+
+def _delete_lock(client, lock_key: str, token: str) -> None:
+    client.register_script(RELEASE_LOCK_SCRIPT)(keys=[lock_key], args=[token], client=client)
+
+
+def _release(lock_key: str, token: str) -> None:
+    try:
+        _delete_lock(current_app.redis, lock_key, token)
+    except RedisError:
+        logger.error("Error releasing single flight lock", key=lock_key, exc_info=True)
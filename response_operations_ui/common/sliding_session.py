@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from flask import Flask
+from flask_session.base import ServerSideSession
+from flask_session.defaults import Defaults
+from flask_session.redis import RedisSessionInterface
+
+
+class SlidingRedisSessionInterface(RedisSessionInterface):
+    """
+    Sessions in redis that expire PERMANENT_SESSION_LIFETIME after the last request made with them.  Flask-Session
+    writes the whole session to redis on every request to do that, so instead a session that hasn't changed only has
+    the expiry of its key in redis moved on with EXPIRE, and is only written when it has.
+
+    Changes are spotted by the session being assigned to, so anything changing a value in the session in place (e.g.,
+    appending to a list in it) must assign it back, as it must for flask's own sessions.
+    """
+
+    def _upsert_session(self, session_lifetime: timedelta, session: ServerSideSession, store_id: str) -> None:
+        # If the key has already expired, EXPIRE does nothing and the session is written again as it is
+        if not session.modified and self.client.expire(store_id, session_lifetime):
+            return
+        super()._upsert_session(session_lifetime, session, store_id)
+
+
+def create_sliding_session_interface(app: Flask) -> SlidingRedisSessionInterface:
+    """Creates the session interface from the same config Flask-Session creates its own from"""
+    config = app.config
+    return SlidingRedisSessionInterface(
+        app,
+        client=config["SESSION_REDIS"],
+        key_prefix=config.get("SESSION_KEY_PREFIX", Defaults.SESSION_KEY_PREFIX),
+        use_signer=config.get("SESSION_USE_SIGNER", Defaults.SESSION_USE_SIGNER),
+        permanent=config.get("SESSION_PERMANENT", Defaults.SESSION_PERMANENT),
+        sid_length=config.get("SESSION_ID_LENGTH", Defaults.SESSION_ID_LENGTH),
+        serialization_format=config.get("SESSION_SERIALIZATION_FORMAT", Defaults.SESSION_SERIALIZATION_FORMAT),
+    )
@@ -0,0 +1,262 @@
+import copy
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+from uuid import uuid4
+
+from flask import current_app
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
+from response_operations_ui.common.cache_codec import decode, encode
+from response_operations_ui.common.cache_metrics import (
+    ERROR,
+    HIT,
+    MISS,
+    record_cache_read,
+    timed_refresh,
+)
+from response_operations_ui.common.controller_cache import (
+    INVALIDATION_CHANNEL,
+    get_cache_key,
+)
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+NAMESPACE = "survey-list"
+INDEX_NAMESPACE = "survey-index"
+SURVEY_LIST_EXPIRY = 600  # 10 mins
+SURVEY_LIST_STALE_EXPIRY = 86400  # 1 day
+REFRESH_LOCK_EXPIRY = 30
+OTHER_SURVEYS_MAX_SIZE = 128
+
+
+class SurveyIndex:
+    """
+    An index of the business surveys that's looked up by id, short name or survey ref without calling the survey
+    service.
+
+    It has two tiers.  Each worker keeps the whole index in memory for up to SURVEY_INDEX_LOCAL_EXPIRY seconds, along
+    with a small LRU of surveys that aren't in it (e.g., social surveys looked up by id).  Behind that is the survey
+    list hash in redis, which every worker shares and the surveys page is rendered from.  When a write invalidates the
+    survey list, every worker is told through redis pub/sub to forget what it holds in memory.
+
+    If SURVEY_INDEX_REDIS_ENABLED is off, or redis can't be reached, each worker loads the index from the survey
+    service itself.
+    """
+
+    def __init__(self, load: Callable[[], list]):
+        self._load = load
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_short_name = {}
+        self._by_ref = {}
+        self._others = OrderedDict()
+        self._loaded_at = None
+        self._subscribed_pid = None
+
+    def get_by_id(self, survey_id: str, load: bool = True, refresh_on_miss: bool = False) -> dict | None:
+        """
+        :param survey_id: The uuid of the survey
+        :param load: Whether to load the index from the survey service if it isn't in memory or redis.  Callers that
+                     can get the survey from the survey service on its own shouldn't load the whole index to do so
+        :param refresh_on_miss: Whether to reload the index from the survey service if the survey isn't in it, in
+                                case it's been created since the index was loaded
+        :return: The survey, or None if it isn't a survey the index knows about
+        """
+        start = time.perf_counter()
+        survey = self._get("_by_id", survey_id, load, refresh_on_miss)
+        if survey is None:
+            with self._lock:
+                if survey_id in self._others:
+                    self._others.move_to_end(survey_id)
+                    survey = copy.deepcopy(self._others[survey_id])
+        return _record_lookup(start, survey)
+
+    def get_by_short_name(self, short_name: str, load: bool = True) -> dict | None:
+        start = time.perf_counter()
+        return _record_lookup(start, self._get("_by_short_name", normalise_short_name(short_name), load))
+
+    def get_by_ref(self, survey_ref: str, load: bool = True) -> dict | None:
+        start = time.perf_counter()
+        return _record_lookup(start, self._get("_by_ref", survey_ref, load))
+
+    def remember(self, survey_id: str, survey: dict) -> None:
+        """Keeps a survey the index doesn't cover, fetched from the survey service by id, in the LRU"""
+        with self._lock:
+            self._others[survey_id] = copy.deepcopy(survey)
+            self._others.move_to_end(survey_id)
+            while len(self._others) > OTHER_SURVEYS_MAX_SIZE:
+                self._others.popitem(last=False)
+
+    def refresh(self) -> list:
+        """Reloads the index from the survey service and shares it with the other workers through redis"""
+        with timed_refresh(NAMESPACE):
+            surveys = self._load()
+        if current_app.config["SURVEY_INDEX_REDIS_ENABLED"]:
+            store_survey_list(surveys)
+        self._build(surveys)
+        return surveys
+
+    def clear(self) -> None:
+        """Forgets everything held in memory, so it's reloaded on the next lookup"""
+        with self._lock:
+            self._loaded_at = None
+            self._others.clear()
+
+    def invalidate(self, namespace: str) -> None:
+        """Forgets everything held in memory if what's been invalidated is the survey list it's loaded from"""
+        if namespace.split(":")[0] == NAMESPACE:
+            self.clear()
+
+    def _get(self, index: str, key: str, load: bool, refresh_on_miss: bool = False) -> dict | None:
+        if not self._ensure_current(load):
+            return None
+        survey = getattr(self, index).get(key)
+        if survey is None and refresh_on_miss:
+            self.refresh()
+            survey = getattr(self, index).get(key)
+        return copy.deepcopy(survey)
+
+    def _ensure_current(self, load: bool) -> bool:
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at < current_app.config["SURVEY_INDEX_LOCAL_EXPIRY"]:
+            return True
+
+        surveys = None
+        if current_app.config["SURVEY_INDEX_REDIS_ENABLED"]:
+            self._subscribe()
+            surveys = read_survey_list(self._load)
+        if surveys:
+            self._build(surveys)
+        elif load:
+            self.refresh()
+        else:
+            return False
+        return True
+
+    def _build(self, surveys: list) -> None:
+        by_id = {survey["id"]: survey for survey in surveys}
+        by_short_name = {normalise_short_name(survey["shortName"]): survey for survey in surveys}
+        by_ref = {survey["surveyRef"]: survey for survey in surveys}
+        with self._lock:
+            self._by_id, self._by_short_name, self._by_ref = by_id, by_short_name, by_ref
+            self._loaded_at = time.monotonic()
+        logger.debug("Loaded survey index", surveys=len(surveys))
+
+    def _subscribe(self) -> None:
+        # The thread listening for invalidations doesn't survive a fork, so each worker starts its own
+        if self._subscribed_pid == os.getpid():
+            return
+        with self._lock:
+            if self._subscribed_pid == os.getpid():
+                return
+            try:
+                pubsub = current_app.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_invalidation})
+                pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=self._on_subscriber_error)
+            except RedisError:
+                logger.error("Error subscribing to survey index invalidations", exc_info=True)
+                return
+            self._subscribed_pid = os.getpid()
+
+    def _on_invalidation(self, message: dict) -> None:
+        logger.debug("Cache invalidation received", invalidated=message["data"].decode())
+        self.invalidate(message["data"].decode())
+
+    def _on_subscriber_error(self, error: Exception, pubsub, thread) -> None:
+        # Invalidations may have been missed while redis couldn't be reached
+        logger.error("Error listening for survey index invalidations", error=str(error))
+        self.clear()
+        time.sleep(1)
+
+
+def _record_lookup(start: float, survey: dict | None) -> dict | None:
+    record_cache_read(INDEX_NAMESPACE, MISS if survey is None else HIT, time.perf_counter() - start)
+    return survey
+
+
+def normalise_short_name(short_name: str) -> str:
+    """Short names are matched the way the survey service matches them, ignoring case and whitespace"""
+    return "".join(short_name.split()).lower()
+
+
+def read_survey_list(load: Callable[[], list]) -> list | None:
+    """
+    Gets the surveys from the survey list hash in redis, or None if it isn't there (or redis can't be reached).  Once
+    the list is older than SURVEY_LIST_EXPIRY it's still returned, but one worker refreshes it in the background.
+
+    :param load: Gets the surveys from the survey service, to refresh the list with
+    """
+    redis_key = get_cache_key(NAMESPACE)
+    start = time.perf_counter()
+    try:
+        surveys = current_app.redis.hvals(redis_key)
+        if surveys and not current_app.redis.exists(get_cache_key(NAMESPACE, "fresh")):
+            refresh_survey_list_in_background(load)
+        decoded = [decode(survey) for survey in surveys] or None
+    except (RedisError, ValueError):
+        record_cache_read(NAMESPACE, ERROR, time.perf_counter() - start)
+        logger.error("Error getting value from cache, please investigate", redis_key=redis_key)
+        return None
+    outcome = MISS if decoded is None else HIT
+    record_cache_read(NAMESPACE, outcome, time.perf_counter() - start, sum(len(survey) for survey in surveys))
+    return decoded
+
+
+def refresh_survey_list_in_background(load: Callable[[], list]) -> None:
+    """
+    Refreshes the survey list in a background thread, unless another worker already is.  The lock isn't released
+    once the refresh is done, so a survey service that's failing is only asked again once it's expired.
+    """
+    if not current_app.redis.set(
+        get_cache_key(NAMESPACE, "refresh-lock"), os.getpid(), nx=True, ex=REFRESH_LOCK_EXPIRY
+    ):
+        return
+
+    app = current_app._get_current_object()
+
+    def refresh():
+        with app.app_context():
+            try:
+                with timed_refresh(NAMESPACE):
+                    surveys = load()
+                store_survey_list(surveys)
+            except Exception:
+                logger.exception("Failed to refresh the survey list in the background")
+
+    logger.info("Refreshing stale survey list in the background")
+    threading.Thread(target=refresh, name="survey-list-refresh", daemon=True).start()
+
+
+def store_survey_list(surveys: list) -> None:
+    """
+    Replaces the survey list hash in redis, ordered by survey ref, and tells every worker to forget the surveys they
+    hold in memory.  The new list is written under a key of its own and renamed over the old one, so anyone reading
+    it gets the whole of one or the other.
+    """
+    redis_key = get_cache_key(NAMESPACE)
+    pipeline = current_app.redis.pipeline()
+    if surveys:
+        new_key = get_cache_key(NAMESPACE, uuid4().hex)
+        pipeline.hset(
+            new_key,
+            mapping={
+                f'{survey["id"]}:{survey["shortName"]}:{survey["surveyRef"]}': encode(survey)
+                for survey in sorted(surveys, key=lambda k: k["surveyRef"])
+            },
+        )
+        pipeline.expire(new_key, SURVEY_LIST_STALE_EXPIRY)
+        pipeline.rename(new_key, redis_key)
+        pipeline.set(get_cache_key(NAMESPACE, "fresh"), 1, ex=SURVEY_LIST_EXPIRY)
+    else:
+        pipeline.delete(redis_key)
+    pipeline.publish(INVALIDATION_CHANNEL, NAMESPACE)
+    try:
+        pipeline.execute()
+    except RedisError:
+        # Not throwing an exception as the cache isn't fatal
+        logger.error("Error storing survey list, please investigate", redis_key=redis_key, exc_info=True)
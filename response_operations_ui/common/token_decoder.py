@@ -1,7 +1,9 @@
+import hashlib
 import logging
+import time
 
 import jwt
-from flask import current_app
+from flask import current_app, session
 from itsdangerous import URLSafeTimedSerializer
 from structlog import wrap_logger
 from werkzeug.exceptions import InternalServerError
@@ -15,13 +17,42 @@ def decode_access_token(access_token):
     """Decodes the access token provided by uaa.  It's important to note that this JWT is
     using RS256 as it's what uaa uses whereas other parts of the application use HS256.
     """
-    uaa_public_key = get_uaa_public_key()
+    uaa_public_key = get_uaa_public_key(jwt.get_unverified_header(access_token).get("kid"))
     decoded_jwt = jwt.decode(
         access_token, key=uaa_public_key, algorithms=["RS256"], audience="response_operations", leeway=10
     )
     return decoded_jwt
 
 
+def get_access_token_claims() -> dict:
+    """
+    Gets the claims of the uaa access token in the session.  They're kept in the session until the token expires, so
+    its RS256 signature is verified once per sign-in rather than on every call to a service that needs them.
+    """
+    access_token = session.get("token")
+    cached = session.get("token_claims")
+    if (
+        cached
+        and access_token
+        and cached["token_hash"] == _hash_token(access_token)
+        and time.time() < cached["claims"].get("exp", 0)
+    ):
+        return cached["claims"]
+
+    claims = decode_access_token(access_token)
+    remember_access_token_claims(access_token, claims)
+    return claims
+
+
+def remember_access_token_claims(access_token: str, claims: dict) -> None:
+    """Keeps the claims of an access token that's been decoded in the session, for get_access_token_claims"""
+    session["token_claims"] = {"token_hash": _hash_token(access_token), "claims": claims}
+
+
+def _hash_token(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
 def generate_token(data):
     """
     Creates a token based on data provided
@@ -1,44 +1,203 @@
 import logging
+import os
+import threading
+import time
 from json import JSONDecodeError
+from uuid import uuid4
 
 import requests
 from flask import current_app
+from redis.exceptions import RedisError
 from requests import HTTPError
 from structlog import wrap_logger
 
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.controllers import uaa_controller
 from response_operations_ui.exceptions.exceptions import NoPermissionError
 
 logger = wrap_logger(logging.getLogger(__name__))
 
+KEY_PREFIX = "response-operations-ui:uaa-signing-keys"
+SIGNING_KEYS_STALE_EXPIRY = 604800  # 1 week
+REFRESH_LOCK_EXPIRY = 30
 
-def request_uaa_public_key(app):
+
+class SigningKeyCache:
+    """
+    The keys UAA signs access tokens with, by their kid, so a token signed with a key that's being rotated in can be
+    verified as well as one signed with the key being rotated out.
+
+    Each worker holds the keys in memory, behind a hash in redis that every worker shares.  Once the keys in redis are
+    older than UAA_SIGNING_KEY_REFRESH_INTERVAL they're still used, but one worker fetches them again from UAA in the
+    background.  A token with a kid that isn't known makes the keys be read again from redis, in case another worker
+    has already fetched the one it was signed with, and if it's still not known they're fetched from UAA there and
+    then.  That's done no more than once every UAA_SIGNING_KEY_REFETCH_INTERVAL seconds across every worker, so a flood
+    of bad tokens (or UAA being down) doesn't turn into a flood of calls to UAA.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._loaded_at = None
+        self._refetched_at = None
+
+    def get(self, kid: str | None) -> str | None:
+        """
+        :param kid: The kid in the header of the token, or None if it hasn't got one
+        :return: The public key the token was signed with, or None if it isn't one UAA has
+        """
+        just_read = self._ensure_current()
+        key = self._get(kid)
+        if key is None and not just_read:
+            keys = read_signing_keys()
+            if keys:
+                self._build(keys)
+                key = self._get(kid)
+        if key is None and self._may_refetch():
+            logger.info("Token signed with an unknown key, fetching the signing keys from UAA", kid=kid)
+            self.refresh()
+            key = self._get(kid)
+        return key
+
+    def refresh(self) -> None:
+        """Fetches the keys from UAA and shares them with the other workers through redis"""
+        keys = request_uaa_signing_keys(current_app)
+        if keys:
+            store_signing_keys(keys)
+            self._build(keys)
+
+    def _get(self, kid: str | None) -> str | None:
+        keys = self._keys
+        if kid is None:
+            # Tokens from before UAA had more than one key don't say which they were signed with
+            return next(iter(keys.values()), None)
+        return keys.get(kid)
+
+    def _ensure_current(self) -> bool:
+        """Loads the keys from redis, or UAA if they aren't there, once they're older than
+        UAA_SIGNING_KEY_REFRESH_INTERVAL.  Returns whether they were read from redis"""
+        loaded_at = self._loaded_at
+        if (
+            loaded_at is not None
+            and time.monotonic() - loaded_at < current_app.config["UAA_SIGNING_KEY_REFRESH_INTERVAL"]
+        ):
+            return False
+
+        keys = read_signing_keys()
+        if keys:
+            self._build(keys)
+        elif self._may_refetch():
+            self.refresh()
+        return True
+
+    def _may_refetch(self) -> bool:
+        """Whether the keys can be fetched from UAA now, which each worker and all of them together do at most once
+        every UAA_SIGNING_KEY_REFETCH_INTERVAL seconds"""
+        interval = current_app.config["UAA_SIGNING_KEY_REFETCH_INTERVAL"]
+        with self._lock:
+            if self._refetched_at is not None and time.monotonic() - self._refetched_at < interval:
+                return False
+        try:
+            acquired = bool(current_app.redis.set(f"{KEY_PREFIX}:refetch-lock", os.getpid(), nx=True, ex=interval))
+        except RedisError:
+            logger.error("Error taking signing key refetch lock", exc_info=True)
+            acquired = True
+        if acquired:
+            with self._lock:
+                self._refetched_at = time.monotonic()
+        return acquired
+
+    def _build(self, keys: dict) -> None:
+        with self._lock:
+            self._keys = keys
+            self._loaded_at = time.monotonic()
+        logger.debug("Loaded UAA signing keys", kids=list(keys))
+
+
+def request_uaa_signing_keys(app) -> dict | None:
+    """
+    Fetches the keys UAA signs tokens with
+
+    :return: A dict of kid to public key, or None if they couldn't be fetched
+    """
     headers = {
         "Accept": "application/json",
     }
 
-    public_key_url = f'{app.config["UAA_SERVICE_URL"]}/token_key'
+    token_keys_url = f'{app.config["UAA_SERVICE_URL"]}/token_keys'
 
     try:
-        response = requests.get(public_key_url, headers=headers)
+        response = get_session("UAA_SERVICE_URL").get(token_keys_url, headers=headers)
         response.raise_for_status()
         res_json = response.json()
-        return res_json["value"]
+        return {key["kid"]: key["value"] for key in res_json["keys"]} or None
     except HTTPError:
-        logger.exception(f"Error while retrieving public key from UAA at {public_key_url}")
+        logger.exception(f"Error while retrieving signing keys from UAA at {token_keys_url}")
     except requests.RequestException:
-        logger.exception(f"Error during request to get public key from {public_key_url}")
+        logger.exception(f"Error during request to get signing keys from {token_keys_url}")
     except KeyError:
-        logger.exception(f"No public key returned by UAA {public_key_url}")
+        logger.exception(f"No signing keys returned by UAA {token_keys_url}")
     except (JSONDecodeError, ValueError):
-        logger.exception(f"Unable to decode response from UAA {public_key_url}")
+        logger.exception(f"Unable to decode response from UAA {token_keys_url}")
     return None
 
 
-def get_uaa_public_key():
-    if not current_app.config.get("UAA_PUBLIC_KEY"):
-        current_app.config["UAA_PUBLIC_KEY"] = request_uaa_public_key(current_app)
-    return current_app.config["UAA_PUBLIC_KEY"]
+def read_signing_keys() -> dict | None:
+    """
+    Gets the signing keys from redis, or None if they aren't there (or redis can't be reached).  Once they're older
+    than UAA_SIGNING_KEY_REFRESH_INTERVAL they're still returned, but one worker refreshes them in the background.
+    """
+    try:
+        keys = current_app.redis.hgetall(KEY_PREFIX)
+        if keys and not current_app.redis.exists(f"{KEY_PREFIX}:fresh"):
+            refresh_signing_keys_in_background()
+    except RedisError:
+        logger.error("Error getting signing keys from cache, please investigate", exc_info=True)
+        return None
+    return {kid.decode(): key.decode() for kid, key in keys.items()} or None
+
+
+def refresh_signing_keys_in_background() -> None:
+    """Refreshes the signing keys in a background thread, unless another worker already is"""
+    if not current_app.redis.set(f"{KEY_PREFIX}:refresh-lock", os.getpid(), nx=True, ex=REFRESH_LOCK_EXPIRY):
+        return
+
+    app = current_app._get_current_object()
+
+    def refresh():
+        with app.app_context():
+            try:
+                app.uaa_signing_keys.refresh()
+            except Exception:
+                logger.exception("Failed to refresh the UAA signing keys in the background")
+
+    threading.Thread(target=refresh, name="uaa-signing-key-refresh", daemon=True).start()
+
+
+def store_signing_keys(keys: dict) -> None:
+    """Replaces the signing keys in redis, all at once so anyone reading them gets the whole of one set or the other"""
+    new_key = f"{KEY_PREFIX}:{uuid4().hex}"
+    pipeline = current_app.redis.pipeline()
+    pipeline.hset(new_key, mapping=keys)
+    pipeline.expire(new_key, SIGNING_KEYS_STALE_EXPIRY)
+    pipeline.rename(new_key, KEY_PREFIX)
+    pipeline.set(f"{KEY_PREFIX}:fresh", 1, ex=current_app.config["UAA_SIGNING_KEY_REFRESH_INTERVAL"])
+    try:
+        pipeline.execute()
+    except RedisError:
+        # Not throwing an exception as each worker still holds the keys in memory
+        logger.error("Error storing signing keys, please investigate", exc_info=True)
+
+
+def get_uaa_public_key(kid: str = None) -> str | None:
+    """
+    Gets the public key a UAA token was signed with.  If UAA_PUBLIC_KEY is configured it's always that one.
+
+    :param kid: The kid in the header of the token
+    """
+    if current_app.config.get("UAA_PUBLIC_KEY"):
+        return current_app.config["UAA_PUBLIC_KEY"]
+    return current_app.uaa_signing_keys.get(kid)
 
 
 def verify_permission(required_permission: str):
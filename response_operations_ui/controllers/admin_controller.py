@@ -5,6 +5,7 @@ import requests
 from flask import current_app as app
 from structlog import wrap_logger
 
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -29,7 +30,7 @@ def current_banner():
     """
     logger.info("Attempting to retrieve the current live banner")
     url = f"{app.config['BANNER_SERVICE_URL']}/banner"
-    response = requests.get(url)
+    response = get_session("BANNER_SERVICE_URL").get(url)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -56,7 +57,7 @@ def set_banner(banner_text: str):
     """
     logger.info("Attempting to set banner text", banner_text=banner_text)
     url = f"{app.config['BANNER_SERVICE_URL']}/banner"
-    response = requests.post(url, json={"content": banner_text})
+    response = get_session("BANNER_SERVICE_URL").post(url, json={"content": banner_text})
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -77,7 +78,7 @@ def remove_banner():
     """
     logger.info("Attempting to remove banner")
     url = f"{app.config['BANNER_SERVICE_URL']}/banner"
-    response = requests.delete(url)
+    response = get_session("BANNER_SERVICE_URL").delete(url)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -97,7 +98,7 @@ def get_templates():
     """
     logger.info("Attempting to retrieve templates")
     url = f"{app.config['BANNER_SERVICE_URL']}/template"
-    response = requests.get(url)
+    response = get_session("BANNER_SERVICE_URL").get(url)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -119,7 +120,7 @@ def get_template(template_id: str) -> dict:
     """
     logger.info("Attempting to retrieve template", template_id=template_id)
     url = f"{app.config['BANNER_SERVICE_URL']}/template/{template_id}"
-    response = requests.get(url)
+    response = get_session("BANNER_SERVICE_URL").get(url)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -142,7 +143,7 @@ def create_new_template(template: dict) -> dict:
     logger.info("Attempting to create a template", template=template)
     url = f"{app.config['BANNER_SERVICE_URL']}/template"
     headers = {"Content-type": "application/json"}
-    response = requests.post(url, template, headers=headers)
+    response = get_session("BANNER_SERVICE_URL").post(url, template, headers=headers)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -165,7 +166,7 @@ def edit_template(template: dict) -> dict:
     """
     logger.info("Attempting to edit the template", template=template)
     url = f"{app.config['BANNER_SERVICE_URL']}/template"
-    response = requests.put(url, json=template)
+    response = get_session("BANNER_SERVICE_URL").put(url, json=template)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -187,7 +188,7 @@ def delete_template(template_id: str):
     """
     logger.info("Attempting to delete template", template_id=template_id)
     url = f"{app.config['BANNER_SERVICE_URL']}/template/{template_id}"
-    response = requests.delete(url)
+    response = get_session("BANNER_SERVICE_URL").delete(url)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -4,6 +4,7 @@ import requests
 from flask import current_app as app
 from structlog import wrap_logger
 
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -12,7 +13,7 @@ logger = wrap_logger(logging.getLogger(__name__))
 def get_case_by_id(case_id):
     logger.info("Retrieving case", case_id=case_id)
     url = f'{app.config["CASE_URL"]}/cases/{case_id}?iac=true'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("CASE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -28,7 +29,7 @@ def post_case_event(case_id, category, description):
     logger.info("Posting case event", case_id=case_id, category=category)
     url = f'{app.config["CASE_URL"]}/cases/{case_id}/events'
     case_event = {"category": category, "description": description, "createdBy": "ROPS"}
-    response = requests.post(url, auth=app.config["BASIC_AUTH"], json=case_event)
+    response = get_session("CASE_URL").post(url, auth=app.config["BASIC_AUTH"], json=case_event)
 
     try:
         response.raise_for_status()
@@ -42,7 +43,7 @@ def post_case_event(case_id, category, description):
 def get_case_by_case_group_id(case_group_id):
     logger.info("Retrieving case by case group id", case_group_id=case_group_id)
     url = f'{app.config["CASE_URL"]}/cases/casegroupid/{case_group_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("CASE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -57,7 +58,7 @@ def get_case_by_case_group_id(case_group_id):
 def get_available_case_group_statuses_direct(collection_exercise_id, ru_ref):
     logger.info("Retrieving statuses", collection_exercise_id=collection_exercise_id, ru_ref=ru_ref)
     url = f'{app.config["CASE_URL"]}/casegroups/transitions/{collection_exercise_id}/{ru_ref}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("CASE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -75,7 +76,7 @@ def get_available_case_group_statuses_direct(collection_exercise_id, ru_ref):
 def get_case_groups_by_business_party_id(business_party_id):
     logger.info("Retrieving case groups", party_id=business_party_id)
     url = f'{app.config["CASE_URL"]}/casegroups/partyid/{business_party_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("CASE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -101,7 +102,7 @@ def get_cases_by_business_party_id(business_party_id: str, max_number_of_cases:
     """
     logger.info("Retrieving cases", business_party_id=business_party_id)
     url = f'{app.config["CASE_URL"]}/cases/partyid/{business_party_id}'
-    response = requests.get(
+    response = get_session("CASE_URL").get(
         url,
         auth=app.config["BASIC_AUTH"],
         params={"iac": "True", "max_cases_per_survey": max_number_of_cases},
@@ -134,7 +135,7 @@ def get_case_group_cases_by_party_and_survey_id(party_id: str, survey_id: str, l
     """
     url = f'{app.config["CASE_URL"]}/casegroups/partyid/{party_id}/surveyid/{survey_id}'
 
-    response = requests.get(
+    response = get_session("CASE_URL").get(
         url,
         auth=app.config["BASIC_AUTH"],
         params={"limit": limit},
@@ -172,7 +173,7 @@ def generate_iac(case_id):
     url = get_iac_url(case_id)
     logger.info("Generating new IAC", case_id=case_id, url=url)
 
-    response = requests.post(url=url, auth=app.config["BASIC_AUTH"])
+    response = get_session("CASE_URL").post(url=url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -191,7 +192,7 @@ def get_case_events_by_case_id(case_id, categories=None):
     elif categories:
         url = url + "?category=" + categories
 
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("CASE_URL").get(url, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -1,6 +1,5 @@
 import logging
 
-import requests
 from flask import current_app as app
 from google.auth.exceptions import GoogleAuthError
 from structlog import wrap_logger
@@ -9,6 +8,7 @@ from response_operations_ui.common.connection_helper import (
     get_response_json_from_service,
 )
 from response_operations_ui.common.credentials import fetch_and_apply_oidc_credentials
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.error_codes import (
     ErrorCode,
     get_error_code_message,
@@ -33,7 +33,9 @@ def get_cir_metadata(survey_ref, formtype):
 
 
 def _get_response_content(request_url):
-    session = requests.Session()
+    # The pooled session lives as long as the worker.  The OIDC credentials are cached until they're close to expiring,
+    # so applying them to it on every call only changes its token once they've been rotated
+    session = get_session("CIR_API_URL")
     client_id = app.config["CIR_OAUTH2_CLIENT_ID"]
     logger.info(f"{TARGET_SERVICE} service request", request_url=request_url)
 
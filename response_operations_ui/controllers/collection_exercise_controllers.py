@@ -1,16 +1,78 @@
 import json
 import logging
+from datetime import datetime, timezone
+from functools import partial, wraps
 
-import requests
 from flask import current_app as app
-from requests.exceptions import HTTPError
+from iso8601 import parse_date
+from requests.exceptions import HTTPError, RequestException
 from structlog import wrap_logger
 
+from response_operations_ui.common.cache_metrics import timed_refresh
+from response_operations_ui.common.controller_cache import (
+    get_many,
+    invalidate,
+    invalidates,
+    set_many,
+)
+from response_operations_ui.common.fan_out import fan_out
+from response_operations_ui.common.http_session import get_session
+from response_operations_ui.common.request_memo import memoize_per_request
+from response_operations_ui.common.single_flight import coalesce
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
 
 
+def invalidates_collection_exercise(f):
+    """
+    Decorator for a write to a collection exercise, taking its id as the first argument, that removes it from the
+    cache once it's been made (or has failed).
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        try:
+            return f(*args, **kwargs)
+        finally:
+            invalidate_collection_exercise(_get_collection_exercise_id(*args, **kwargs))
+
+    return wrapper
+
+
+def invalidate_collection_exercise(collection_exercise_id) -> None:
+    """
+    Removes a collection exercise and its events from the cache, along with its survey's list of collection exercises.
+    The survey is found from the cached collection exercise or, if that's no longer cached, from the collection
+    exercise service, as the survey's list may still be.
+    """
+    survey_id = _get_survey_id_of_collection_exercise(collection_exercise_id)
+    if survey_id:
+        invalidate("collection-exercises-by-survey", survey_id)
+    invalidate("collection-exercise", collection_exercise_id)
+    invalidate("collection-exercise-events", collection_exercise_id)
+
+
+def _get_survey_id_of_collection_exercise(collection_exercise_id) -> str | None:
+    if not app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"]:
+        return None
+    collection_exercise = _get_cached_collection_exercises([collection_exercise_id]).get(collection_exercise_id)
+    if collection_exercise is None:
+        try:
+            collection_exercise = _get_collection_exercise_by_id(collection_exercise_id)
+        except (ApiError, RequestException):
+            logger.warning(
+                "Failed to find the survey of a collection exercise, its survey's collection exercises not invalidated",
+                collection_exercise_id=collection_exercise_id,
+            )
+            return None
+    return collection_exercise.get("surveyId")
+
+
+def _get_collection_exercise_id(collection_exercise_id, *_, **__):
+    return collection_exercise_id
+
+
 def download_report(document_type, collection_exercise_id, survey_id):
     logger.info(
         "Downloading response chasing report",
@@ -24,7 +86,7 @@ def download_report(document_type, collection_exercise_id, survey_id):
         f"/reporting-api/v1/response-chasing/download-report/{document_type}/{collection_exercise_id}/{survey_id}"
     )
 
-    response = requests.get(url)
+    response = get_session("REPORT_URL").get(url)
 
     try:
         response.raise_for_status()
@@ -59,7 +121,7 @@ def download_dashboard_data(collection_exercise_id, survey_id):
         f"/reporting-api/v1/response-dashboard/survey/{survey_id}/collection-exercise/{collection_exercise_id}"
     )
 
-    response = requests.get(url)
+    response = get_session("REPORT_URL").get(url)
 
     try:
         response.raise_for_status()
@@ -76,10 +138,19 @@ def download_dashboard_data(collection_exercise_id, survey_id):
 
 
 def get_collection_exercise_events_by_id(ce_id):
+    """
+    Gets a collection exercise's events.  They're cached for as long as the collection exercise is, if it's cached,
+    as they're only changed through this app
+    """
+    if app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"]:
+        cached = get_many("collection-exercise-events", [ce_id])
+        if ce_id in cached:
+            return cached[ce_id]
+
     logger.info("Retrieving collection exercise events by id", collection_exercise_id=ce_id)
 
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/{ce_id}/events'
-    response = requests.Session().get(url=url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").get(url=url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -88,15 +159,20 @@ def get_collection_exercise_events_by_id(ce_id):
         raise ApiError(response)
 
     logger.info("Successfully retrieved collection exercise events.", collection_exercise_id=ce_id)
-    return response.json()
+    events = response.json()
+    if app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"]:
+        collection_exercise = _get_cached_collection_exercises([ce_id]).get(ce_id, {})
+        set_many("collection-exercise-events", {ce_id: events}, _get_cache_expiry(collection_exercise))
+    return events
 
 
+@invalidates_collection_exercise
 def update_event(collection_exercise_id, tag, timestamp):
     logger.info("Updating collection exercise event date", collection_exercise_id=collection_exercise_id, tag=tag)
 
     formatted_timestamp = timestamp.isoformat(timespec="milliseconds")
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/{collection_exercise_id}/events/{tag}'
-    response = requests.put(
+    response = get_session("COLLECTION_EXERCISE_URL").put(
         url, auth=app.config["BASIC_AUTH"], headers={"content-type": "text/plain"}, data=formatted_timestamp
     )
 
@@ -136,11 +212,12 @@ def update_event(collection_exercise_id, tag, timestamp):
     return json.loads(response_content)
 
 
+@invalidates_collection_exercise
 def delete_event(collection_exercise_id, tag):
     logger.info("Deleting collection exercise event", collection_exercise_id=collection_exercise_id, tag=tag)
 
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/{collection_exercise_id}/events/{tag}'
-    response = requests.Session().post(url=url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").post(url=url, auth=app.config["BASIC_AUTH"])
 
     response.raise_for_status()
 
@@ -148,12 +225,13 @@ def delete_event(collection_exercise_id, tag):
     return None
 
 
+@invalidates_collection_exercise
 def create_collection_exercise_event(collection_exercise_id, tag, timestamp):
     logger.info("Creating event date", collection_exercise_id=collection_exercise_id, tag=tag)
 
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/{collection_exercise_id}/events'
     formatted_timestamp = timestamp.isoformat(timespec="milliseconds")
-    response = requests.Session().post(
+    response = get_session("COLLECTION_EXERCISE_URL").post(
         url=url, auth=app.config["BASIC_AUTH"], json={"tag": tag, "timestamp": formatted_timestamp}
     )
 
@@ -185,10 +263,11 @@ def create_collection_exercise_event(collection_exercise_id, tag, timestamp):
     return None
 
 
+@invalidates_collection_exercise
 def execute_collection_exercise(collection_exercise_id):
     logger.info("Executing collection exercise", collection_exercise_id=collection_exercise_id)
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexerciseexecution/{collection_exercise_id}'
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").post(url, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except HTTPError:
@@ -201,12 +280,15 @@ def execute_collection_exercise(collection_exercise_id):
     logger.info("Successfully began execution of collection exercise", collection_exercise_id=collection_exercise_id)
 
 
+@invalidates_collection_exercise
 def update_collection_exercise_user_description(collection_exercise_id, user_description):
     logger.info("Updating collection exercise user description", collection_exercise_id=collection_exercise_id)
 
     header = {"Content-Type": "text/plain"}
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/{collection_exercise_id}/userDescription'
-    response = requests.put(url, headers=header, data=user_description, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").put(
+        url, headers=header, data=user_description, auth=app.config["BASIC_AUTH"]
+    )
 
     try:
         response.raise_for_status()
@@ -224,12 +306,15 @@ def update_collection_exercise_user_description(collection_exercise_id, user_des
     )
 
 
+@invalidates_collection_exercise
 def update_collection_exercise_period(collection_exercise_id, period):
     logger.info("Updating collection exercise period", collection_exercise_id=collection_exercise_id, period=period)
 
     header = {"Content-Type": "text/plain"}
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/{collection_exercise_id}/exerciseRef'
-    response = requests.put(url, headers=header, data=period, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").put(
+        url, headers=header, data=period, auth=app.config["BASIC_AUTH"]
+    )
 
     try:
         response.raise_for_status()
@@ -252,9 +337,19 @@ def update_collection_exercise_period(collection_exercise_id, period):
 
 
 def get_collection_exercise_by_id(collection_exercise_id):
+    cached = _get_cached_collection_exercises([collection_exercise_id])
+    if cached:
+        return cached[collection_exercise_id]
+
+    collection_exercise = _get_collection_exercise_by_id(collection_exercise_id)
+    _cache_collection_exercises({collection_exercise_id: collection_exercise})
+    return collection_exercise
+
+
+def _get_collection_exercise_by_id(collection_exercise_id):
     logger.info("Retrieving collection exercise", collection_exercise_id=collection_exercise_id)
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/{collection_exercise_id}'
-    response = requests.get(url=url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").get(url=url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -270,6 +365,79 @@ def get_collection_exercise_by_id(collection_exercise_id):
     return response.json()
 
 
+def get_collection_exercises_by_ids(collection_exercise_ids) -> list:
+    """
+    Gets a number of collection exercises at once.  Each id is only looked up once, collection exercises cached in
+    redis are used where there are any and the rest are retrieved from the collection exercise service at the same
+    time, then cached.
+
+    :param collection_exercise_ids: The ids of the collection exercises, which can contain duplicates
+    :return: A list of collection exercises, in the order their ids were first seen
+    """
+    collection_exercise_ids = list(dict.fromkeys(collection_exercise_ids))
+    collection_exercises = _get_cached_collection_exercises(collection_exercise_ids)
+
+    missing_ids = [ce_id for ce_id in collection_exercise_ids if ce_id not in collection_exercises]
+    if missing_ids:
+        logger.info(
+            "Retrieving collection exercises",
+            cached=len(collection_exercises),
+            not_cached=len(missing_ids),
+        )
+        with timed_refresh("collection-exercise"):
+            retrieved = fan_out({ce_id: partial(_get_collection_exercise_by_id, ce_id) for ce_id in missing_ids})
+        _cache_collection_exercises(retrieved)
+        collection_exercises.update(retrieved)
+
+    return [collection_exercises[ce_id] for ce_id in collection_exercise_ids]
+
+
+def _get_cached_collection_exercises(collection_exercise_ids: list) -> dict:
+    if not app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"]:
+        return {}
+    return get_many("collection-exercise", collection_exercise_ids)
+
+
+def _get_cached_collection_exercises_by_survey(survey_id) -> list | None:
+    if not app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"]:
+        return None
+    return get_many("collection-exercises-by-survey", [survey_id]).get(survey_id)
+
+
+def _cache_collection_exercises(collection_exercises: dict, survey_id=None) -> None:
+    """
+    Caches each collection exercise for as long as its state allows.  If they're all of a survey's collection
+    exercises, the list of them is cached under the survey too, for as long as the shortest lived of them, so that
+    they're all cached on their own for as long as the list is.
+    """
+    if not app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"]:
+        return
+    set_many("collection-exercise", collection_exercises, _get_cache_expiry)
+    if survey_id is not None:
+        expiry = min(map(_get_cache_expiry, collection_exercises.values()), default=_get_cache_expiry({}))
+        set_many("collection-exercises-by-survey", {survey_id: list(collection_exercises.values())}, expiry)
+
+
+def _get_cache_expiry(collection_exercise: dict) -> int:
+    """
+    Ended collection exercises don't change, and live ones only do when they end or are changed through this app
+    (which removes them from the cache), so they're cached for longer than those still being set up, which can move
+    on to their next state at any time (e.g., once their sample's been validated).  Live ones aren't cached past
+    their scheduled end, and once that's passed they're cached as briefly as the rest until they're ended.
+    """
+    state = collection_exercise.get("state")
+    if state == "ENDED":
+        return app.config["COLLECTION_EXERCISE_ENDED_CACHE_EXPIRY"]
+    if state == "LIVE":
+        expiry = app.config["COLLECTION_EXERCISE_LIVE_CACHE_EXPIRY"]
+        if collection_exercise.get("scheduledEndDateTime"):
+            until_end = parse_date(collection_exercise["scheduledEndDateTime"]) - datetime.now(timezone.utc)
+            expiry = min(expiry, int(until_end.total_seconds()))
+        return max(expiry, app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"])
+    return app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"]
+
+
+@invalidates("collection-exercises-by-survey", key=lambda survey_id, *_: survey_id)
 def create_collection_exercise(survey_id, survey_name, user_description, period):
     logger.info("Creating a new collection exercise for", survey_id=survey_id, survey_name=survey_name)
     header = {"Content-Type": "application/json"}
@@ -281,7 +449,7 @@ def create_collection_exercise(survey_id, survey_name, user_description, period)
         "userDescription": user_description,
         "exerciseRef": period,
     }
-    response = requests.post(
+    response = get_session("COLLECTION_EXERCISE_URL").post(
         url,
         json=collection_exercise_details,
         headers=header,
@@ -296,29 +464,39 @@ def create_collection_exercise(survey_id, survey_name, user_description, period)
     logger.info("Successfully created collection exercise for", survey_id=survey_id, survey_name=survey_name)
 
 
+@memoize_per_request
+@coalesce("collection-exercises-by-survey")
 def get_collection_exercises_by_survey(survey_id):
     """
-    Gets all the collection exercises for an individual survey
+    Gets all the collection exercises for an individual survey.  They're cached, along with each collection exercise
+    on its own, for as long as the shortest lived of them
 
     :param survey_id: A uuid that represents the survey in the survey service.
     :type survey_id: str
     :raises ApiError: Raised when collection exercise services returns a 4xx or 5xx status.
     :return: A list of collection exercises for the survey
     """
+    cached = _get_cached_collection_exercises_by_survey(survey_id)
+    if cached is not None:
+        return cached
+
     logger.info("Retrieving collection exercises", survey_id=survey_id)
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/survey/{survey_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     if response.status_code == 204:
-        return []
-    try:
-        response.raise_for_status()
-    except HTTPError:
-        logger.exception("Failed to retrieve collection exercises by survey", survey_id=survey_id)
-        raise ApiError(response)
+        collection_exercises = []
+    else:
+        try:
+            response.raise_for_status()
+        except HTTPError:
+            logger.exception("Failed to retrieve collection exercises by survey", survey_id=survey_id)
+            raise ApiError(response)
+        logger.info("Successfully retrieved collection exercises by survey", survey_id=survey_id)
+        collection_exercises = response.json()
 
-    logger.info("Successfully retrieved collection exercises by survey", survey_id=survey_id)
-    return response.json()
+    _cache_collection_exercises({ce["id"]: ce for ce in collection_exercises}, survey_id=survey_id)
+    return collection_exercises
 
 
 def get_case_group_status_by_collection_exercise(case_groups, collection_exercise_id):
@@ -339,6 +517,7 @@ def get_case_group_status_by_collection_exercise(case_groups, collection_exercis
     )
 
 
+@invalidates_collection_exercise
 def unlink_sample_summary(collection_exercise_id, sample_summary_id):
     logger.info(
         "un-linking sample summary from collection exercise",
@@ -351,7 +530,7 @@ def unlink_sample_summary(collection_exercise_id, sample_summary_id):
         f"{collection_exercise_id}/sample/{sample_summary_id}"
     )
 
-    response = requests.delete(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").delete(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -377,7 +556,7 @@ def get_collection_exercise_from_list(exercises, period):
 def get_linked_sample_summary_id(collection_exercise_id):
     logger.info("Retrieving sample linked to collection exercise", collection_exercise_id=collection_exercise_id)
     url = f'{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/link/{collection_exercise_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_EXERCISE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     if response.status_code == 204:
         logger.info("No samples linked to collection exercise", collection_exercise_id=collection_exercise_id)
@@ -402,6 +581,7 @@ def get_linked_sample_summary_id(collection_exercise_id):
     return sample_summary_id
 
 
+@invalidates_collection_exercise
 def link_sample_summary_to_collection_exercise(collection_exercise_id, sample_summary_id):
     logger.info(
         "Linking sample summary to collection exercise",
@@ -412,7 +592,7 @@ def link_sample_summary_to_collection_exercise(collection_exercise_id, sample_su
 
     # Currently we only need to link a single sample to a single collection exercise
     payload = {"sampleSummaryIds": [str(sample_summary_id)]}
-    response = requests.put(url, auth=app.config["BASIC_AUTH"], json=payload)
+    response = get_session("COLLECTION_EXERCISE_URL").put(url, auth=app.config["BASIC_AUTH"], json=payload)
 
     try:
         response.raise_for_status()
@@ -8,6 +8,7 @@ from structlog import wrap_logger
 from response_operations_ui.common.connection_helper import (
     get_response_json_from_service,
 )
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -39,7 +40,9 @@ def upload_collection_instrument(collection_exercise_id, file, form_type=None):
         params["classifiers"] = json.dumps(classifiers)
 
     files = {"file": (file.filename, file.stream, file.mimetype)}
-    response = requests.post(url, files=files, params=params, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").post(
+        url, files=files, params=params, auth=app.config["BASIC_AUTH"]
+    )
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -84,7 +87,7 @@ def upload_ru_specific_collection_instrument(collection_exercise_id, file, ru_re
     )
 
     files = {"file": (file.filename, file.stream, file.mimetype)}
-    response = requests.post(url, files=files, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").post(url, files=files, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -116,7 +119,7 @@ def link_collection_instrument_to_survey(survey_uuid, eq_id, form_type):
         "survey_id": survey_uuid,
         "classifiers": f'{{"form_type":"{form_type}","eq_id":"{eq_id}"}}',
     }
-    response = requests.post(url, params=payload, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").post(url, params=payload, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -153,7 +156,7 @@ def update_collection_exercise_eq_instruments(cis_selected, ce_id):
     payload = {
         "instruments": cis_selected,
     }
-    response = requests.post(url, params=payload, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").post(url, params=payload, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
         logger.info("Successfully linked collection instrument to collection exercise", ce_id=ce_id)
@@ -179,7 +182,7 @@ def link_collection_instrument(ce_id, ci_id):
     bound_logger.info("Linking collection instrument to collection exercise")
     url = f'{app.config["COLLECTION_INSTRUMENT_URL"]}' f"/collection-instrument-api/1.0.2/link-exercise/{ci_id}/{ce_id}"
 
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").post(url, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -206,7 +209,7 @@ def unlink_collection_instrument(ce_id, ci_id):
         f'{app.config["COLLECTION_INSTRUMENT_URL"]}' f"/collection-instrument-api/1.0.2/unlink-exercise/{ci_id}/{ce_id}"
     )
 
-    response = requests.put(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").put(url, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -226,7 +229,7 @@ def delete_seft_collection_instrument(ci_id: str) -> bool:
     :rtype: bool
     """
     url = f'{app.config["COLLECTION_INSTRUMENT_URL"]}/collection-instrument-api/1.0.2/delete/{ci_id}'
-    response = requests.delete(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").delete(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -247,7 +250,9 @@ def get_collection_instruments_by_classifier(survey_id=None, collection_exercise
 
     url = f'{app.config["COLLECTION_INSTRUMENT_URL"]}/collection-instrument-api/1.0.2/collectioninstrument'
     classifiers = _build_classifiers(collection_exercise_id, survey_id, ci_type)
-    response = requests.get(url, auth=app.config["BASIC_AUTH"], params={"searchString": json.dumps(classifiers)})
+    response = get_session("COLLECTION_INSTRUMENT_URL").get(
+        url, auth=app.config["BASIC_AUTH"], params={"searchString": json.dumps(classifiers)}
+    )
 
     try:
         response.raise_for_status()
@@ -269,7 +274,9 @@ def get_registry_instruments(collection_exercise_id: str) -> list:
         f'{app.config["COLLECTION_INSTRUMENT_URL"]}/collection-instrument-api/1.0.2/'
         f"registry-instrument/exercise-id/{collection_exercise_id}"
     )
-    return get_response_json_from_service(url, TARGET_SERVICE)
+    return get_response_json_from_service(
+        url, TARGET_SERVICE, get_session("COLLECTION_INSTRUMENT_URL"), auth=app.config["BASIC_AUTH"]
+    )
 
 
 def get_cir_instrument_count(collection_exercise_id: str) -> dict:
@@ -277,7 +284,9 @@ def get_cir_instrument_count(collection_exercise_id: str) -> dict:
         f'{app.config["COLLECTION_INSTRUMENT_URL"]}/collection-instrument-api/1.0.2/'
         f"registry-instrument/count/exercise-id/{collection_exercise_id}"
     )
-    return get_response_json_from_service(url, TARGET_SERVICE)
+    return get_response_json_from_service(
+        url, TARGET_SERVICE, get_session("COLLECTION_INSTRUMENT_URL"), auth=app.config["BASIC_AUTH"]
+    )
 
 
 def get_registry_instrument(collection_exercise_id: str, form_type: str) -> dict:
@@ -285,7 +294,7 @@ def get_registry_instrument(collection_exercise_id: str, form_type: str) -> dict
         f'{app.config["COLLECTION_INSTRUMENT_URL"]}/collection-instrument-api/1.0.2/'
         f"registry-instrument/exercise-id/{collection_exercise_id}/formtype/{form_type}"
     )
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").get(url, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
         return response.json()
@@ -339,7 +348,7 @@ def delete_registry_instruments(collection_exercise_id: str, form_type: str):
         f"registry-instrument/exercise-id/{collection_exercise_id}/formtype/{form_type}"
     )
 
-    response = requests.delete(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("COLLECTION_INSTRUMENT_URL").delete(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -382,7 +391,7 @@ def save_registry_instrument(
         "survey_id": survey_id,
     }
 
-    response = requests.put(url, auth=app.config["BASIC_AUTH"], json=payload)
+    response = get_session("COLLECTION_INSTRUMENT_URL").put(url, auth=app.config["BASIC_AUTH"], json=payload)
 
     try:
         response.raise_for_status()
@@ -4,6 +4,7 @@ import requests
 from flask import current_app as app
 from structlog import wrap_logger
 
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -16,7 +17,7 @@ def get_iac_details(iac):
         return None
 
     url = f'{app.config["IAC_URL"]}/iacs/{iac}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("IAC_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
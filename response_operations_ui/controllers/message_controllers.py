@@ -2,13 +2,13 @@ import logging
 from json import JSONDecodeError
 
 import jwt
-import requests
 from flask import current_app, session
 from flask_login import current_user
 from requests.exceptions import HTTPError, RequestException
 from structlog import wrap_logger
 
 from response_operations_ui.common import token_decoder
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError, InternalError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -19,7 +19,7 @@ def get_conversation(thread_id):
 
     url = f'{current_app.config["SECURE_MESSAGE_URL"]}/threads/{thread_id}'
 
-    response = requests.get(url, headers={"Authorization": _get_jwt()})
+    response = get_session("SECURE_MESSAGE_URL").get(url, headers={"Authorization": _get_jwt()})
 
     try:
         response.raise_for_status()
@@ -100,7 +100,7 @@ def _get_conversation_counts(business_id, conversation_tab, survey_id, category,
         survey_id, business_id, conversation_tab, category, all_conversation_types
     )
     url = f'{current_app.config["SECURE_MESSAGE_URL"]}/messages/count'
-    response = requests.get(url, headers={"Authorization": _get_jwt()}, params=params)
+    response = get_session("SECURE_MESSAGE_URL").get(url, headers={"Authorization": _get_jwt()}, params=params)
     return response
 
 
@@ -134,7 +134,7 @@ def get_thread_list(survey_id, business_id, conversation_tab, page, limit, categ
     # This will be removed once UAA is completed.  For now we need the call to sm to include
     # an Authorization in its header a JWT that includes party_id and role.
 
-    response = requests.get(url, headers={"Authorization": _get_jwt()}, params=params)
+    response = get_session("SECURE_MESSAGE_URL").get(url, headers={"Authorization": _get_jwt()}, params=params)
 
     try:
         response.raise_for_status()
@@ -154,7 +154,7 @@ def get_thread_list(survey_id, business_id, conversation_tab, page, limit, categ
 def send_message(message_json: dict):
     try:
         url = f'{current_app.config["SECURE_MESSAGE_URL"]}/messages'
-        response = requests.post(
+        response = get_session("SECURE_MESSAGE_URL").post(
             url,
             headers={"Authorization": _get_jwt(), "Content-Type": "application/json", "Accept": "application/json"},
             data=message_json,
@@ -173,7 +173,7 @@ def patch_message(message_id: str, payload: dict):
     url = f"{current_app.config['SECURE_MESSAGE_URL']}/messages/{message_id}"
 
     logger.info("Patching message data", message_id=message_id, payload=payload)
-    response = requests.patch(url, headers={"Authorization": _get_jwt()}, json=payload)
+    response = get_session("SECURE_MESSAGE_URL").patch(url, headers={"Authorization": _get_jwt()}, json=payload)
 
     try:
         response.raise_for_status()
@@ -188,7 +188,9 @@ def remove_unread_label(message_id: str):
     data = {"label": "UNREAD", "action": "remove"}
 
     logger.info("Removing message unread label", message_id=message_id)
-    response = requests.put(url, headers={"Authorization": _get_jwt(), "Content-Type": "application/json"}, json=data)
+    response = get_session("SECURE_MESSAGE_URL").put(
+        url, headers={"Authorization": _get_jwt(), "Content-Type": "application/json"}, json=data
+    )
 
     try:
         response.raise_for_status()
@@ -202,7 +204,9 @@ def add_unread_label(message_id: str):
     data = {"label": "UNREAD", "action": "add"}
 
     logger.info("Adding message unread label", message_id=message_id)
-    response = requests.put(url, headers={"Authorization": _get_jwt(), "Content-Type": "application/json"}, json=data)
+    response = get_session("SECURE_MESSAGE_URL").put(
+        url, headers={"Authorization": _get_jwt(), "Content-Type": "application/json"}, json=data
+    )
 
     try:
         response.raise_for_status()
@@ -215,7 +219,7 @@ def patch_thread(thread_id: str, payload: dict):
     url = f"{current_app.config['SECURE_MESSAGE_URL']}/threads/{thread_id}"
 
     logger.info("Patching thread data", thread_id=thread_id, payload=payload)
-    response = requests.patch(url, headers={"Authorization": _get_jwt()}, json=payload)
+    response = get_session("SECURE_MESSAGE_URL").patch(url, headers={"Authorization": _get_jwt()}, json=payload)
 
     try:
         response.raise_for_status()
@@ -226,10 +230,17 @@ def patch_thread(thread_id: str, payload: dict):
 
 
 def _get_jwt() -> str:
-    token = session.get("token")
-    decoded_token = token_decoder.decode_access_token(token)
-    user_id = decoded_token.get("user_id")
+    """
+    Gets the token secure message is called with.  It's minted once for the user signed in to the session, as it has
+    nothing in it that changes between calls, and reused for as long as their access token is valid.
+    """
+    user_id = token_decoder.get_access_token_claims().get("user_id")
+    cached = session.get("secure_message_jwt")
+    if cached and cached["user_id"] == user_id:
+        return cached["token"]
+
     secret = current_app.config["SECURE_MESSAGE_JWT_SECRET"]
     sm_token = jwt.encode({"party_id": user_id, "role": "internal"}, secret, algorithm="HS256")
+    session["secure_message_jwt"] = {"user_id": user_id, "token": sm_token}
     logger.info("Retrieving current token for user", user_id=current_user.id)
     return sm_token
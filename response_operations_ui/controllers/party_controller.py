@@ -1,13 +1,22 @@
 import logging
+from functools import partial
 from urllib.parse import urlencode
 from uuid import UUID
 
 import requests
 from flask import current_app as app
-from requests.exceptions import ConnectionError, HTTPError, Timeout
+from requests.exceptions import ConnectionError, HTTPError
 from structlog import wrap_logger
 
-from response_operations_ui.controllers.survey_controllers import get_survey_by_id
+from response_operations_ui.common.cache_metrics import timed_refresh
+from response_operations_ui.common.controller_cache import (
+    get_many,
+    invalidates,
+    set_many,
+)
+from response_operations_ui.common.fan_out import fan_out
+from response_operations_ui.common.http_session import get_session
+from response_operations_ui.controllers.survey_controllers import get_surveys_by_ids
 from response_operations_ui.exceptions.exceptions import (
     ApiError,
     SearchRespondentsException,
@@ -31,7 +40,7 @@ def get_business_by_ru_ref(ru_ref: str):
     """
     logger.info("Retrieving reporting unit", ru_ref=ru_ref)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/businesses/ref/{ru_ref}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -53,14 +62,12 @@ def get_respondents_by_survey_and_business_id(survey_id: UUID, business_id: UUID
     """
     url = f'{app.config["PARTY_URL"]}/party-api/v1/respondents/survey_id/{survey_id}/business_id/{business_id}'
     try:
-        response = requests.get(url, auth=app.config["BASIC_AUTH"])
+        response = get_session("PARTY_URL").get(url, auth=app.config["BASIC_AUTH"])
         response.raise_for_status()
     except HTTPError:
         raise ApiError(response)
     except ConnectionError:
         raise ServiceUnavailableException("Party returned a connection error", 503)
-    except Timeout:
-        raise ServiceUnavailableException("Party has timed out", 504)
 
     return response.json()
 
@@ -82,9 +89,9 @@ def get_business_attributes_by_party_id(business_party_id: str, collection_exerc
     url = f'{app.config["PARTY_URL"]}/party-api/v1/businesses/id/{business_party_id}/attributes'
     if collection_exercise_ids:
         params = urlencode([("collection_exercise_id", uuid) for uuid in collection_exercise_ids])
-        response = requests.get(url, params=params, auth=app.config["BASIC_AUTH"])
+        response = get_session("PARTY_URL").get(url, params=params, auth=app.config["BASIC_AUTH"])
     else:
-        response = requests.get(url, auth=app.config["BASIC_AUTH"])
+        response = get_session("PARTY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -102,7 +109,7 @@ def get_business_by_party_id(business_party_id: str, collection_exercise_id=None
     )
     url = f'{app.config["PARTY_URL"]}/party-api/v1/businesses/id/{business_party_id}'
     params = {"collection_exercise_id": collection_exercise_id, "verbose": True}
-    response = requests.get(url, params=params, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").get(url, params=params, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -123,10 +130,33 @@ def get_business_by_party_id(business_party_id: str, collection_exercise_id=None
     return response.json()
 
 
+def get_businesses_by_party_ids(business_party_ids) -> dict:
+    """
+    Gets a number of businesses at once.  Businesses cached in redis are read in a single round trip and the rest are
+    retrieved from the party service at the same time, then cached for BUSINESS_CACHE_EXPIRY seconds.
+
+    :param business_party_ids: The party ids of the businesses, which can contain duplicates
+    :return: The businesses, by party id
+    """
+    business_party_ids = list(dict.fromkeys(business_party_ids))
+    expiry = app.config["BUSINESS_CACHE_EXPIRY"]
+    businesses = get_many("business", business_party_ids) if expiry else {}
+
+    missing_ids = [party_id for party_id in business_party_ids if party_id not in businesses]
+    if not missing_ids:
+        return businesses
+    with timed_refresh("business"):
+        retrieved = fan_out({party_id: partial(get_business_by_party_id, party_id) for party_id in missing_ids})
+    if expiry:
+        set_many("business", retrieved, expiry)
+    businesses.update(retrieved)
+    return businesses
+
+
 def get_respondent_by_party_id(respondent_party_id):
     logger.info("Retrieving respondent party", respondent_party_id=respondent_party_id)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/respondents/id/{respondent_party_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -144,7 +174,7 @@ def get_respondent_by_party_id(respondent_party_id):
 def get_pending_surveys_by_party_id(respondent_party_id):
     logger.info("Retrieving pending surveys", respondent_party_id=respondent_party_id)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/pending-surveys/originator/{respondent_party_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").get(url, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -161,7 +191,7 @@ def get_pending_surveys_by_party_id(respondent_party_id):
 def delete_pending_surveys_by_batch_number(batch_number):
     logger.info("Deleting pending surveys", batch_number=batch_number)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/pending-surveys/{batch_number}'
-    response = requests.delete(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").delete(url, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -175,7 +205,7 @@ def delete_pending_surveys_by_batch_number(batch_number):
 def resend_pending_surveys_email(batch_number):
     logger.info("Resending pending survey email", batch_number=batch_number)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/pending-surveys/resend-email'
-    response = requests.post(url, json={"batch_number": batch_number}, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").post(url, json={"batch_number": batch_number}, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -207,7 +237,7 @@ def get_respondent_by_party_ids(uuids):
 
     params = urlencode([("id", uuid) for uuid in uuids])
     url = f'{app.config["PARTY_URL"]}/party-api/v1/respondents'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"], params=params)
+    response = get_session("PARTY_URL").get(url, auth=app.config["BASIC_AUTH"], params=params)
 
     try:
         response.raise_for_status()
@@ -245,21 +275,35 @@ def add_enrolment_status_for_respondent(respondent, ru_ref, survey_id):
 
 
 def get_respondent_enrolments(respondent: dict, enrolment_status=None) -> list:
+    associations = respondent.get("associations", [])
+    businesses_and_surveys = fan_out(
+        {
+            "businesses": partial(
+                get_businesses_by_party_ids, [association["partyId"] for association in associations]
+            ),
+            "surveys": partial(
+                get_surveys_by_ids,
+                [enrolment["surveyId"] for association in associations for enrolment in association["enrolments"]],
+            ),
+        }
+    )
+    businesses = businesses_and_surveys["businesses"]
+    surveys = businesses_and_surveys["surveys"]
+
     enrolments = []
-    if "associations" in respondent:
-        for association in respondent["associations"]:
-            business_party = get_business_by_party_id(association["partyId"])
-            for enrolment in association["enrolments"]:
-                enrolment_data = {
-                    "business": business_party,
-                    "survey": get_survey_by_id(enrolment["surveyId"]),
-                    "status": enrolment["enrolmentStatus"],
-                }
-                if enrolment_status:
-                    if enrolment_data["status"] == enrolment_status:
-                        enrolments.append(enrolment_data)
-                else:
+    for association in associations:
+        business_party = businesses[association["partyId"]]
+        for enrolment in association["enrolments"]:
+            enrolment_data = {
+                "business": business_party,
+                "survey": surveys[enrolment["surveyId"]],
+                "status": enrolment["enrolmentStatus"],
+            }
+            if enrolment_status:
+                if enrolment_data["status"] == enrolment_status:
                     enrolments.append(enrolment_data)
+            else:
+                enrolments.append(enrolment_data)
 
     return enrolments
 
@@ -272,7 +316,7 @@ def search_respondents(first_name, last_name, email_address, page, limit):
         "page": page,
         "limit": limit,
     }
-    response = requests.get(
+    response = get_session("PARTY_URL").get(
         f'{app.config["PARTY_URL"]}/party-api/v1/respondents', auth=app.config["BASIC_AUTH"], params=params
     )
 
@@ -300,7 +344,7 @@ def update_contact_details(respondent_id, form, ru_ref="NOT DEFINED"):
 
     if len(contact_details_changed) > 0:
         url = f'{app.config["PARTY_URL"]}/party-api/v1/respondents/id/{respondent_id}'
-        response = requests.put(url, json=new_contact_details, auth=app.config["BASIC_AUTH"])
+        response = get_session("PARTY_URL").put(url, json=new_contact_details, auth=app.config["BASIC_AUTH"])
 
         if response.status_code != 200:
             raise UpdateContactDetailsException(
@@ -314,6 +358,7 @@ def update_contact_details(respondent_id, form, ru_ref="NOT DEFINED"):
     return contact_details_changed
 
 
+@invalidates("business")
 def delete_attributes_by_sample_summary_id(sample_summary_id: str) -> None:
     """
     Deletes all the business attributes for a given sample_summary_id.  Each attribute represents a sample that a
@@ -328,7 +373,7 @@ def delete_attributes_by_sample_summary_id(sample_summary_id: str) -> None:
     logger.info("Deleting business attributes", sample_summary_id=sample_summary_id)
 
     url = f'{app.config["PARTY_URL"]}/party-api/v1/businesses/attributes/sample-summary/{sample_summary_id}'
-    response = requests.delete(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").delete(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -5,6 +5,7 @@ from flask import current_app as app
 from requests import HTTPError
 from structlog import wrap_logger
 
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -12,7 +13,7 @@ logger = wrap_logger(logging.getLogger(__name__))
 
 def search_reporting_units(query, limit, page):
     url = f'{app.config["PARTY_URL"]}/party-api/v1/businesses/search'
-    response = requests.get(
+    response = get_session("PARTY_URL").get(
         url,
         params={"query": query, "page": page, "limit": limit},
         auth=app.config["BASIC_AUTH"],
@@ -42,7 +43,7 @@ def change_enrolment_status(business_id, respondent_id, survey_id, change_flag):
         "survey_id": survey_id,
         "change_flag": change_flag,
     }
-    response = requests.put(url, json=enrolment_json, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").put(url, json=enrolment_json, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -70,7 +71,7 @@ def change_respondent_status(respondent_id, change_flag):
         logger.info("Changing respondent status", respondent_id=respondent_id, change_flag=change_flag)
         url = f'{app.config["PARTY_URL"]}/party-api/v1/respondents/edit-account-status/{respondent_id}'
         enrolment_json = {"respondent_id": respondent_id, "status_change": change_flag}
-        response = requests.put(url, json=enrolment_json, auth=app.config["BASIC_AUTH"])
+        response = get_session("PARTY_URL").put(url, json=enrolment_json, auth=app.config["BASIC_AUTH"])
 
         try:
             response.raise_for_status()
@@ -98,7 +99,7 @@ def generate_new_enrolment_code(case_id):
         "createdBy": "ROPS",
     }
 
-    response = requests.post(url, json=case_event, auth=app.config["BASIC_AUTH"])
+    response = get_session("CASE_URL").post(url, json=case_event, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -5,6 +5,7 @@ import requests
 from flask import current_app as app
 from structlog import wrap_logger
 
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -15,7 +16,7 @@ def find_respondent_account_by_username(username):
     auth = "{}:{}".format(app.config["SECURITY_USER_NAME"], app.config["SECURITY_USER_PASSWORD"]).encode("utf-8")
     headers = {"Authorization": "Basic %s" % base64.b64encode(bytes(auth)).decode("ascii")}
     url = f'{app.config["AUTH_URL"]}/api/account/user/{username}'
-    response = requests.get(url, headers=headers)
+    response = get_session("AUTH_URL").get(url, headers=headers)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -32,7 +33,7 @@ def delete_respondent_account_by_username(username):
     url = f'{app.config["AUTH_URL"]}/api/account/user'
     # force_delete will always be true if deletion is initiated from response operations
     form_data = {"username": username, "force_delete": True}
-    response = requests.delete(url, data=form_data, headers=headers)
+    response = get_session("AUTH_URL").delete(url, data=form_data, headers=headers)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -48,7 +49,7 @@ def undo_delete_respondent_account_by_username(username):
     url = f'{app.config["AUTH_URL"]}/api/account/user/{username}'
     # force_delete will always be false if restore is initiated from response operations
     form_data = {"mark_for_deletion": False, "force_delete": False}
-    response = requests.patch(url, data=form_data, headers=headers)
+    response = get_session("AUTH_URL").patch(url, data=form_data, headers=headers)
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -80,7 +81,7 @@ def resend_verification_email(party_id, is_new_account_verification):
         logger.info("Re-sending account email change verification notification", party_id=party_id)
         url = f'{app.config["PARTY_URL"]}/party-api/v1/resend-account-email-change-notification/{party_id}'
 
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("PARTY_URL").post(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
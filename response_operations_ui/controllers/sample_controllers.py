@@ -1,10 +1,10 @@
 import logging
 
-import requests
 from flask import current_app as app
 from requests.exceptions import HTTPError, RequestException
 from structlog import wrap_logger
 
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -14,7 +14,7 @@ def get_sample_summary(sample_summary_id):
     logger.info("Retrieving sample summary", sample_summary_id=sample_summary_id)
     url = f'{app.config["SAMPLE_URL"]}/samples/samplesummary/{sample_summary_id}'
 
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SAMPLE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -42,7 +42,7 @@ def check_if_all_sample_units_present_for_sample_summary(sample_summary_id: str)
         f'{app.config["SAMPLE_URL"]}/samples/samplesummary/'
         f"{sample_summary_id}/check-and-transition-sample-summary-status"
     )
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SAMPLE_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -71,7 +71,7 @@ def upload_sample(short_name, period, file):
     url = f'{app.config["SAMPLE_FILE_UPLOADER_URL"]}/samples/fileupload'
 
     files = {"file": (file.filename, file.stream, file.mimetype)}
-    response = requests.post(url=url, auth=app.config["BASIC_AUTH"], files=files)
+    response = get_session("SAMPLE_FILE_UPLOADER_URL").post(url=url, auth=app.config["BASIC_AUTH"], files=files)
 
     try:
         response.raise_for_status()
@@ -100,7 +100,7 @@ def delete_sample(sample_summary_id: str) -> None:
 
     url = f'{app.config["SAMPLE_URL"]}/samples/samplesummary/{sample_summary_id}'
 
-    response = requests.delete(url=url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SAMPLE_URL").delete(url=url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
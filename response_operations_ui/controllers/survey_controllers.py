@@ -1,38 +1,22 @@
 import logging
-import time
+from functools import partial
 
-import requests
 from flask import current_app as app
 from requests.exceptions import HTTPError, RequestException
 from structlog import wrap_logger
 
 from config import FDI_LIST, VACANCIES_LIST
+from response_operations_ui.common.controller_cache import invalidates
+from response_operations_ui.common.fan_out import fan_out
+from response_operations_ui.common.http_session import get_session
 from response_operations_ui.common.mappers import format_short_name
+from response_operations_ui.common.request_memo import memoize_per_request
+from response_operations_ui.common.single_flight import coalesce
 from response_operations_ui.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
 
 
-def check_cache():
-    logger.debug("checking cache age")
-    # if the cache is greater than 60 seconds refresh it
-    if not hasattr(app, "surveys_dict_time") or time.monotonic() - app.surveys_dict_time > 60:
-        logger.debug("cache older than 60 seconds refreshing")
-        try:
-            refresh_cache()
-        except ApiError:
-            logger.exception("Failed to refresh survey cache")
-    else:
-        logger.debug("cache is not out of date")
-
-
-def refresh_cache():
-    logger.debug("refreshing cache")
-    app.surveys_dict = get_surveys_dictionary()
-    app.surveys_dict_time = time.monotonic()
-    logger.debug("refreshed cache")
-
-
 def get_survey_by_id(survey_id):
     """
     Gets a survey from the survey service by its uuid.  This uuid is the one assigned
@@ -43,9 +27,13 @@ def get_survey_by_id(survey_id):
     :return: A dict containing the json describing the survey
     :rtype: dict
     """
+    survey = app.survey_index.get_by_id(survey_id, load=False)
+    if survey:
+        return survey
+
     logger.info("Retrieve survey using survey uuid", survey_id=survey_id)
     url = f'{app.config["SURVEY_URL"]}/surveys/{survey_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SURVEY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -55,7 +43,30 @@ def get_survey_by_id(survey_id):
         raise ApiError(response)
 
     logger.info("Successfully retrieved survey", survey_id=survey_id)
-    return response.json()
+    survey = response.json()
+    app.survey_index.remember(survey_id, survey)
+    return survey
+
+
+def get_surveys_by_ids(survey_ids) -> dict:
+    """
+    Gets a number of surveys at once.  Those in the survey index are looked up there and the rest are retrieved from
+    the survey service at the same time.
+
+    :param survey_ids: The uuids of the surveys, which can contain duplicates
+    :return: The surveys, by uuid
+    """
+    surveys = {}
+    missing_ids = []
+    for survey_id in dict.fromkeys(survey_ids):
+        survey = app.survey_index.get_by_id(survey_id, load=False)
+        if survey:
+            surveys[survey_id] = survey
+        else:
+            missing_ids.append(survey_id)
+
+    surveys.update(fan_out({survey_id: partial(get_survey_by_id, survey_id) for survey_id in missing_ids}))
+    return surveys
 
 
 def get_survey_by_ref(survey_id):
@@ -68,9 +79,13 @@ def get_survey_by_ref(survey_id):
     :return: A dict containing the json describing the survey
     :rtype: dict
     """
+    survey = app.survey_index.get_by_ref(survey_id, load=False)
+    if survey:
+        return survey
+
     logger.info("Retrieve survey using survey id", survey_id=survey_id)
     url = f'{app.config["SURVEY_URL"]}/surveys/ref/{survey_id}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SURVEY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -83,11 +98,13 @@ def get_survey_by_ref(survey_id):
     return response.json()
 
 
+@memoize_per_request
+@coalesce("survey-by-shortname")
 def get_survey_by_shortname(short_name: str) -> dict:
     short_name = "".join(short_name.split())
     logger.info("Retrieving survey", short_name=short_name)
     url = f'{app.config["SURVEY_URL"]}/surveys/shortname/{short_name}'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SURVEY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -100,10 +117,14 @@ def get_survey_by_shortname(short_name: str) -> dict:
     return response.json()
 
 
-def get_surveys_list():
+def get_business_surveys() -> list:
+    """
+    Gets every business survey from the survey service, as the service returns them.  This is what the survey index
+    is loaded from.
+    """
     logger.info("Retrieving surveys list")
     url = f'{app.config["SURVEY_URL"]}/surveys/surveytype/Business'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SURVEY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     if response.status_code == 204:
         logger.info("No surveys found in survey service")
@@ -116,12 +137,17 @@ def get_surveys_list():
         raise ApiError(response)
 
     logger.info("Successfully retrieved surveys list")
-    survey_list = response.json()
-    # Format survey shortName
-    for survey in survey_list:
-        survey["shortName"] = format_short_name(survey["shortName"])
+    return response.json()
+
+
+def get_surveys_list():
     # Order List by surveyRef
-    return sorted(survey_list, key=lambda k: k["surveyRef"])
+    return sorted(format_survey_list(get_business_surveys()), key=lambda k: k["surveyRef"])
+
+
+def format_survey_list(survey_list: list) -> list:
+    """Formats the short name of each survey for display"""
+    return [{**survey, "shortName": format_short_name(survey["shortName"])} for survey in survey_list]
 
 
 def get_survey(short_name: str) -> dict:
@@ -180,51 +206,51 @@ def get_business_survey_shortname_list() -> set:
 
 def get_survey_short_name_by_id(survey_id: str) -> str:
     try:
-        check_cache()
-        return app.surveys_dict[survey_id]["shortName"]
-    except (AttributeError, KeyError):
-        try:
-            # force a refresh in case there's a new survey
-            refresh_cache()
-            return app.surveys_dict[survey_id]["shortName"]
-        except ApiError:
-            logger.exception("Failed to resolve survey short name due to API error", survey_id=survey_id)
-        except KeyError:
-            logger.exception("Failed to resolve survey short name", survey_id=survey_id)
+        survey = app.survey_index.get_by_id(survey_id, refresh_on_miss=True)
+    except (ApiError, RequestException):
+        logger.exception("Failed to resolve survey short name due to API error", survey_id=survey_id)
+        return None
+    if survey is None:
+        logger.error("Failed to resolve survey short name", survey_id=survey_id)
+        return None
+    return convert_specific_surveys_to_specific_shortnames(format_short_name(survey["shortName"]))
 
 
 def get_survey_id_by_short_name(short_name: str) -> str:
     """
-    Returns the uuid of the survey by querying the survey service using the survey's shortname.
+    Returns the uuid of the survey, from the survey index if it's been loaded or otherwise by querying the survey
+    service using the survey's shortname.
 
     :param short_name: The survey's shortname
     :return: The survey's uuid
     """
     logger.info("Retrieving survey id by short name", short_name=short_name)
+    survey = app.survey_index.get_by_short_name(short_name, load=False)
+    if survey:
+        return survey["id"]
     return get_survey_by_shortname(short_name)["id"]
 
 
 def get_survey_ref_by_id(survey_id: str):
     try:
-        check_cache()
-        return app.surveys_dict[survey_id]["surveyRef"]
-    except (AttributeError, KeyError):
-        try:
-            # force a refresh in case there's a new survey
-            refresh_cache()
-            return app.surveys_dict[survey_id]["surveyRef"]
-        except ApiError:
-            logger.exception("Failed to resolve survey ref due to API error", survey_id=survey_id)
-        except KeyError:
-            logger.exception("Failed to resolve survey ref", survey_id=survey_id)
-
-
+        survey = app.survey_index.get_by_id(survey_id, refresh_on_miss=True)
+    except (ApiError, RequestException):
+        logger.exception("Failed to resolve survey ref due to API error", survey_id=survey_id)
+        return None
+    if survey is None:
+        logger.error("Failed to resolve survey ref", survey_id=survey_id)
+        return None
+    return survey["surveyRef"]
+
+
+@invalidates("survey-list")
+@invalidates("survey")
 def update_survey_details(survey_ref, short_name, long_name, survey_mode):
     logger.info("Updating survey details", survey_ref=survey_ref)
     url = f'{app.config["SURVEY_URL"]}/surveys/ref/{survey_ref}'
 
     survey_details = {"ShortName": short_name, "LongName": long_name, "surveyMode": survey_mode}
-    response = requests.put(url, json=survey_details, auth=app.config["BASIC_AUTH"])
+    response = get_session("SURVEY_URL").put(url, json=survey_details, auth=app.config["BASIC_AUTH"])
 
     if response.status_code == 404:
         logger.warning("Error retrieving survey details", survey_ref=survey_ref)
@@ -241,7 +267,7 @@ def update_survey_details(survey_ref, short_name, long_name, survey_mode):
 def get_legal_basis_list():
     logger.info("Retrieving legal basis list")
     url = f'{app.config["SURVEY_URL"]}/legal-bases'
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = get_session("SURVEY_URL").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -254,6 +280,8 @@ def get_legal_basis_list():
     return lbs
 
 
+@invalidates("survey-list")
+@invalidates("survey", key=lambda survey_ref, short_name, *_: short_name)
 def create_survey(survey_ref, short_name, long_name, legal_basis, survey_mode):
     logger.info(
         "Creating new survey",
@@ -278,7 +306,7 @@ def create_survey(survey_ref, short_name, long_name, legal_basis, survey_mode):
         ],
         "eqVersion": "v3" if survey_mode != "SEFT" else "",
     }
-    response = requests.post(url, json=survey_details, auth=app.config["BASIC_AUTH"])
+    response = get_session("SURVEY_URL").post(url, json=survey_details, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -1,5 +1,6 @@
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
 from json import JSONDecodeError, dumps
 from secrets import token_urlsafe
 
@@ -8,13 +9,25 @@ from flask import abort
 from flask import current_app as app
 from flask import session
 from itsdangerous import URLSafeSerializer
+from redis.exceptions import RedisError
 from requests import ConnectionError, HTTPError, Timeout
 from structlog import wrap_logger
 
+from response_operations_ui.common.cache_codec import decode, encode
+from response_operations_ui.common.controller_cache import get_cache_key
+from response_operations_ui.common.http_session import get_session
+from response_operations_ui.common.request_memo import (
+    clear_request_memo,
+    memoize_per_request,
+)
+from response_operations_ui.common.single_flight import single_flight
 from response_operations_ui.exceptions.exceptions import ServiceUnavailableException
 
 logger = wrap_logger(logging.getLogger(__name__))
 
+PERMISSIONS_EXPIRY = 300  # 5 mins
+PERMISSIONS_REFRESH_AHEAD = 60
+
 
 def sign_in(username: str, password: str):
     logger.info("Retrieving OAuth2 token for sign-in")
@@ -35,7 +48,7 @@ def sign_in(username: str, password: str):
         "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
     }
 
-    response = requests.post(url, data=data, headers=headers)
+    response = get_session("UAA_SERVICE_URL").post(url, data=data, headers=headers)
 
     try:
         response.raise_for_status()
@@ -58,21 +71,65 @@ def sign_in(username: str, password: str):
         abort(500)
 
 
-def login_admin():
+def login_admin(rejected_token: str = None) -> str | None:
+    """
+    Gets a client credentials token for the response-operations-ui client, to call UAA's admin endpoints with.  It's
+    shared between workers through redis until UAA_ADMIN_TOKEN_EXPIRY_MARGIN seconds before it expires, and only
+    one worker at a time asks UAA for a new one.
+
+    :param rejected_token: A token UAA has rejected, which is replaced rather than used again.  If another worker has
+                           already replaced it, its replacement is used
+    :return: The access token
+    """
+    cache_key = get_cache_key("uaa-admin-token")
+    try:
+        cached_token = app.redis.get(cache_key)
+        if cached_token and cached_token.decode() != rejected_token:
+            return cached_token.decode()
+    except RedisError:
+        logger.error("Error getting UAA admin token from cache, please investigate", exc_info=True)
+
+    token = single_flight("uaa-admin-token", _request_admin_token)
+    access_token = token.get("access_token")
+    expiry = token.get("expires_in", 0) - app.config["UAA_ADMIN_TOKEN_EXPIRY_MARGIN"]
+    if access_token and expiry > 0:
+        try:
+            app.redis.set(cache_key, access_token, ex=expiry)
+        except RedisError:
+            # Not throwing an exception as the cache isn't fatal
+            logger.error("Error caching UAA admin token, please investigate", exc_info=True)
+    return access_token
+
+
+def _request_admin_token() -> dict:
     headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
     payload = {"grant_type": "client_credentials", "response_type": "token", "token_format": "opaque"}
     try:
         url = f"{app.config['UAA_SERVICE_URL']}/oauth/token"
-        response = requests.post(
+        response = get_session("UAA_SERVICE_URL").post(
             url, headers=headers, params=payload, auth=(app.config["UAA_CLIENT_ID"], app.config["UAA_CLIENT_SECRET"])
         )
-        resp_json = response.json()
-        return resp_json.get("access_token")
+        return response.json()
     except HTTPError:
         logger.exception("Failed to log into UAA", status_code=response.status_code)
         abort(response.status_code)
 
 
+def _request_as_admin(method: str, url: str, headers: dict = None, **kwargs) -> requests.Response:
+    """
+    Calls UAA with the admin token, using the session method named by method (e.g., get).  If UAA rejects the token
+    (e.g., it's been revoked) it's replaced and the call made again, once.
+    """
+    access_token = login_admin()
+    send = getattr(get_session("UAA_SERVICE_URL"), method)
+    response = send(url, headers={**generate_headers(access_token), **(headers or {})}, **kwargs)
+    if response.status_code == 401:
+        logger.info("UAA rejected the admin token, getting a new one", url=url)
+        access_token = login_admin(rejected_token=access_token)
+        response = send(url, headers={**generate_headers(access_token), **(headers or {})}, **kwargs)
+    return response
+
+
 def get_user_by_filter(user_filter: str, access_token=None) -> dict | None:
     """
     Gets the user details from uaa using the filter param
@@ -80,13 +137,11 @@ def get_user_by_filter(user_filter: str, access_token=None) -> dict | None:
     :param access_token: The response-operations-ui client access token for uaa
     :return: A dict containing the search results, or None if there was an error getting records
     """
-    if access_token is None:
-        access_token = login_admin()
-
-    headers = generate_headers(access_token)
-
     url = f"{app.config['UAA_SERVICE_URL']}/Users?filter={user_filter}"
-    response = requests.get(url, headers=headers)
+    if access_token is None:
+        response = _request_as_admin("get", url)
+    else:
+        response = get_session("UAA_SERVICE_URL").get(url, headers=generate_headers(access_token))
 
     try:
         response.raise_for_status()
@@ -109,11 +164,8 @@ def get_user_by_id(user_id: str) -> dict | None:
     :param user_id: The id of the user in uaa
     :return: The user details from uaa in dictionary form.
     """
-    access_token = login_admin()
-    headers = generate_headers(access_token)
-
     url = f"{app.config['UAA_SERVICE_URL']}/Users/{user_id}"
-    response = requests.get(url, headers=headers)
+    response = _request_as_admin("get", url)
     try:
         response.raise_for_status()
     except HTTPError:
@@ -129,11 +181,8 @@ def delete_user(user_id: str) -> dict:
 
     :param user_id: The id of the user in uaa
     """
-    access_token = login_admin()
-    headers = generate_headers(access_token)
-
     url = f"{app.config['UAA_SERVICE_URL']}/Users/{user_id}"
-    response = requests.delete(url, headers=headers)
+    response = _request_as_admin("delete", url)
     try:
         response.raise_for_status()
     except HTTPError:
@@ -147,7 +196,7 @@ def retrieve_user_code(access_token, username):
     headers = generate_headers(access_token)
 
     url = f"{app.config['UAA_SERVICE_URL']}/password_resets"
-    response = requests.post(url, headers=headers, data=username)
+    response = get_session("UAA_SERVICE_URL").post(url, headers=headers, data=username)
 
     if response.status_code != 201:
         logger.error("Error received when asking UAA for a password reset code", status_code=response.status_code)
@@ -171,7 +220,7 @@ def change_password(access_token: str, user_code: str, new_password: str) -> req
     payload = {"code": user_code, "new_password": new_password}
 
     url = f"{app.config['UAA_SERVICE_URL']}/password_change"
-    return requests.post(url, data=dumps(payload), headers=headers)
+    return get_session("UAA_SERVICE_URL").post(url, data=dumps(payload), headers=headers)
 
 
 def generate_headers(access_token):
@@ -239,9 +288,6 @@ def create_user_account_with_random_password(email: str, first_name: str, last_n
     :param last_name: Last name of the user being created
     :return: A dict representing the user on success, or a dict with an 'error' key on any failure
     """
-    access_token = login_admin()
-    headers = generate_headers(access_token)
-
     # We can't create a user without a password, so we'll create an unverified user with a password that is 72 bytes
     # long. Length can't be any longer when using the latest versions of UAA. When the user ends up getting a link to
     # verify their account and set their password, we can verify and change the password at the same time.
@@ -254,7 +300,7 @@ def create_user_account_with_random_password(email: str, first_name: str, last_n
     }
 
     url = f"{app.config['UAA_SERVICE_URL']}/Users"
-    response = requests.post(url, json=payload, headers=headers)
+    response = _request_as_admin("post", url, json=payload)
     try:
         response.raise_for_status()
         return response.json()
@@ -276,17 +322,10 @@ def update_user_account(payload) -> dict | None:
     :param payload: the same payload we receive from uaa, with the updated values
     :return errors: None on success, or the errors returned from uaa as a dictionary
     """
-    access_token = login_admin()
-
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "Authorization": f"Bearer {access_token}",
-        "If-Match": str(payload["meta"]["version"]),
-    }
+    headers = {"If-Match": str(payload["meta"]["version"])}
     logger.info("Attempting change of user information")
     url = f"{app.config['UAA_SERVICE_URL']}/Users/{payload['id']}"
-    response = requests.put(url, data=dumps(payload), headers=headers)
+    response = _request_as_admin("put", url, headers=headers, data=dumps(payload))
     try:
         response.raise_for_status()
         return
@@ -316,12 +355,13 @@ def update_user_password(user: dict, old_password: str, new_password: str) -> di
     :param new_password: The new password
     :return errors: The errors returned from uaa as a dictionary
     """
+    # Not made with _request_as_admin, as UAA says 401 here when the current password is wrong
     access_token = login_admin()
     headers = generate_headers(access_token)
     payload = {"oldPassword": old_password, "password": new_password}
     logger.info("Attempting change of users password", user_id=user["id"])
     url = f"{app.config['UAA_SERVICE_URL']}/Users/{user['id']}/password"
-    response = requests.put(url, data=dumps(payload), headers=headers)
+    response = get_session("UAA_SERVICE_URL").put(url, data=dumps(payload), headers=headers)
     try:
         response.raise_for_status()
         logger.info("Successfully changed users password", user_id=user["id"])
@@ -351,12 +391,9 @@ def get_groups() -> dict:
     every group and its metadata
     :return: A dictionary containing details about the groups
     """
-    access_token = login_admin()
-    headers = generate_headers(access_token)
-
     url = f"{app.config['UAA_SERVICE_URL']}/Groups"
     try:
-        response = requests.get(url, headers=headers)
+        response = _request_as_admin("get", url)
         response.raise_for_status()
     except HTTPError:
         logger.error("Error retrieving groups from UAA", exc_info=True)
@@ -378,12 +415,9 @@ def add_group_membership(user_id: str, group_id: str) -> dict:
     :param group_id: The uuid of the group
     """
     logger.info("About to add member to group", user_id=user_id, group_id=group_id)
-    access_token = login_admin()
-    headers = generate_headers(access_token)
-
     url = f"{app.config['UAA_SERVICE_URL']}/Groups/{group_id}/members"
     payload = {"type": "USER", "value": user_id}
-    response = requests.post(url, json=payload, headers=headers)
+    response = _request_as_admin("post", url, json=payload)
     try:
         response.raise_for_status()
     except HTTPError:
@@ -397,6 +431,7 @@ def add_group_membership(user_id: str, group_id: str) -> dict:
         )
         raise
 
+    invalidate_permissions(user_id)
     logger.info(
         "Successfully added member to group",
         administering_user_id=session["user_id"],
@@ -415,11 +450,8 @@ def remove_group_membership(user_id: str, group_id: str) -> dict:
     :param group_id: The uuid of the group
     """
     logger.info("About to remove member from group", user_id=user_id, group_id=group_id)
-    access_token = login_admin()
-    headers = generate_headers(access_token)
-
     url = f"{app.config['UAA_SERVICE_URL']}/Groups/{group_id}/members/{user_id}"
-    response = requests.delete(url, headers=headers)
+    response = _request_as_admin("delete", url)
     try:
         response.raise_for_status()
     except HTTPError:
@@ -433,6 +465,7 @@ def remove_group_membership(user_id: str, group_id: str) -> dict:
         )
         raise
 
+    invalidate_permissions(user_id)
     logger.info(
         "Successfully removed member from group",
         administering_user_id=session["user_id"],
@@ -449,13 +482,97 @@ def refresh_permissions(user_id: str) -> None:
 
     :param user_id: The user ID to refresh for
     """
+    session["permissions"] = _fetch_permissions(user_id)
+
+
+@memoize_per_request
+def get_permissions(user_id: str) -> frozenset:
+    """
+    Gets the names of the groups the user is in, as a set.  They're kept in the session for PERMISSIONS_EXPIRY
+    seconds, and checking them doesn't call redis or UAA until they're within PERMISSIONS_REFRESH_AHEAD seconds of
+    that.  From then they're refreshed in the background and picked up from redis on a later request, or fetched
+    again straight away if the user's groups have been changed since they were fetched.
+
+    :param user_id: The id of the user in uaa
+    """
+    permissions = session.get("permissions")
+    if not permissions or "fetched_at" not in permissions:
+        refresh_permissions(user_id)
+        return frozenset(session["permissions"]["groups"])
+
+    if time.time() - permissions["fetched_at"] < PERMISSIONS_EXPIRY - PERMISSIONS_REFRESH_AHEAD:
+        return frozenset(permissions["groups"])
+
+    try:
+        prefetched, changed_at = app.redis.mget(
+            get_cache_key("permissions", user_id), get_cache_key("permissions-changed", user_id)
+        )
+        prefetched = decode(prefetched) if prefetched is not None else None
+    except (RedisError, ValueError):
+        logger.error("Error getting permissions from cache, please investigate", exc_info=True)
+        prefetched = changed_at = None
+
+    if changed_at is not None and float(changed_at) >= permissions["fetched_at"]:
+        refresh_permissions(user_id)
+    elif prefetched is not None and prefetched["fetched_at"] > permissions["fetched_at"]:
+        session["permissions"] = prefetched
+
+    age = time.time() - session["permissions"]["fetched_at"]
+    if age >= PERMISSIONS_EXPIRY:
+        refresh_permissions(user_id)
+    elif age >= PERMISSIONS_EXPIRY - PERMISSIONS_REFRESH_AHEAD:
+        _prefetch_permissions_in_background(user_id)
+    return frozenset(session["permissions"]["groups"])
+
+
+def invalidate_permissions(user_id: str) -> None:
+    """
+    Makes the user's permissions be fetched again, e.g. after their groups have been changed.  If they're the user
+    signed in to this session that's on their next check, and for their other sessions it's once those are due to be
+    refreshed.
+    """
+    clear_request_memo()
+    if session.get("user_id") == user_id:
+        session.pop("permissions", None)
+    try:
+        pipeline = app.redis.pipeline()
+        pipeline.delete(get_cache_key("permissions", user_id))
+        pipeline.set(get_cache_key("permissions-changed", user_id), time.time(), ex=PERMISSIONS_EXPIRY)
+        pipeline.execute()
+    except RedisError:
+        logger.error("Error invalidating permissions, please investigate", user_id=user_id, exc_info=True)
+
+
+def _fetch_permissions(user_id: str) -> dict:
+    # Timed from before the call, so a change to the user's groups made during it isn't taken as seen
+    fetched_at = time.time()
     user = get_user_by_id(user_id)
-    session["permissions"] = {
-        "groups": user.get("groups"),
-        "expiry": datetime.isoformat(datetime.now() + timedelta(minutes=5)),
-    }
+    return {"groups": sorted({group["display"] for group in user.get("groups")}), "fetched_at": fetched_at}
+
+
+def _prefetch_permissions_in_background(user_id: str) -> None:
+    """Fetches the user's permissions into redis in a background thread, unless another request already is"""
+    try:
+        if not app.redis.set(get_cache_key("permissions", f"{user_id}:lock"), 1, nx=True, ex=PERMISSIONS_REFRESH_AHEAD):
+            return
+    except RedisError:
+        logger.error("Error taking permissions refresh lock", user_id=user_id, exc_info=True)
+        return
+
+    flask_app = app._get_current_object()
+
+    def prefetch():
+        with flask_app.app_context():
+            try:
+                permissions = _fetch_permissions(user_id)
+                flask_app.redis.set(get_cache_key("permissions", user_id), encode(permissions), ex=PERMISSIONS_EXPIRY)
+            except Exception:
+                logger.exception("Failed to refresh permissions in the background", user_id=user_id)
+
+    threading.Thread(target=prefetch, name="permissions-refresh", daemon=True).start()
 
 
+@memoize_per_request
 def user_has_permission(permission: str, user_id=None) -> bool:
     """
     Checks to see if the user provided or in the session has the specified permission
@@ -469,10 +586,7 @@ def user_has_permission(permission: str, user_id=None) -> bool:
             return False
         user_id = session["user_id"]
 
-    if "permissions" not in session or datetime.fromisoformat(session["permissions"]["expiry"]) < datetime.now():
-        refresh_permissions(user_id)
-
-    return any(permission in g["display"] for g in session["permissions"]["groups"])
+    return permission in get_permissions(user_id)
 
 
 def get_users_list(
@@ -488,12 +602,10 @@ def get_users_list(
     :param max_count:
     :return: A dict containing the users or an error message
     """
-    access_token = login_admin()
-    headers = generate_headers(access_token)
     param = {"filter": query, "sortBy": sort_by, "count": max_count, "startIndex": start_index, "sortOrder": sort_order}
     logger.info("Attempting to fetch user records")
     url = f"{app.config['UAA_SERVICE_URL']}/Users"
-    response = requests.get(url, params=param, headers=headers)
+    response = _request_as_admin("get", url, params=param)
     try:
         response.raise_for_status()
         return response.json()
@@ -3,7 +3,7 @@ from enum import Enum
 
 class ErrorCode(Enum):
     """
-    E0001 to E0006 relate to API Error Codes
+    E0001 to E0008 relate to API Error Codes
     """
 
     API_CONNECTION_ERROR = "E0001"
@@ -13,6 +13,7 @@ class ErrorCode(Enum):
     API_UNEXPECTED_CONTENT = "E0005"
     API_OIDC_CREDENTIALS_ERROR = "E0006"
     API_TIMEOUT_ERROR = "E0007"
+    API_CIRCUIT_OPEN = "E0008"
 
     # HTTP Error Codes
     NOT_FOUND = "404"
@@ -27,6 +28,7 @@ def get_error_code_message(error_code):
         ErrorCode.API_UNEXPECTED_CONTENT_TYPE: "The service returned an unexpected content type",
         ErrorCode.API_UNEXPECTED_CONTENT: "The service returned unexpected content",
         ErrorCode.API_OIDC_CREDENTIALS_ERROR: "An error occurred preparing to authenticate with the service",
+        ErrorCode.API_CIRCUIT_OPEN: "The service is failing, calls to it are being short-circuited",
         ErrorCode.NOT_FOUND: "Page Not Found",
     }
     return error_code_messages.get(error_code, "An unknown error occurred")
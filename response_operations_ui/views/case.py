@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+from functools import partial
 
 from flask import Blueprint, render_template, request, url_for
 from flask_login import login_required
@@ -7,6 +8,7 @@ from structlog import wrap_logger
 from werkzeug.utils import redirect
 
 from response_operations_ui.common.dates import get_formatted_date
+from response_operations_ui.common.fan_out import fan_out
 from response_operations_ui.common.mappers import (
     format_short_name,
     map_ce_response_status,
@@ -46,16 +48,28 @@ def get_response_statuses(ru_ref, error=None):
 
     completed_respondent = ""
 
-    survey = survey_controllers.get_survey_by_shortname(short_name)
+    survey_and_business = fan_out(
+        {
+            "survey": partial(survey_controllers.get_survey_by_shortname, short_name),
+            "reporting_unit": partial(party_controller.get_business_by_ru_ref, ru_ref),
+        }
+    )
+    survey = survey_and_business["survey"]
+    reporting_unit = survey_and_business["reporting_unit"]
 
     exercises = collection_exercise_controllers.get_collection_exercises_by_survey(survey["id"])
     exercise = collection_exercise_controllers.get_collection_exercise_from_list(exercises, period)
 
-    reporting_unit = party_controller.get_business_by_ru_ref(ru_ref)
-
-    possible_transitions_for_case = case_controller.get_available_case_group_statuses_direct(exercise["id"], ru_ref)
-
-    case_groups = case_controller.get_case_groups_by_business_party_id(reporting_unit["id"])
+    case_details = fan_out(
+        {
+            "possible_transitions": partial(
+                case_controller.get_available_case_group_statuses_direct, exercise["id"], ru_ref
+            ),
+            "case_groups": partial(case_controller.get_case_groups_by_business_party_id, reporting_unit["id"]),
+        }
+    )
+    possible_transitions_for_case = case_details["possible_transitions"]
+    case_groups = case_details["case_groups"]
     case_group = case_controller.get_case_group_by_collection_exercise(case_groups, exercise["id"])
     case_group_status = case_group["caseGroupStatus"]
     case_id = get_case_by_case_group_id(case_group["id"]).get("id")
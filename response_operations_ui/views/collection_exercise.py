@@ -2,6 +2,7 @@ import json
 import logging
 from collections import defaultdict
 from datetime import datetime
+from functools import partial
 
 import iso8601
 from dateutil import tz
@@ -30,6 +31,8 @@ from response_operations_ui.common.date_restriction_generator import (
     get_date_restriction_text,
 )
 from response_operations_ui.common.dates import localise_datetime
+from response_operations_ui.common.deadline import request_budget
+from response_operations_ui.common.fan_out import fan_out
 from response_operations_ui.common.filters import get_collection_exercise_by_period
 from response_operations_ui.common.mappers import (
     convert_events_to_new_format,
@@ -109,15 +112,25 @@ def _build_collection_instruments_details(collection_exercise_id: str, survey_id
 
 @collection_exercise_bp.route("/<short_name>/<period>", methods=["GET"])
 @login_required
+@request_budget(seconds=20)
 def view_collection_exercise(short_name, period):
     sample_load_status = None
     sample_ingest_date_time = None
     collection_exercise, survey = get_collection_exercise_and_survey_details(short_name, period)
-    sample = get_sample_summary(collection_exercise["id"])
-    events = convert_events_to_new_format(
-        collection_exercise_controllers.get_collection_exercise_events_by_id(collection_exercise["id"])
+    ce_details = fan_out(
+        {
+            "sample": partial(get_sample_summary, collection_exercise["id"]),
+            "events": partial(
+                collection_exercise_controllers.get_collection_exercise_events_by_id, collection_exercise["id"]
+            ),
+            "collection_instruments": partial(
+                _build_collection_instruments_details, collection_exercise["id"], survey["id"]
+            ),
+        }
     )
-    collection_instruments = _build_collection_instruments_details(collection_exercise["id"], survey["id"])
+    sample = ce_details["sample"]
+    events = convert_events_to_new_format(ce_details["events"])
+    collection_instruments = ce_details["collection_instruments"]
     ce_state = collection_exercise["state"]
 
     if sample:
@@ -2,9 +2,13 @@ import logging
 from json import JSONDecodeError, loads
 from pathlib import Path
 
-from flask import Blueprint, jsonify, make_response, session
+from flask import Blueprint, current_app, jsonify, make_response
+from flask_login import login_required
+from redis.exceptions import RedisError
 from structlog import wrap_logger
 
+from response_operations_ui.common.cache_metrics import get_cache_metrics
+
 logger = wrap_logger(logging.getLogger(__name__))
 
 info_bp = Blueprint("info_bp", __name__, static_folder="static", template_folder="templates")
@@ -29,10 +33,36 @@ def get_info():
     return make_response(jsonify(info), 200)
 
 
-@info_bp.after_request
-def clear_session(response):
-    # the info endpoint will be hit by CF to confirm app status
-    # we don't want lots of sessions in REDIS for this so clear
-    # the session after each request
-    session.clear()
-    return response
+@info_bp.route("/metrics", methods=["GET"])
+@login_required
+def get_metrics():
+    # Kept off /info, which is the health probe, as these are read from redis.  Unlike /info they need a session, as
+    # they show how the backends and caches are doing
+    metrics = {}
+
+    if current_app.config["CIRCUIT_BREAKER_ENABLED"]:
+        try:
+            metrics["circuit_breakers"] = current_app.http_sessions.get_circuit_breaker_states(current_app.redis)
+        except RedisError:
+            logger.error("Failed to get circuit breaker states", exc_info=True)
+            metrics["circuit_breakers"] = "unavailable"
+
+    if current_app.config["HTTP_CACHE_ENABLED"]:
+        try:
+            metrics["http_cache"] = current_app.http_sessions.get_http_cache_stats(current_app.redis)
+        except RedisError:
+            logger.error("Failed to get http cache stats", exc_info=True)
+            metrics["http_cache"] = "unavailable"
+
+    if current_app.config["CACHE_METRICS_ENABLED"]:
+        # So what this worker has counted since it last flushed is included
+        current_app.cache_metrics.flush(force=True)
+        try:
+            metrics["cache"] = get_cache_metrics(current_app.redis)
+        except RedisError:
+            logger.error("Failed to get cache metrics", exc_info=True)
+            metrics["cache"] = "unavailable"
+
+    if not metrics:
+        return make_response(jsonify({}), 404)
+    return make_response(jsonify(metrics), 200)
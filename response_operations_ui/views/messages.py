@@ -3,6 +3,8 @@ import json
 import logging
 import math
 from datetime import datetime
+from functools import partial
+from typing import Iterable
 
 from flask import (
     Blueprint,
@@ -19,6 +21,7 @@ from structlog import wrap_logger
 
 from config import FDI_LIST, VACANCIES_LIST
 from response_operations_ui.common.dates import get_formatted_date, localise_datetime
+from response_operations_ui.common.fan_out import fan_out
 from response_operations_ui.common.mappers import format_short_name
 from response_operations_ui.common.pagination_processor import pagination_processor
 from response_operations_ui.common.uaa import verify_permission
@@ -494,10 +497,11 @@ def view_selected_survey(selected_survey):  # noqa: C901
 
         form.ru_ref_filter.data = ru_ref_filter
 
-        tab_counts = _get_tab_counts(business_id_filter, conversation_tab, ru_ref_filter, survey_id, category)
+        tab_counts, recalculated_page, thread_list = _get_tab_counts_and_thread_list(
+            business_id_filter, conversation_tab, ru_ref_filter, survey_id, category, page, limit
+        )
 
         # If the page is higher than possible, redirect users to the highest possible page.
-        recalculated_page = _verify_requested_page_is_within_bounds(page, limit, tab_counts["current"])
         if recalculated_page != page:
             return redirect(
                 url_for(
@@ -510,12 +514,7 @@ def view_selected_survey(selected_survey):  # noqa: C901
                 )
             )
 
-        messages = [
-            _refine(message)
-            for message in message_controllers.get_thread_list(
-                survey_id, business_id_filter, conversation_tab, page, limit, category
-            )
-        ]
+        messages = [_refine(message) for message in thread_list]
 
         href = "?conversation_tab=" + conversation_tab
 
@@ -594,6 +593,28 @@ def _get_tab_counts(business_id_filter, conversation_tab, ru_ref_filter, survey_
     return {"current": thread_count}
 
 
+def _get_tab_counts_and_thread_list(
+    business_id_filter, conversation_tab, ru_ref_filter, survey_id, category, page, limit
+) -> tuple[dict, int, list | None]:
+    """Gets the tab counts, the highest page within bounds of them that's no higher than the one requested, and the
+    threads to display.  The first page always exists, so for it the counts and threads are retrieved at the same
+    time.  For any other page the threads are only retrieved once the counts show the page is within bounds, otherwise
+    None is returned in their place and the caller is expected to redirect to the page returned"""
+    get_tab_counts = partial(_get_tab_counts, business_id_filter, conversation_tab, ru_ref_filter, survey_id, category)
+    get_thread_list = partial(
+        message_controllers.get_thread_list, survey_id, business_id_filter, conversation_tab, page, limit, category
+    )
+    if page == 1:
+        inbox = fan_out({"tab_counts": get_tab_counts, "thread_list": get_thread_list})
+        return inbox["tab_counts"], page, inbox["thread_list"]
+
+    tab_counts = get_tab_counts()
+    recalculated_page = _verify_requested_page_is_within_bounds(page, limit, tab_counts["current"])
+    if recalculated_page != page:
+        return tab_counts, recalculated_page, None
+    return tab_counts, page, get_thread_list()
+
+
 @messages_bp.route("/threads/<thread_id>/close-conversation", methods=["GET", "POST"])
 @login_required
 def close_conversation(thread_id):
@@ -836,7 +857,7 @@ def _get_FDI_survey_id() -> list[str]:
 
     :returns: A list of FDI survey_id's
     """
-    return [survey_controllers.get_survey_id_by_short_name(fdi_survey) for fdi_survey in FDI_LIST]
+    return _get_survey_ids_by_short_names(FDI_LIST)
 
 
 def _get_vacancies_survey_ids() -> list[str]:
@@ -845,7 +866,14 @@ def _get_vacancies_survey_ids() -> list[str]:
 
     :returns: A list of vacancies survey_id's
     """
-    return [survey_controllers.get_survey_id_by_short_name(vacancies_survey) for vacancies_survey in VACANCIES_LIST]
+    return _get_survey_ids_by_short_names(VACANCIES_LIST)
+
+
+def _get_survey_ids_by_short_names(short_names: Iterable[str]) -> list[str]:
+    survey_ids = fan_out(
+        {short_name: partial(survey_controllers.get_survey_id_by_short_name, short_name) for short_name in short_names}
+    )
+    return list(survey_ids.values())
 
 
 def _get_user_summary_for_message(message: dict, category: str) -> str:
@@ -1009,10 +1037,11 @@ def _process_category_page(
 
         form.ru_ref_filter.data = ru_ref_filter
 
-        tab_counts = _get_tab_counts(business_id_filter, conversation_tab, ru_ref_filter, None, category)
+        tab_counts, recalculated_page, thread_list = _get_tab_counts_and_thread_list(
+            business_id_filter, conversation_tab, ru_ref_filter, None, category, page, limit
+        )
 
         # If the page is higher then possible, redirect users to the highest possible page.
-        recalculated_page = _verify_requested_page_is_within_bounds(page, limit, tab_counts["current"])
         if recalculated_page != page:
             return redirect(
                 url_for(
@@ -1024,12 +1053,7 @@ def _process_category_page(
                 )
             )
 
-        messages = [
-            _refine(message)
-            for message in message_controllers.get_thread_list(
-                None, business_id_filter, conversation_tab, page, limit, category
-            )
-        ]
+        messages = [_refine(message) for message in thread_list]
 
         href = "?conversation_tab=" + conversation_tab
 
@@ -1087,10 +1111,11 @@ def _process_non_survey_category_page(
     business_id_filter = request.args.get("business_id_filter", default="")
     category = category
     try:
-        tab_counts = _get_tab_counts("", conversation_tab, "", None, category)
+        tab_counts, recalculated_page, thread_list = _get_tab_counts_and_thread_list(
+            "", conversation_tab, "", None, category, page, limit
+        )
 
         # If the page is higher then possible, redirect users to the highest possible page.
-        recalculated_page = _verify_requested_page_is_within_bounds(page, limit, tab_counts["current"])
         if recalculated_page != page:
             return redirect(
                 url_for(
@@ -1100,10 +1125,7 @@ def _process_non_survey_category_page(
                 )
             )
 
-        messages = [
-            _refine(message)
-            for message in message_controllers.get_thread_list(None, "", conversation_tab, page, limit, category)
-        ]
+        messages = [_refine(message) for message in thread_list]
 
         href = "?conversation_tab=" + conversation_tab
 
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime, timezone
+from functools import partial
 
 from flask import Blueprint
 from flask import current_app as app
@@ -8,6 +9,8 @@ from flask_login import login_required
 from iso8601 import parse_date
 from structlog import wrap_logger
 
+from response_operations_ui.common.deadline import request_budget
+from response_operations_ui.common.fan_out import fan_out
 from response_operations_ui.common.mappers import map_ce_response_status, map_region
 from response_operations_ui.common.pagination_processor import pagination_processor
 from response_operations_ui.contexts.reporting_units import (
@@ -22,9 +25,12 @@ from response_operations_ui.controllers import (
 )
 from response_operations_ui.controllers.collection_exercise_controllers import (
     get_case_group_status_by_collection_exercise,
-    get_collection_exercise_by_id,
+    get_collection_exercises_by_ids,
+)
+from response_operations_ui.controllers.survey_controllers import (
+    get_survey_by_id,
+    get_surveys_by_ids,
 )
-from response_operations_ui.controllers.survey_controllers import get_survey_by_id
 from response_operations_ui.controllers.uaa_controller import user_has_permission
 from response_operations_ui.exceptions.exceptions import ApiError
 from response_operations_ui.forms import EditContactDetailsForm, RuSearchForm
@@ -36,6 +42,7 @@ reporting_unit_bp = Blueprint("reporting_unit_bp", __name__, static_folder="stat
 
 @reporting_unit_bp.route("/<ru_ref>", methods=["GET"])
 @login_required
+@request_budget(seconds=20)
 def view_reporting_unit(ru_ref):
     logger.info("Gathering data to view reporting unit", ru_ref=ru_ref)
     # Make some initial calls to retrieve some data we'll need
@@ -56,7 +63,7 @@ def view_reporting_unit(ru_ref):
 
     # Get all collection exercises for retrieved case groups
     collection_exercise_ids = {case_group["collectionExerciseId"] for case_group in case_groups}
-    collection_exercises = [get_collection_exercise_by_id(ce_id) for ce_id in collection_exercise_ids]
+    collection_exercises = get_collection_exercises_by_ids(collection_exercise_ids)
     live_collection_exercises = [
         ce for ce in collection_exercises if parse_date(ce["scheduledStartDateTime"]) < datetime.now(timezone.utc)
     ]
@@ -78,14 +85,9 @@ def build_survey_table_data_dict(collection_exercises: list, case_groups: list)
     :return: A sorted list of survey/CE information to provide to the front-end table
     """
     table_data = {}
-    surveys = {}
+    surveys = get_surveys_by_ids(ce["surveyId"] for ce in collection_exercises)
     for ce in collection_exercises:
-        # Keep a mini cache of surveys, so we don't have to keep asking for the same survey data repeatedly
-        survey = surveys.get(ce["surveyId"])
-        if survey is None:
-            survey = get_survey_by_id(ce["surveyId"])
-            surveys[ce["surveyId"]] = survey
-
+        survey = surveys[ce["surveyId"]]
         if survey["surveyRef"] in table_data:
             # Keep the one with the later go-live date
             if parse_date(table_data[survey["surveyRef"]]["goLive"]) > parse_date(ce["scheduledStartDateTime"]):
@@ -159,6 +161,7 @@ def build_respondent_table_data_dict(associations: list) -> list:
 
 @reporting_unit_bp.route("/<ru_ref>/surveys/<survey_id>", methods=["GET"])
 @login_required
+@request_budget(seconds=20)
 def view_reporting_unit_survey(ru_ref, survey_id):
     logger.info("Gathering data to view reporting unit survey data", ru_ref=ru_ref, survey_id=survey_id)
     # Make some initial calls to retrieve some data we'll need
@@ -168,15 +171,29 @@ def view_reporting_unit_survey(ru_ref, survey_id):
         flash("Maximum number of cases cannot be 0.  Using default maximum instead", "error")
         max_number_of_cases = app.config["MAX_CASES_RETRIEVED_PER_SURVEY"]
 
-    case_group_cases = case_controller.get_case_group_cases_by_party_and_survey_id(
-        reporting_unit["id"], survey_id, max_number_of_cases
+    # None of these depend on each other, so they're made at the same time
+    ru_survey_details = fan_out(
+        {
+            "case_group_cases": partial(
+                case_controller.get_case_group_cases_by_party_and_survey_id,
+                reporting_unit["id"],
+                survey_id,
+                max_number_of_cases,
+            ),
+            "enrolled_respondents": partial(
+                party_controller.get_respondents_by_survey_and_business_id, survey_id, reporting_unit["id"]
+            ),
+            "attributes": partial(party_controller.get_business_attributes_by_party_id, reporting_unit["id"]),
+            "survey_details": partial(get_survey_by_id, survey_id),
+        }
     )
+    case_group_cases = ru_survey_details["case_group_cases"]
     collection_exercise_ids = {ru["collectionExerciseId"] for ru in case_group_cases}
-    collection_exercises = [get_collection_exercise_by_id(ce_id) for ce_id in collection_exercise_ids]
+    collection_exercises = get_collection_exercises_by_ids(collection_exercise_ids)
     live_collection_exercises = [
         ce for ce in collection_exercises if parse_date(ce["scheduledStartDateTime"]) < datetime.now(timezone.utc)
     ]
-    enrolled_respondents = party_controller.get_respondents_by_survey_and_business_id(survey_id, reporting_unit["id"])
+    enrolled_respondents = ru_survey_details["enrolled_respondents"]
 
     survey_collection_exercises = sorted(
         [collection_exercise for collection_exercise in live_collection_exercises],
@@ -184,13 +201,13 @@ def view_reporting_unit_survey(ru_ref, survey_id):
         reverse=True,
     )
 
-    attributes = party_controller.get_business_attributes_by_party_id(reporting_unit["id"])
+    attributes = ru_survey_details["attributes"]
     collection_exercises_with_details = [
         add_collection_exercise_details(ce, attributes[ce["id"]], case_group_cases)
         for ce in survey_collection_exercises
     ]
 
-    survey_details = get_survey_by_id(survey_id)
+    survey_details = ru_survey_details["survey_details"]
     survey_details["display_name"] = f"{survey_details['surveyRef']} {survey_details['shortName']}"
 
     # If there's an active IAC on the newest case, return it to be displayed
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+from functools import partial
 
 from dateutil.tz import gettz
 from flask import Blueprint
@@ -9,6 +10,7 @@ from flask_login import login_required
 from iso8601 import ParseError, parse_date
 from structlog import wrap_logger
 
+from response_operations_ui.common.fan_out import fan_out
 from response_operations_ui.common.pagination_processor import pagination_processor
 from response_operations_ui.common.respondent_utils import filter_respondents
 from response_operations_ui.common.uaa import verify_permission
@@ -138,9 +140,21 @@ def send_pending_surveys_email(respondent_id, batch_number):
 @respondent_bp.route("/respondent-details/<respondent_id>", methods=["GET"])
 @login_required
 def respondent_details(respondent_id):
-    respondent = party_controller.get_respondent_by_party_id(respondent_id)
-    enrolments = party_controller.get_respondent_enrolments(respondent)
-    account = respondent_controllers.find_respondent_account_by_username(respondent["emailAddress"])
+    respondent_and_pending_surveys = fan_out(
+        {
+            "respondent": partial(party_controller.get_respondent_by_party_id, respondent_id),
+            "pending_surveys": partial(party_controller.get_pending_surveys_by_party_id, respondent_id),
+        }
+    )
+    respondent = respondent_and_pending_surveys["respondent"]
+    enrolments_and_account = fan_out(
+        {
+            "enrolments": partial(party_controller.get_respondent_enrolments, respondent),
+            "account": partial(respondent_controllers.find_respondent_account_by_username, respondent["emailAddress"]),
+        }
+    )
+    enrolments = enrolments_and_account["enrolments"]
+    account = enrolments_and_account["account"]
     breadcrumbs = [{"text": "Respondents", "url": "/respondents"}, {"text": f"{respondent['emailAddress']}"}, {}]
 
     respondent["status"] = respondent["status"].title()
@@ -154,7 +168,7 @@ def respondent_details(respondent_id):
         flash(info, "information")
 
     # Share Surveys and Pending Surveys information collection section
-    pending_surveys = party_controller.get_pending_surveys_by_party_id(respondent_id)
+    pending_surveys = respondent_and_pending_surveys["pending_surveys"]
     pending_transfer_surveys = []
     pending_share_surveys = []
     for pending_survey in pending_surveys:
@@ -47,6 +47,7 @@ def sign_in():
         else:
             # store the token in the session (it's server side and stored in redis)
             session["token"] = access_token
+            token_decoder.remember_access_token_claims(access_token, token)
             session["username"] = username
             session["user_id"] = user_id
             user = User(user_id, username)
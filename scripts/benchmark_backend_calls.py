@@ -0,0 +1,210 @@
+#!/usr/bin/python
+"""
+Compares the time the busiest pages take to render when their backend calls are made one after another against when
+they're fanned out.  Each page is requested through the Flask test client, so it's the real view that's timed, with
+every backend replaced by a stub that waits --latency seconds before replying with data from tests/test_data.  The
+numbers show how much of that waiting the fan out hides rather than how fast the real services are.
+
+A page that doesn't render is reported rather than timed, as it's no longer making the calls it's stubbed for.
+"""
+
+import argparse
+import json
+import logging
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import jwt
+import responses
+
+from flask_session import Session
+from response_operations_ui import create_app
+
+test_data = Path(__file__).resolve().parent.parent / "tests" / "test_data"
+
+
+def from_test_data(path):
+    with open(test_data / path) as fp:
+        return json.load(fp)
+
+
+ru_ref = "50012345678"
+party_id = "b3ba864b-7cbc-4f44-84fe-88dc018a1a4c"
+survey_id = "cb0711c3-0ac8-41d3-ae0e-567e5ea1ef87"
+ce_id = "14fb3e68-4dca-46db-bf49-04b84e07e77c"
+ce_id_2 = "9af403f8-5fc5-43b1-9fca-afbd9c65da5c"
+case_group_id = "612f5c34-7e11-4740-8e24-cb321a86a917"
+case_id = "10b04906-f478-47f9-a985-783400dd8482"
+sample_summary_id = "1a11543f-eb19-41f5-825f-e41aca15e724"
+
+user = {
+    "id": "test-id",
+    "groups": [
+        {"display": permission}
+        for permission in ("surveys.edit", "reportingunits.edit", "messages.edit", "users.admin")
+    ],
+}
+
+# Each page's path and, by a regex matched against the url of each backend call it makes, what's replied with
+PAGES = {
+    "collection exercise": (
+        "/surveys/BLOCKS/201801",
+        {
+            r"/surveys/shortname/BLOCKS$": from_test_data("survey/single_survey_eq.json"),
+            rf"/collectionexercises/survey/{survey_id}$": from_test_data(
+                "collection_exercise/collection_exercise_list.json"
+            ),
+            rf"/collectionexercises/link/{ce_id}$": [sample_summary_id],
+            rf"/samples/samplesummary/{sample_summary_id}$": {
+                "id": sample_summary_id,
+                "state": "ACTIVE",
+                "ingestDateTime": "2018-03-14T14:29:51.325Z",
+            },
+            rf"/collectionexercises/{ce_id}/events$": from_test_data("collection_exercise/ce_events_by_id.json"),
+            r"/collectioninstrument\?": [],
+        },
+    ),
+    "reporting unit survey": (
+        f"/reporting-units/{ru_ref}/surveys/{survey_id}",
+        {
+            rf"/businesses/ref/{ru_ref}$": from_test_data("party/business_reporting_unit.json"),
+            rf"/casegroups/partyid/{party_id}/surveyid/{survey_id}\?": [
+                {
+                    "collectionExerciseId": ce_id,
+                    "caseGroupStatus": "NOTSTARTED",
+                    "caseId": case_id,
+                    "createdDateTime": "2018-02-13T15:45:13.328Z",
+                    "iac": "jkbvyklkwj88",
+                },
+                {
+                    "collectionExerciseId": ce_id_2,
+                    "caseGroupStatus": "NOTSTARTED",
+                    "caseId": "90bb2c1c-a04f-48c7-b008-c92450b3d164",
+                    "createdDateTime": "2018-02-13T15:45:12.219Z",
+                    "iac": "ljbgg3kgstr4",
+                },
+            ],
+            rf"/respondents/survey_id/{survey_id}/business_id/{party_id}$": from_test_data(
+                "party/enrolled_respondents.json"
+            ),
+            rf"/businesses/id/{party_id}/attributes": from_test_data("party/business_attributes.json"),
+            rf"/surveys/{survey_id}$": from_test_data("survey/single_survey.json"),
+            rf"/collectionexercises/{ce_id}$": from_test_data("collection_exercise/collection_exercise.json"),
+            rf"/collectionexercises/{ce_id_2}$": from_test_data("collection_exercise/collection_exercise_2.json"),
+            r"/iacs/\w+$": from_test_data("iac/iac.json"),
+        },
+    ),
+    "messages inbox": (
+        "/messages/ASHE",
+        {
+            r"/surveys/surveytype/Business$": from_test_data("survey/survey_list.json"),
+            r"/surveys/shortname/ASHE$": from_test_data("survey/ashe_response.json")["survey"],
+            r"/messages/count\?": {"total": 1},
+            r"/threads\?": from_test_data("message/threads.json"),
+        },
+    ),
+    "response status": (
+        f"/case/{ru_ref}/response-status?survey=BLOCKS&period=201801",
+        {
+            r"/surveys/shortname/BLOCKS$": from_test_data("survey/single_survey.json"),
+            rf"/businesses/ref/{ru_ref}$": from_test_data("party/get_business_by_ru_ref.json"),
+            rf"/collectionexercises/survey/{survey_id}$": from_test_data(
+                "collection_exercise/collection_exercise_list.json"
+            ),
+            rf"/casegroups/transitions/{ce_id}/{ru_ref}$": {"EQ_LAUNCH": "INPROGRESS"},
+            rf"/casegroups/partyid/{party_id}$": from_test_data("case/case_groups_list.json"),
+            rf"/cases/casegroupid/{case_group_id}$": [from_test_data("case/case.json")],
+            rf"/cases/{case_id}/events$": from_test_data("case/case_events.json"),
+        },
+    ),
+}
+
+
+class PageError(Exception):
+    pass
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark pages with their backend calls made one after another against fanned out",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each stubbed backend call takes")
+    parser.add_argument("--runs", type=int, default=20, help="Number of times each page is requested")
+    parser.add_argument("--workers", type=int, default=8, help="FAN_OUT_MAX_WORKERS for the fanned out runs")
+    return parser.parse_args()
+
+
+def stub_backend(routes, latency):
+    routes = [(re.compile(pattern), json.dumps(payload)) for pattern, payload in routes.items()]
+
+    def reply(request):
+        time.sleep(latency)
+        for pattern, body in routes:
+            if pattern.search(request.url):
+                return 200, {}, body
+        return 404, {}, json.dumps({"error": "Not stubbed"})
+
+    rsps = responses.RequestsMock(assert_all_requests_are_fired=False)
+    for method in (responses.GET, responses.POST, responses.PUT):
+        rsps.add_callback(method, re.compile(r"http://.*"), callback=reply, content_type="application/json")
+    return rsps
+
+
+def sign_in(app, client):
+    access_token = jwt.encode(
+        {"user_id": "test-id", "aud": "response_operations"}, app.config["UAA_PRIVATE_KEY"], algorithm="RS256"
+    )
+    with stub_backend({r"/oauth/token$": {"access_token": access_token}, r"/Users/test-id$": user}, latency=0):
+        client.post("/sign-in", data={"username": "user", "password": "pass"})
+
+
+def time_page(client, path, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise PageError(response.status_code)
+    return statistics.median(timings)
+
+
+def main():
+    args = parse_args()
+    logging.disable(logging.CRITICAL)
+    app = create_app("TestingConfig")
+    # The availability message is read from SESSION_REDIS, which is a real redis unless it's swapped out
+    app.config["SESSION_REDIS"] = app.redis
+    session_dir = tempfile.TemporaryDirectory()
+    app.config["SESSION_FILE_DIR"] = session_dir.name
+    Session(app)
+    client = app.test_client()
+    sign_in(app, client)
+
+    failed = False
+    print(f"{'page':<40}{'sync (ms)':>12}{'fan out (ms)':>15}{'speedup':>10}")
+    for name, (path, routes) in PAGES.items():
+        try:
+            # Permissions are refreshed from uaa once they're due, whichever page that happens on
+            with stub_backend({**routes, r"/Users/test-id$": user}, args.latency):
+                app.config["FAN_OUT_MAX_WORKERS"] = 1
+                sync = time_page(client, path, args.runs)
+                app.config["FAN_OUT_MAX_WORKERS"] = args.workers
+                fanned_out = time_page(client, path, args.runs)
+        except PageError as e:
+            failed = True
+            print(f"{name:<40}returned {e}, its stubs need updating to match the calls it makes")
+            continue
+        print(f"{name:<40}{sync * 1000:>12.1f}{fanned_out * 1000:>15.1f}{sync / fanned_out:>9.1f}x")
+
+    session_dir.cleanup()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/python
+"""
+Compares the cache codecs (see response_operations_ui/common/cache_codec.py) on the payloads that are cached, built
+from tests/test_data.  List payloads are repeated --scale times, as the test data only has a handful of surveys and
+collection exercises in it where the real services have many more.  For each codec it shows how long encoding and
+decoding take and how many bytes end up in redis.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from response_operations_ui import create_app
+from response_operations_ui.common.cache_codec import (
+    COMPACT_JSON,
+    LEGACY_JSON,
+    ZLIB_JSON,
+    decode,
+    encode,
+)
+
+test_data = Path(__file__).resolve().parent.parent / "tests" / "test_data"
+
+PAYLOADS = {
+    "survey list": "survey/survey_list.json",
+    "single survey": "survey/survey.json",
+    "cir metadata": "cir/cir_metadata.json",
+    "collection exercises by survey": "collection_exercise/collection_exercise_list.json",
+    "business": "party/business_party.json",
+}
+
+CODEC_NAMES = {LEGACY_JSON: "json", COMPACT_JSON: "compact json", ZLIB_JSON: "zlib json"}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the cache codecs on the payloads that are cached",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--runs", type=int, default=2000, help="Number of times each payload is encoded and decoded")
+    parser.add_argument("--scale", type=int, default=20, help="Number of times list payloads are repeated")
+    return parser.parse_args()
+
+
+def load_payloads(scale):
+    payloads = {}
+    for name, path in PAYLOADS.items():
+        with open(test_data / path) as fp:
+            payload = json.load(fp)
+        payloads[name] = payload * scale if isinstance(payload, list) else payload
+    return payloads
+
+
+def time_call(call, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    args = parse_args()
+    logging.disable(logging.CRITICAL)
+    app = create_app("TestingConfig")
+    payloads = load_payloads(args.scale)
+
+    print(f"{'payload':<34}{'codec':<14}{'bytes':>9}{'saved':>8}{'encode (us)':>13}{'decode (us)':>13}")
+    with app.app_context():
+        for name, payload in payloads.items():
+            legacy_size = None
+            for version, codec_name in CODEC_NAMES.items():
+                app.config["CACHE_CODEC_VERSION"] = version
+                data = encode(payload)
+                legacy_size = legacy_size or len(data)
+                encode_time = time_call(lambda: encode(payload), args.runs)
+                decode_time = time_call(lambda: decode(data), args.runs)
+                saved = 1 - len(data) / legacy_size
+                print(
+                    f"{name:<34}{codec_name:<14}{len(data):>9}{saved:>8.0%}"
+                    f"{encode_time * 1e6:>13.1f}{decode_time * 1e6:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
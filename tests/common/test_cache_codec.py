@@ -0,0 +1,63 @@
+import json
+import os
+import unittest
+
+from response_operations_ui import create_app
+from response_operations_ui.common.cache_codec import (
+    CODECS,
+    COMPACT_JSON,
+    ZLIB_JSON,
+    Codec,
+    decode,
+    encode,
+    register_codec,
+)
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+
+with open(f"{project_root}/test_data/survey/survey_list.json") as json_data:
+    survey_list = json.load(json_data)
+
+
+class TestCacheCodec(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.config["CACHE_CODEC_VERSION"] = ZLIB_JSON
+
+    def test_small_values_written_uncompressed(self):
+        with self.app.app_context():
+            data = encode(survey_list[0])
+        self.assertEqual(data[0], COMPACT_JSON)
+        self.assertEqual(decode(data), survey_list[0])
+
+    def test_large_values_compressed(self):
+        with self.app.app_context():
+            data = encode(survey_list)
+        self.assertEqual(data[0], ZLIB_JSON)
+        self.assertLess(len(data), len(json.dumps(survey_list)))
+        self.assertEqual(decode(data), survey_list)
+
+    def test_legacy_json_written_and_read_by_default(self):
+        self.app = create_app("TestingConfig")
+        with self.app.app_context():
+            data = encode(survey_list)
+        self.assertEqual(json.loads(data), survey_list)
+        self.assertEqual(decode(data), survey_list)
+        self.assertEqual(decode(json.dumps(survey_list)), survey_list)
+
+    def test_registered_codec_written_and_read(self):
+        register_codec(3, Codec(lambda value: repr(value).encode(), lambda data: eval(data)))
+        self.addCleanup(CODECS.pop, 3)
+        self.app.config["CACHE_CODEC_VERSION"] = 3
+        with self.app.app_context():
+            data = encode({"a": [1, 2]})
+        self.assertEqual(data, b"\x03{'a': [1, 2]}")
+        self.assertEqual(decode(data), {"a": [1, 2]})
+
+    def test_unknown_version_not_read(self):
+        with self.assertRaises(ValueError):
+            decode(b"\x1f{}")
+
+    def test_version_must_not_look_like_json(self):
+        with self.assertRaises(ValueError):
+            register_codec(ord("{"), CODECS[COMPACT_JSON])
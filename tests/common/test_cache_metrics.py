@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+
+import fakeredis
+from redis.exceptions import RedisError
+
+from response_operations_ui import create_app
+from response_operations_ui.common.cache_metrics import (
+    ERROR,
+    HIT,
+    MISS,
+    get_cache_metrics,
+)
+from response_operations_ui.common.controller_cache import cached, get_many
+
+
+class TestCacheMetrics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["CACHE_METRICS_ENABLED"] = True
+
+    def test_hits_misses_and_refreshes_are_counted(self):
+        @cached("survey", 60)
+        def get_survey(survey_id):
+            return {"id": survey_id}
+
+        with self.app.app_context():
+            get_survey("1")
+            get_survey("1")
+            get_survey("1")
+            self.app.cache_metrics.flush(force=True)
+            metrics = get_cache_metrics(self.app.redis)["survey"]
+
+        self.assertEqual(metrics[HIT], 2)
+        self.assertEqual(metrics[MISS], 1)
+        self.assertEqual(metrics[ERROR], 0)
+        self.assertEqual(metrics["hit_ratio"], 0.667)
+        self.assertEqual(metrics["refreshes"], 1)
+        self.assertEqual(sum(metrics["latency_ms"].values()), 3)
+        self.assertEqual(sum(metrics["refresh_ms"].values()), 1)
+        self.assertGreater(metrics["bytes"], 0)
+
+    def test_get_many_counts_each_key(self):
+        with self.app.app_context():
+            self.app.redis.set("response-operations-ui:business:1", '{"id": "1"}')
+            get_many("business", ["1", "2", "3"])
+            self.app.cache_metrics.flush(force=True)
+            metrics = get_cache_metrics(self.app.redis)["business"]
+
+        self.assertEqual(metrics[HIT], 1)
+        self.assertEqual(metrics[MISS], 2)
+        self.assertEqual(metrics["bytes"], len('{"id": "1"}'))
+
+    def test_errors_are_counted(self):
+        with self.app.app_context():
+            with patch.object(self.app.redis, "mget", side_effect=RedisError):
+                get_many("business", ["1", "2"])
+            self.app.cache_metrics.flush(force=True)
+            metrics = get_cache_metrics(self.app.redis)["business"]
+
+        self.assertEqual(metrics[ERROR], 2)
+        self.assertEqual(metrics["hit_ratio"], 0)
+
+    def test_counts_are_only_flushed_once_the_interval_has_passed(self):
+        with self.app.app_context():
+            get_many("business", ["1"])
+            self.assertEqual(get_cache_metrics(self.app.redis), {})
+
+            self.app.config["CACHE_METRICS_FLUSH_INTERVAL"] = 0
+            get_many("business", ["1"])
+            self.assertEqual(get_cache_metrics(self.app.redis)["business"][MISS], 2)
+
+    def test_nothing_is_counted_when_disabled(self):
+        self.app.config["CACHE_METRICS_ENABLED"] = False
+        with self.app.app_context():
+            get_many("business", ["1"])
+            self.app.cache_metrics.flush(force=True)
+
+            self.assertEqual(get_cache_metrics(self.app.redis), {})
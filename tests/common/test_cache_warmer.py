@@ -0,0 +1,79 @@
+import json
+import os
+import re
+import unittest
+
+import fakeredis
+import responses
+
+from config import TestingConfig
+from response_operations_ui import create_app
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+
+with open(f"{project_root}/test_data/survey/survey_list.json") as json_data:
+    survey_list = json.load(json_data)[:2]
+
+bres_id = survey_list[0]["id"]
+ce_id = "4a084bc0-130f-4aee-ae48-1a9f9e50178f"
+collection_exercises = [
+    {"id": ce_id, "surveyId": bres_id, "state": "LIVE", "scheduledStartDateTime": "2020-01-01T00:00:00.000Z"}
+]
+
+
+class TestCacheWarmer(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"] = 60
+
+    @responses.activate
+    def test_warm_command_loads_each_survey(self):
+        responses.add(responses.GET, f"{TestingConfig.SURVEY_URL}/surveys/surveytype/Business", json=survey_list)
+        for survey in survey_list:
+            responses.add(
+                responses.GET, f"{TestingConfig.SURVEY_URL}/surveys/shortname/{survey['shortName']}", json=survey
+            )
+        responses.add(
+            responses.GET,
+            f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises/survey/{bres_id}",
+            json=collection_exercises,
+        )
+        responses.add(
+            responses.GET,
+            re.compile(f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises/survey/.*"),
+            status=500,
+        )
+        responses.add(
+            responses.GET, f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises/{ce_id}/events", json=[]
+        )
+
+        result = self.app.test_cli_runner().invoke(args=["cache", "warm", "--workers", "2"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Loaded 1 survey list", result.output)
+        self.assertIn("Loaded 2 survey", result.output)
+        self.assertIn("Loaded 1 collection exercises", result.output)
+        self.assertIn("Failed to load 1 collection exercises", result.output)
+        self.assertIn("Loaded 1 collection exercise events", result.output)
+        self.assertTrue(self.app.redis.exists("response-operations-ui:survey-list"))
+        self.assertTrue(self.app.redis.exists(f"response-operations-ui:collection-exercises-by-survey:{bres_id}"))
+        self.assertTrue(self.app.redis.exists(f"response-operations-ui:collection-exercise-events:{ce_id}"))
+
+    @responses.activate
+    def test_warm_loads_surveys_by_their_own_short_name(self):
+        survey = {**survey_list[0], "shortName": "Sand&Gravel"}
+        responses.add(responses.GET, f"{TestingConfig.SURVEY_URL}/surveys/surveytype/Business", json=[survey])
+        responses.add(responses.GET, f"{TestingConfig.SURVEY_URL}/surveys/shortname/Sand&Gravel", json=survey)
+        responses.add(
+            responses.GET,
+            f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises/survey/{bres_id}",
+            json=[],
+        )
+
+        result = self.app.test_cli_runner().invoke(args=["cache", "warm"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Loaded 1 survey\n", result.output)
+        self.assertNotIn("Failed", result.output)
+        self.assertTrue(self.app.redis.exists("response-operations-ui:survey:Sand&Gravel"))
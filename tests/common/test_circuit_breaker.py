@@ -0,0 +1,185 @@
+import time
+import unittest
+from unittest.mock import patch
+
+import fakeredis
+import requests
+import responses
+from redis import RedisError
+
+from response_operations_ui import create_app
+from response_operations_ui.common.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+from response_operations_ui.common.http_session import get_session
+from response_operations_ui.exceptions.error_codes import ErrorCode
+from response_operations_ui.exceptions.exceptions import ExternalApiError
+
+party_url = "http://localhost:8081/party-api/v1/businesses/ref/49900000001"
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["CIRCUIT_BREAKER_ENABLED"] = True
+        self.app.config["CIRCUIT_BREAKER_MIN_CALLS"] = 4
+        self.app.config["CIRCUIT_BREAKER_FAILURE_RATE"] = 0.5
+        self.app.config["CIRCUIT_BREAKER_SLOW_CALL_SECONDS"] = 1
+        # Every call reads and writes redis, as though each were made by a different worker
+        self.app.config["CIRCUIT_BREAKER_SYNC_SECONDS"] = 0
+
+    def test_circuit_opens_on_failure_rate(self):
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            breaker.after_call(True, 0.1, probe=False)
+            breaker.after_call(False, 0.1, probe=False)
+            breaker.after_call(True, 0.1, probe=False)
+            self.assertEqual(breaker.state(), CLOSED)
+            breaker.after_call(False, 0.1, probe=False)
+            self.assertEqual(breaker.state(), OPEN)
+
+    def test_circuit_opens_on_slow_calls(self):
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            for _ in range(4):
+                breaker.after_call(True, 2, probe=False)
+            self.assertEqual(breaker.state(), OPEN)
+
+    def test_open_circuit_fails_fast(self):
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            breaker._open()
+            with self.assertRaises(ExternalApiError) as context:
+                breaker.before_call()
+        self.assertEqual(context.exception.error_code, ErrorCode.API_CIRCUIT_OPEN)
+        self.assertEqual(context.exception.target_service, "party")
+
+    def test_half_open_allows_single_probe(self):
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            # Opened by another worker, and the time it's open for has passed
+            CircuitBreaker("party", self.app.config)._open()
+            self.app.redis.delete(breaker.open_key)
+            self.assertEqual(breaker.state(), HALF_OPEN)
+            self.assertTrue(breaker.before_call())
+            with self.assertRaises(ExternalApiError):
+                breaker.before_call()
+
+    def test_successful_probe_closes_circuit(self):
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            # Opened by another worker, and the time it's open for has passed
+            CircuitBreaker("party", self.app.config)._open()
+            self.app.redis.delete(breaker.open_key)
+            breaker.after_call(True, 0.1, probe=breaker.before_call())
+            self.assertEqual(breaker.state(), CLOSED)
+            self.assertFalse(breaker.before_call())
+
+    def test_failed_probe_reopens_circuit(self):
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            # Opened by another worker, and the time it's open for has passed
+            CircuitBreaker("party", self.app.config)._open()
+            self.app.redis.delete(breaker.open_key)
+            breaker.after_call(False, 0.1, probe=breaker.before_call())
+            self.assertEqual(breaker.state(), OPEN)
+
+    def test_redis_error_lets_call_through(self):
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            with patch.object(self.app.redis, "mget", side_effect=RedisError):
+                self.assertFalse(breaker.before_call())
+
+    def test_state_is_read_from_redis_once_a_sync_interval(self):
+        self.app.config["CIRCUIT_BREAKER_SYNC_SECONDS"] = 60
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            with patch.object(self.app.redis, "mget", wraps=self.app.redis.mget) as mget:
+                for _ in range(5):
+                    self.assertFalse(breaker.before_call())
+            self.assertEqual(mget.call_count, 1)
+
+    def test_open_circuit_is_rejected_without_reading_redis(self):
+        self.app.config["CIRCUIT_BREAKER_SYNC_SECONDS"] = 0
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            breaker._open()
+            with patch.object(self.app.redis, "mget", side_effect=AssertionError("redis read")):
+                with self.assertRaises(ExternalApiError):
+                    breaker.before_call()
+
+    def test_successful_calls_are_written_once_a_sync_interval(self):
+        self.app.config["CIRCUIT_BREAKER_SYNC_SECONDS"] = 60
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            with patch.object(self.app.redis, "pipeline", wraps=self.app.redis.pipeline) as pipeline:
+                for _ in range(5):
+                    breaker.after_call(True, 0.1, probe=False)
+            self.assertEqual(pipeline.call_count, 1)
+
+    def test_failed_call_writes_pending_calls_and_opens_circuit(self):
+        self.app.config["CIRCUIT_BREAKER_SYNC_SECONDS"] = 60
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            # The first call is written straight away, the next two are held in the worker
+            for _ in range(3):
+                breaker.after_call(True, 0.1, probe=False)
+            breaker.after_call(False, 0.1, probe=False)
+            self.assertEqual(breaker.state(), CLOSED)
+            breaker.after_call(False, 0.1, probe=False)
+            self.assertEqual(breaker.state(), CLOSED)
+            breaker.after_call(False, 0.1, probe=False)
+            self.assertEqual(breaker.state(), OPEN)
+
+    def test_circuit_opened_by_another_worker_is_seen_after_a_sync_interval(self):
+        self.app.config["CIRCUIT_BREAKER_SYNC_SECONDS"] = 60
+        with self.app.app_context():
+            breaker = CircuitBreaker("party", self.app.config)
+            self.assertFalse(breaker.before_call())
+            CircuitBreaker("party", self.app.config)._open()
+            self.assertFalse(breaker.before_call())
+
+            with patch(
+                "response_operations_ui.common.circuit_breaker.time.monotonic", return_value=time.monotonic() + 61
+            ):
+                with self.assertRaises(ExternalApiError):
+                    breaker.before_call()
+
+    @responses.activate
+    def test_session_trips_breaker_on_server_errors(self):
+        responses.add(responses.GET, party_url, status=500)
+        with self.app.app_context():
+            for _ in range(4):
+                self.assertEqual(get_session("PARTY_URL").get(party_url).status_code, 500)
+            with self.assertRaises(ExternalApiError) as context:
+                get_session("PARTY_URL").get(party_url)
+        self.assertEqual(context.exception.error_code, ErrorCode.API_CIRCUIT_OPEN)
+        self.assertEqual(len(responses.calls), 4)
+
+    @patch("requests.Session.request", side_effect=requests.ConnectionError)
+    def test_session_counts_connection_errors(self, _):
+        with self.app.app_context():
+            for _ in range(4):
+                with self.assertRaises(requests.ConnectionError):
+                    get_session("CASE_URL").get("http://localhost:8171/cases/123")
+            self.assertEqual(CircuitBreaker("case", self.app.config).state(), OPEN)
+
+    @responses.activate
+    def test_client_errors_do_not_trip_breaker(self):
+        responses.add(responses.GET, party_url, status=404)
+        with self.app.app_context():
+            for _ in range(5):
+                get_session("PARTY_URL").get(party_url)
+            self.assertEqual(CircuitBreaker("party", self.app.config).state(), CLOSED)
+
+    def test_circuit_breaker_states(self):
+        with self.app.app_context():
+            CircuitBreaker("secure-message", self.app.config)._open()
+            states = self.app.http_sessions.get_circuit_breaker_states(self.app.redis)
+        self.assertEqual(states["secure-message"], OPEN)
+        self.assertEqual(states["party"], CLOSED)
+        self.assertNotIn("response-operations-ui", states)
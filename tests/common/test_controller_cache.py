@@ -0,0 +1,147 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import responses
+from redis import RedisError
+
+from response_operations_ui import create_app
+from response_operations_ui.common.cache_codec import decode
+from response_operations_ui.common.controller_cache import (
+    cached,
+    get_many,
+    invalidate,
+    invalidates,
+    set_many,
+)
+from response_operations_ui.common.redis_cache import RedisCache
+from response_operations_ui.controllers.collection_exercise_controllers import (
+    update_collection_exercise_period,
+)
+from response_operations_ui.controllers.survey_controllers import (
+    update_survey_details,
+)
+
+short_name = "MBS"
+survey_ref = "139"
+survey = {"id": "cb0711c3-0ac8-41d3-ae0e-567e5ea1ef87", "shortName": short_name, "surveyRef": survey_ref}
+survey_key = f"response-operations-ui:survey:{short_name}"
+collection_exercise_id = "14fb3e68-4dca-46db-bf49-04b84e07e77c"
+
+
+class TestControllerCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+
+    def test_read_cached_until_ttl(self):
+        fetch = MagicMock(return_value=survey)
+        read = cached("survey", 60)(lambda name: fetch(name))
+        with self.app.app_context():
+            self.assertEqual(read(short_name), survey)
+            self.assertEqual(read(short_name), survey)
+        fetch.assert_called_once_with(short_name)
+        self.assertEqual(self.app.redis.ttl(survey_key), 60)
+
+    def test_key_built_from_arguments(self):
+        read = cached("cir", 60, key=lambda ref, formtype: f"{ref}:{formtype}")(lambda ref, formtype: [])
+        with self.app.app_context():
+            read(survey_ref, formtype="0001")
+        self.assertEqual(decode(self.app.redis.get(f"response-operations-ui:cir:{survey_ref}:0001")), [])
+
+    def test_ttl_required(self):
+        with self.assertRaises(ValueError):
+            cached("survey", 0)
+
+    def test_redis_error_reads_from_service(self):
+        read = cached("survey", 60)(lambda name: survey)
+        with self.app.app_context():
+            with patch.object(self.app.redis, "get", side_effect=RedisError):
+                with self.assertLogs(level="ERROR") as logs:
+                    self.assertEqual(read(short_name), survey)
+        self.assertIn("Error getting value from cache, please investigate", logs.output[0])
+
+    def test_get_many_and_set_many(self):
+        with self.app.app_context():
+            set_many("survey", {"MBS": survey, "QBS": {}}, lambda result: 60 if result else 30)
+            with patch.object(self.app.redis, "get") as get:
+                self.assertEqual(get_many("survey", ["QBS", "BRES", "MBS"]), {"QBS": {}, "MBS": survey})
+            get.assert_not_called()
+        self.assertEqual(self.app.redis.ttl(survey_key), 60)
+        self.assertEqual(self.app.redis.ttl("response-operations-ui:survey:QBS"), 30)
+
+    def test_get_many_redis_error_reads_nothing(self):
+        with self.app.app_context():
+            set_many("survey", {"MBS": survey}, 60)
+            with patch.object(self.app.redis, "mget", side_effect=RedisError):
+                self.assertEqual(get_many("survey", ["MBS"]), {})
+
+    def test_invalidates_key(self):
+        self.app.redis.set(survey_key, "{}")
+        self.app.redis.set("response-operations-ui:survey:QBS", "{}")
+        write = invalidates("survey", key=lambda name: name)(lambda name: None)
+        with self.app.app_context():
+            write(short_name)
+        self.assertIsNone(self.app.redis.get(survey_key))
+        self.assertIsNotNone(self.app.redis.get("response-operations-ui:survey:QBS"))
+
+    def test_invalidates_namespace(self):
+        self.app.redis.hset("response-operations-ui:survey-list", "1", "{}")
+        with self.app.app_context():
+            set_many("survey", {short_name: survey, "QBS": survey}, 60)
+            with patch.object(self.app.redis, "scan_iter") as scan_iter:
+                invalidate("survey")
+        scan_iter.assert_not_called()
+        self.assertEqual(self.app.redis.keys("response-operations-ui:survey:*"), [])
+        self.assertEqual(self.app.redis.keys("response-operations-ui:cache-keys:survey"), [])
+        self.assertEqual(self.app.redis.hgetall("response-operations-ui:survey-list"), {b"1": b"{}"})
+
+    def test_expired_keys_dropped_from_namespace_keys(self):
+        with self.app.app_context():
+            set_many("survey", {"QBS": survey}, 60)
+            with patch("response_operations_ui.common.controller_cache.time.time", return_value=time.time() + 61):
+                set_many("survey", {short_name: survey}, 60)
+        self.assertEqual(
+            self.app.redis.zrange("response-operations-ui:cache-keys:survey", 0, -1), [survey_key.encode()]
+        )
+
+    def test_invalidating_survey_list_clears_survey_index_straight_away(self):
+        with self.app.app_context():
+            with patch.object(self.app.survey_index, "clear") as clear:
+                invalidate("survey")
+                clear.assert_not_called()
+                invalidate("survey-list")
+                clear.assert_called_once()
+
+    def test_invalidates_when_write_fails(self):
+        self.app.redis.set(survey_key, "{}")
+
+        def write(name):
+            raise ValueError
+
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                invalidates("survey", key=lambda name: name)(write)(short_name)
+        self.assertIsNone(self.app.redis.get(survey_key))
+
+    @responses.activate
+    def test_survey_update_seen_on_next_read(self):
+        updated_survey = {**survey, "longName": "Updated"}
+        responses.add(responses.GET, f"http://localhost:8080/surveys/shortname/{short_name}", json=survey)
+        responses.add(responses.GET, f"http://localhost:8080/surveys/shortname/{short_name}", json=updated_survey)
+        responses.add(responses.PUT, f"http://localhost:8080/surveys/ref/{survey_ref}")
+        with self.app.app_context():
+            self.assertEqual(RedisCache().get_survey_by_shortname(short_name), survey)
+            self.assertEqual(RedisCache().get_survey_by_shortname(short_name), survey)
+            update_survey_details(survey_ref, short_name, "Updated", "EQ")
+            self.assertEqual(RedisCache().get_survey_by_shortname(short_name), updated_survey)
+
+    @responses.activate
+    def test_collection_exercise_period_update_invalidates_cached_collection_exercise(self):
+        ce_key = f"response-operations-ui:collection-exercise:{collection_exercise_id}"
+        self.app.redis.set(ce_key, "{}")
+        responses.add(responses.PUT, f"http://localhost:8145/collectionexercises/{collection_exercise_id}/exerciseRef")
+        with self.app.app_context():
+            update_collection_exercise_period(collection_exercise_id, "202401")
+        self.assertIsNone(self.app.redis.get(ce_key))
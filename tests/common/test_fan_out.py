@@ -0,0 +1,104 @@
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from flask import g, request
+
+from response_operations_ui import create_app
+from response_operations_ui.common.deadline import start_deadline, time_remaining
+from response_operations_ui.common.fan_out import fan_out
+from response_operations_ui.exceptions.exceptions import ApiError
+
+
+class TestFanOut(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+
+    def test_fan_out_returns_results_by_name(self):
+        with self.app.app_context():
+            results = fan_out({"one": lambda: 1, "two": lambda: 2, "three": lambda: 3})
+        self.assertEqual(results, {"one": 1, "two": 2, "three": 3})
+
+    def test_fan_out_runs_calls_on_pool_threads(self):
+        with self.app.app_context():
+            results = fan_out({"one": threading.current_thread, "two": threading.current_thread})
+        for thread in results.values():
+            self.assertIsNot(thread, threading.current_thread())
+            self.assertTrue(thread.name.startswith("fan-out"))
+
+    def test_fan_out_single_call_runs_inline(self):
+        with self.app.app_context():
+            results = fan_out({"one": threading.current_thread})
+        self.assertIs(results["one"], threading.current_thread())
+
+    def test_fan_out_runs_inline_with_single_worker(self):
+        self.app.config["FAN_OUT_MAX_WORKERS"] = 1
+        with self.app.app_context():
+            results = fan_out({"one": threading.current_thread, "two": threading.current_thread})
+        self.assertEqual(list(results.values()), [threading.current_thread()] * 2)
+
+    def test_fan_out_reraises_exception(self):
+        def fail():
+            raise ApiError(MagicMock(url="http://localhost:8081/party-api/v1", status_code=500, text="failed"))
+
+        with self.app.app_context():
+            with self.assertRaises(ApiError) as context:
+                fan_out({"ok": lambda: 1, "fail": fail})
+        self.assertEqual(context.exception.message, "failed")
+
+    def test_fan_out_shares_g_and_deadline(self):
+        with self.app.app_context():
+            g.user_id = "abc"
+            start_deadline(5)
+            results = fan_out({"user_id": lambda: g.user_id, "time_remaining": time_remaining})
+        self.assertEqual(results["user_id"], "abc")
+        self.assertLessEqual(results["time_remaining"], 5)
+
+    def test_fan_out_has_request_context(self):
+        with self.app.test_request_context("/reporting-units/49900000001?survey=abc"):
+            results = fan_out({"path": lambda: request.path, "survey": lambda: request.args["survey"]})
+        self.assertEqual(results, {"path": "/reporting-units/49900000001", "survey": "abc"})
+
+    def test_nested_fan_out_uses_spare_pool_threads(self):
+        # Each inner call waits for the other three, so they only all finish if they're made at the same time
+        made_together = threading.Barrier(4, timeout=5)
+
+        def nested():
+            return fan_out({"one": made_together.wait, "two": made_together.wait})
+
+        with self.app.app_context():
+            results = fan_out({"first": nested, "second": nested})
+        self.assertEqual(len(results), 2)
+
+    def test_nested_fan_out_runs_calls_the_pool_hasnt_started_inline(self):
+        both_started = threading.Barrier(2, timeout=5)
+
+        def nested():
+            both_started.wait()
+            outer_thread = threading.current_thread()
+            inner = fan_out({"one": threading.current_thread, "two": threading.current_thread})
+            return any(thread is outer_thread for thread in inner.values())
+
+        # Every pool thread is busy with an outer call, so none are spare for the inner calls
+        with patch("response_operations_ui.common.fan_out._executor", ThreadPoolExecutor(max_workers=2)):
+            with patch("response_operations_ui.common.fan_out._executor_pid", os.getpid()):
+                with self.app.app_context():
+                    results = fan_out({"first": nested, "second": nested})
+        self.assertEqual(results, {"first": True, "second": True})
+
+    def test_nested_fan_out_reraises_exception(self):
+        def fail():
+            raise ApiError(MagicMock(url="http://localhost:8081/party-api/v1", status_code=500, text="failed"))
+
+        with self.app.app_context():
+            with self.assertRaises(ApiError):
+                fan_out({"ok": lambda: 1, "nested": lambda: fan_out({"ok": lambda: 1, "fail": fail})})
+
+    def test_fanned_out_calls_do_not_tear_down_the_request(self):
+        with patch("response_operations_ui.log_duplicates_eliminated") as log_duplicates_eliminated:
+            with self.app.test_request_context("/reporting-units/49900000001"):
+                fan_out({"one": lambda: 1, "two": lambda: 2})
+                log_duplicates_eliminated.assert_not_called()
+        log_duplicates_eliminated.assert_called_once()
@@ -0,0 +1,121 @@
+import unittest
+
+import fakeredis
+import responses
+from responses import matchers
+
+from response_operations_ui import create_app
+from response_operations_ui.common.http_cache import parse_cache_control
+from response_operations_ui.common.http_session import get_session
+
+survey_url = "http://localhost:8080/surveys/shortname/MBS"
+survey = {"id": "cb0711c3-0ac8-41d3-ae0e-567e5ea1ef87", "shortName": "MBS"}
+etag = '"abc123"'
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["HTTP_CACHE_ENABLED"] = True
+
+    @responses.activate
+    def test_not_modified_served_from_cache(self):
+        responses.add(responses.GET, survey_url, json=survey, headers={"ETag": etag})
+        responses.add(
+            responses.GET,
+            survey_url,
+            status=304,
+            headers={"ETag": etag},
+            match=[matchers.header_matcher({"If-None-Match": etag})],
+        )
+        with self.app.app_context():
+            get_session("SURVEY_URL").get(survey_url)
+            response = get_session("SURVEY_URL").get(survey_url)
+            stats = self.app.http_sessions.get_http_cache_stats(self.app.redis)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), survey)
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(stats["survey"]["misses"], 1)
+        self.assertEqual(stats["survey"]["revalidated"], 1)
+        self.assertEqual(stats["survey"]["hit_ratio"], 0.5)
+        self.assertEqual(stats["survey"]["bytes_saved"], len(responses.calls[0].response.content))
+
+    @responses.activate
+    def test_fresh_response_served_without_calling_service(self):
+        responses.add(responses.GET, survey_url, json=survey, headers={"Cache-Control": "max-age=60"})
+        with self.app.app_context():
+            get_session("SURVEY_URL").get(survey_url)
+            response = get_session("SURVEY_URL").get(survey_url)
+            stats = self.app.http_sessions.get_http_cache_stats(self.app.redis)
+
+        self.assertEqual(response.json(), survey)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(stats["survey"]["hits"], 1)
+
+    @responses.activate
+    def test_no_cache_always_revalidated(self):
+        responses.add(responses.GET, survey_url, json=survey, headers={"Cache-Control": "no-cache, max-age=60"})
+        with self.app.app_context():
+            get_session("SURVEY_URL").get(survey_url)
+            get_session("SURVEY_URL").get(survey_url)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_no_store_not_stored(self):
+        responses.add(responses.GET, survey_url, json=survey, headers={"ETag": etag, "Cache-Control": "no-store"})
+        with self.app.app_context():
+            get_session("SURVEY_URL").get(survey_url)
+            get_session("SURVEY_URL").get(survey_url)
+        self.assertNotIn("If-None-Match", responses.calls[1].request.headers)
+
+    @responses.activate
+    def test_response_without_validators_not_stored(self):
+        responses.add(responses.GET, survey_url, json=survey)
+        with self.app.app_context():
+            get_session("SURVEY_URL").get(survey_url)
+            get_session("SURVEY_URL").get(survey_url)
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(self.app.redis.keys("response-operations-ui:http-cache:survey:*"), [])
+
+    @responses.activate
+    def test_changed_response_replaces_stored_one(self):
+        updated_survey = {**survey, "shortName": "MBS2"}
+        responses.add(responses.GET, survey_url, json=survey, headers={"ETag": etag})
+        responses.add(responses.GET, survey_url, json=updated_survey, headers={"ETag": '"def456"'})
+        responses.add(
+            responses.GET,
+            survey_url,
+            status=304,
+            match=[matchers.header_matcher({"If-None-Match": '"def456"'})],
+        )
+        with self.app.app_context():
+            get_session("SURVEY_URL").get(survey_url)
+            self.assertEqual(get_session("SURVEY_URL").get(survey_url).json(), updated_survey)
+            self.assertEqual(get_session("SURVEY_URL").get(survey_url).json(), updated_survey)
+
+    @responses.activate
+    def test_query_parameters_cached_separately(self):
+        url = "http://localhost:8145/collectionexercises"
+        responses.add(responses.GET, url, json=[1], headers={"Cache-Control": "max-age=60"})
+        with self.app.app_context():
+            get_session("COLLECTION_EXERCISE_URL").get(url, params={"surveyId": "a"})
+            get_session("COLLECTION_EXERCISE_URL").get(url, params={"surveyId": "b"})
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_services_without_cache_not_cached(self):
+        party_url = "http://localhost:8081/party-api/v1/businesses/ref/49900000001"
+        responses.add(responses.GET, party_url, json={}, headers={"Cache-Control": "max-age=60"})
+        with self.app.app_context():
+            get_session("PARTY_URL").get(party_url)
+            get_session("PARTY_URL").get(party_url)
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_parse_cache_control(self):
+        self.assertEqual(
+            parse_cache_control('max-age=60, No-Cache, private="Set-Cookie"'),
+            {"max-age": "60", "no-cache": None, "private": "Set-Cookie"},
+        )
+        self.assertEqual(parse_cache_control(None), {})
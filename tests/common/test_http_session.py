@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+import responses
+from flask import g
+
+from response_operations_ui import create_app
+from response_operations_ui.common.deadline import start_deadline
+from response_operations_ui.common.http_session import get_session
+from response_operations_ui.exceptions.error_codes import ErrorCode
+from response_operations_ui.exceptions.exceptions import ExternalApiError
+
+party_url = "http://localhost:8081/party-api/v1/businesses/ref/49900000001"
+
+
+class TestHttpSession(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+
+    def test_get_session_returns_same_session_per_service(self):
+        with self.app.app_context():
+            self.assertIs(get_session("PARTY_URL"), get_session("PARTY_URL"))
+            self.assertIsNot(get_session("PARTY_URL"), get_session("CASE_URL"))
+
+    def test_get_session_mounts_configured_pool(self):
+        self.app.config["HTTP_POOL_MAXSIZE"] = 4
+        with self.app.app_context():
+            adapter = get_session("SURVEY_URL").get_adapter("http://localhost:8080")
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    def test_get_session_unknown_service_raises(self):
+        with self.app.app_context():
+            with self.assertRaises(KeyError):
+                get_session("NOT_A_SERVICE_URL")
+            with self.assertRaises(KeyError):
+                get_session("BASIC_AUTH")
+
+    def test_get_session_keep_alive_disabled(self):
+        self.app.config["HTTP_KEEP_ALIVE"] = False
+        with self.app.app_context():
+            self.assertEqual(get_session("CASE_URL").headers["Connection"], "close")
+
+    def test_sessions_discarded_after_fork(self):
+        with self.app.app_context():
+            session = get_session("PARTY_URL")
+            with patch("response_operations_ui.common.http_session.os.getpid", return_value=-1):
+                self.assertIsNot(get_session("PARTY_URL"), session)
+
+    @responses.activate
+    def test_session_used_for_request(self):
+        responses.add(responses.GET, party_url, json={"id": "123"}, status=200)
+        with self.app.app_context():
+            response = get_session("PARTY_URL").get(party_url)
+        self.assertEqual(response.json(), {"id": "123"})
+
+    @patch("requests.Session.request")
+    def test_service_timeouts_applied(self, mock_request):
+        self.app.config["PARTY_CONNECT_TIMEOUT"] = 1.5
+        self.app.config["PARTY_READ_TIMEOUT"] = 7
+        with self.app.app_context():
+            get_session("PARTY_URL").get(party_url)
+            get_session("PARTY_URL").get(party_url, timeout=(1, 2))
+        self.assertEqual(mock_request.call_args_list[0].kwargs["timeout"], (1.5, 7))
+        self.assertEqual(mock_request.call_args_list[1].kwargs["timeout"], (1, 2))
+
+    @patch("requests.Session.request")
+    def test_default_timeouts_used_when_no_service_override(self, mock_request):
+        with self.app.app_context():
+            get_session("IAC_URL").get("http://localhost:8121/iacs/123")
+        self.assertEqual(
+            mock_request.call_args.kwargs["timeout"],
+            (self.app.config["HTTP_CONNECT_TIMEOUT"], self.app.config["HTTP_READ_TIMEOUT"]),
+        )
+
+    @patch("requests.Session.request")
+    def test_timeout_clipped_to_request_deadline(self, mock_request):
+        with self.app.app_context():
+            start_deadline(2)
+            get_session("PARTY_URL").get(party_url)
+        connect_timeout, read_timeout = mock_request.call_args.kwargs["timeout"]
+        self.assertLessEqual(connect_timeout, self.app.config["HTTP_CONNECT_TIMEOUT"])
+        self.assertLessEqual(read_timeout, 2)
+
+    @patch("requests.Session.request")
+    def test_deadline_exceeded_fails_fast(self, mock_request):
+        with self.app.app_context():
+            g.request_deadline = 0
+            with self.assertRaises(ExternalApiError) as context:
+                get_session("COLLECTION_INSTRUMENT_URL").get("http://localhost:8002/collection-instrument-api")
+        mock_request.assert_not_called()
+        self.assertEqual(context.exception.error_code, ErrorCode.API_TIMEOUT_ERROR)
+        self.assertEqual(context.exception.target_service, "collection-instrument")
+
+    @patch("requests.Session.request", side_effect=requests.exceptions.ReadTimeout)
+    def test_timeout_within_deadline_raises_external_api_error(self, _):
+        with self.app.app_context():
+            start_deadline(1)
+            with self.assertRaises(ExternalApiError) as context:
+                get_session("PARTY_URL").get(party_url)
+        self.assertEqual(context.exception.error_code, ErrorCode.API_TIMEOUT_ERROR)
+        self.assertEqual(context.exception.target_service, "party")
+
+    @patch("requests.Session.request", side_effect=requests.exceptions.ReadTimeout)
+    def test_timeout_without_deadline_raises_external_api_error(self, _):
+        with self.app.app_context():
+            with self.assertRaises(ExternalApiError) as context:
+                get_session("PARTY_URL").get(party_url)
+        self.assertEqual(context.exception.error_code, ErrorCode.API_TIMEOUT_ERROR)
+        self.assertEqual(context.exception.target_service, "party")
+
+    def test_deadline_can_only_be_tightened(self):
+        with self.app.app_context():
+            start_deadline(5)
+            deadline = g.request_deadline
+            start_deadline(50)
+            self.assertEqual(g.request_deadline, deadline)
+            start_deadline(1)
+            self.assertLess(g.request_deadline, deadline)
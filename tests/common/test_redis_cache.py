@@ -9,11 +9,17 @@ from redis import RedisError
 
 from response_operations_ui import create_app
 from response_operations_ui.common.redis_cache import RedisCache
+from response_operations_ui.exceptions.error_codes import ErrorCode
+from response_operations_ui.exceptions.exceptions import ExternalApiError
 
 short_name = "MBS"
 survey_id = "427d40e6-f54a-4512-a8ba-e4dea54ea3dc"
 form_type = "0001"
 ci_version = "ci_version': 1"
+cir_metadata_url = (
+    "http://localhost:3030/collection-instruments/metadata"
+    f"?classifier_type=form_type&classifier_value={form_type}&language=en&survey_id={short_name}"
+)
 
 project_root = os.path.dirname(os.path.dirname(__file__))
 
@@ -109,13 +115,37 @@ class TestRedisCache(unittest.TestCase):
                 self.assertIn(form_type, str(result))
                 self.assertIn(ci_version, str(result))
 
+    def test_get_cir_metadata_error_cached_briefly(self):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, cir_metadata_url, status=404)
+            with self.app.app_context():
+                for _ in range(2):
+                    with self.assertRaises(ExternalApiError) as context:
+                        RedisCache().get_cir_metadata(short_name, formtype=form_type)
+                    self.assertEqual(context.exception.error_code, ErrorCode.NOT_FOUND)
+            self.assertEqual(len(rsps.calls), 1)
+        self.assertEqual(self.app.redis.ttl(f"response-operations-ui:cir-error:{short_name}:{form_type}"), 30)
+
+    def test_get_cir_metadata_empty_result_cached_briefly(self):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, cir_metadata_url, json=[], content_type="application/json")
+            with self.app.app_context():
+                self.assertEqual(RedisCache().get_cir_metadata(short_name, formtype=form_type), [])
+                self.assertEqual(RedisCache().get_cir_metadata(short_name, formtype=form_type), [])
+            self.assertEqual(len(rsps.calls), 1)
+        self.assertEqual(self.app.redis.ttl(f"response-operations-ui:cir:{short_name}:{form_type}"), 30)
+
     @patch("redis.StrictRedis.hvals")
-    def test_get_survey_list_in_cache(self, mock_redis_hvals):
+    @patch("response_operations_ui.common.survey_index.refresh_survey_list_in_background")
+    def test_get_survey_list_in_cache(self, mock_refresh_in_background, mock_redis_hvals):
         with self.app.app_context():
             cache = RedisCache()
             mock_redis_hvals.return_value = redis_survey_list
             result = cache.get_survey_list()
             self.assertEqual(survey_list, result)
+            mock_refresh_in_background.assert_called_once()
 
     @patch("redis.StrictRedis.hvals")
     @patch("response_operations_ui.common.redis_cache.RedisCache.refresh_survey_list")
@@ -164,7 +194,8 @@ class TestRedisCache(unittest.TestCase):
                     cache.refresh_survey_list()
                     log_message = "Refreshing cached survey list"
                     redis_key = "response-operations-ui:survey-list"
-                    self.assertEqual(600, self.app.redis.ttl(redis_key))
+                    self.assertEqual(86400, self.app.redis.ttl(redis_key))
+                    self.assertEqual(600, self.app.redis.ttl(f"{redis_key}:fresh"))
                     self.assertIn(cache.get_survey_list()[0], survey_list)
                     self.assertIn(log_message, log.output[0])
                     self.assertIn(redis_key, log.output[0])
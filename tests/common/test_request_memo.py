@@ -0,0 +1,119 @@
+import unittest
+from functools import partial
+from unittest.mock import MagicMock
+
+import responses
+
+from response_operations_ui import create_app
+from response_operations_ui.common.fan_out import fan_out
+from response_operations_ui.common.request_memo import (
+    get_request_memo,
+    log_duplicates_eliminated,
+    memoize_per_request,
+)
+from response_operations_ui.controllers.survey_controllers import (
+    get_survey_by_shortname,
+)
+from response_operations_ui.exceptions.exceptions import ApiError
+
+survey_url = "http://localhost:8080/surveys/shortname/MBS"
+survey = {"id": "cb0711c3-0ac8-41d3-ae0e-567e5ea1ef87", "shortName": "MBS"}
+
+
+def _memoize(fetch):
+    @memoize_per_request
+    def call(*args, **kwargs):
+        return fetch(*args, **kwargs)
+
+    return call
+
+
+class TestRequestMemo(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+
+    def test_call_made_once_per_request(self):
+        fetch = MagicMock(return_value={"id": "123"})
+        memoized = _memoize(fetch)
+        with self.app.test_request_context():
+            self.assertEqual(memoized("123"), {"id": "123"})
+            self.assertEqual(memoized("123"), {"id": "123"})
+            memoized("456")
+            memoized(survey_id="123")
+            memoized(survey_id="123")
+            duplicates = sum(get_request_memo().duplicates.values())
+        self.assertEqual(fetch.call_count, 3)
+        self.assertEqual(duplicates, 2)
+
+    def test_call_made_again_in_next_request(self):
+        fetch = MagicMock(return_value="result")
+        memoized = _memoize(fetch)
+        for _ in range(2):
+            with self.app.test_request_context():
+                memoized("123")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_callers_get_their_own_copy(self):
+        memoized = memoize_per_request(lambda: {"shortName": "MBS"})
+        with self.app.test_request_context():
+            memoized()["shortName"] = "changed"
+            self.assertEqual(memoized(), {"shortName": "MBS"})
+
+    def test_exceptions_not_remembered(self):
+        fetch = MagicMock(side_effect=[ValueError, "result"])
+        memoized = _memoize(fetch)
+        with self.app.test_request_context():
+            with self.assertRaises(ValueError):
+                memoized()
+            self.assertEqual(memoized(), "result")
+
+    def test_unhashable_arguments_not_memoized(self):
+        fetch = MagicMock(return_value="result")
+        memoized = _memoize(fetch)
+        with self.app.test_request_context():
+            memoized(["123"])
+            memoized(["123"])
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_called_outside_app_context(self):
+        fetch = MagicMock(return_value="result")
+        memoized = _memoize(fetch)
+        self.assertEqual(memoized(), "result")
+        self.assertEqual(memoized(), "result")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_memo_shared_with_fan_out(self):
+        fetch = MagicMock(return_value="result")
+        memoized = _memoize(fetch)
+        with self.app.test_request_context():
+            get_request_memo()
+            fan_out({"first": partial(memoized, "a"), "second": partial(memoized, "b")})
+            memoized("a")
+            memoized("b")
+        self.assertEqual(fetch.call_count, 2)
+
+    @responses.activate
+    def test_survey_by_shortname_fetched_once(self):
+        responses.add(responses.GET, survey_url, json=survey)
+        with self.app.test_request_context():
+            get_survey_by_shortname("MBS")
+            get_survey_by_shortname("MBS")
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_failed_survey_by_shortname_fetched_again(self):
+        responses.add(responses.GET, survey_url, status=500)
+        with self.app.test_request_context():
+            for _ in range(2):
+                with self.assertRaises(ApiError):
+                    get_survey_by_shortname("MBS")
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_duplicates_logged(self):
+        memoized = memoize_per_request(lambda: "result")
+        with self.app.test_request_context():
+            memoized()
+            memoized()
+            with self.assertLogs("response_operations_ui.common.request_memo", "DEBUG") as logs:
+                log_duplicates_eliminated()
+        self.assertIn('"duplicates_eliminated": 1', logs.output[0])
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+import responses
+
+from response_operations_ui import create_app
+from response_operations_ui.common.http_session import get_session
+from response_operations_ui.common.retry import RetryPolicy, parse_status_codes
+from response_operations_ui.exceptions.error_codes import ErrorCode
+from response_operations_ui.exceptions.exceptions import ExternalApiError
+
+party_url = "http://localhost:8081/party-api/v1/businesses/ref/49900000001"
+case_url = "http://localhost:8171/cases/123"
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(attempts=3, backoff=0.1, max_backoff=0.3, status_codes={502, 503})
+
+    def test_only_idempotent_methods_retried(self):
+        self.assertTrue(self.policy.is_retryable("GET", 1))
+        self.assertTrue(self.policy.is_retryable("head", 1))
+        self.assertFalse(self.policy.is_retryable("POST", 1))
+        self.assertFalse(self.policy.is_retryable("PUT", 1, 503))
+
+    def test_only_retryable_status_codes_retried(self):
+        self.assertTrue(self.policy.is_retryable("GET", 1, 503))
+        self.assertFalse(self.policy.is_retryable("GET", 1, 500))
+        self.assertFalse(self.policy.is_retryable("GET", 1, 404))
+
+    def test_attempts_limited(self):
+        self.assertTrue(self.policy.is_retryable("GET", 2))
+        self.assertFalse(self.policy.is_retryable("GET", 3))
+
+    def test_backoff_is_jittered_and_capped(self):
+        for attempt in range(1, 6):
+            backoff = self.policy.get_backoff(attempt)
+            self.assertGreaterEqual(backoff, 0)
+            self.assertLessEqual(backoff, min(0.3, 0.1 * 2 ** (attempt - 1)))
+
+    def test_parse_status_codes(self):
+        self.assertEqual(parse_status_codes("502, 503,504,"), {502, 503, 504})
+        self.assertEqual(parse_status_codes([429, "503"]), {429, 503})
+
+
+@patch("response_operations_ui.common.http_session.time.sleep")
+class TestServiceSessionRetry(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.config["HTTP_RETRY_ENABLED"] = True
+        self.app.config["PARTY_RETRY_ATTEMPTS"] = 3
+
+    @responses.activate
+    def test_get_retried_on_retryable_status(self, mock_sleep):
+        responses.add(responses.GET, party_url, status=503)
+        responses.add(responses.GET, party_url, json={"id": "123"}, status=200)
+        with self.app.app_context():
+            response = get_session("PARTY_URL").get(party_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(responses.calls), 2)
+        mock_sleep.assert_called_once()
+
+    @responses.activate
+    def test_last_response_returned_when_attempts_run_out(self, _):
+        responses.add(responses.GET, party_url, status=503)
+        with self.app.app_context():
+            response = get_session("PARTY_URL").get(party_url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_non_retryable_status_not_retried(self, mock_sleep):
+        responses.add(responses.GET, party_url, status=500)
+        with self.app.app_context():
+            get_session("PARTY_URL").get(party_url)
+        self.assertEqual(len(responses.calls), 1)
+        mock_sleep.assert_not_called()
+
+    @responses.activate
+    def test_post_not_retried(self, _):
+        responses.add(responses.POST, party_url, status=503)
+        with self.app.app_context():
+            get_session("PARTY_URL").post(party_url)
+        self.assertEqual(len(responses.calls), 1)
+
+    @patch("requests.Session.request", side_effect=requests.ConnectionError)
+    def test_connection_error_retried_then_raised(self, mock_request, _):
+        self.app.config["CASE_RETRY_ATTEMPTS"] = 2
+        with self.app.app_context():
+            with self.assertRaises(requests.ConnectionError):
+                get_session("CASE_URL").get(case_url)
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch("requests.Session.request", side_effect=requests.exceptions.ConnectTimeout)
+    def test_connect_timeout_retried_then_raised_as_timeout(self, mock_request, _):
+        self.app.config["CASE_RETRY_ATTEMPTS"] = 2
+        with self.app.app_context():
+            with self.assertRaises(ExternalApiError) as context:
+                get_session("CASE_URL").get(case_url)
+        self.assertEqual(context.exception.error_code, ErrorCode.API_TIMEOUT_ERROR)
+        self.assertEqual(mock_request.call_count, 2)
+
+    @responses.activate
+    def test_retry_logged_as_metric(self, _):
+        responses.add(responses.GET, party_url, status=502)
+        responses.add(responses.GET, party_url, status=200)
+        with self.app.app_context():
+            with self.assertLogs("response_operations_ui.common.http_session", "WARNING") as logs:
+                get_session("PARTY_URL").get(party_url)
+        self.assertIn("backend_call_retry", logs.output[0])
+
+    @responses.activate
+    def test_not_retried_when_deadline_too_close(self, mock_sleep):
+        responses.add(responses.GET, party_url, status=503)
+        with self.app.app_context():
+            with patch("response_operations_ui.common.http_session.time_remaining", side_effect=[None, 0.0]):
+                response = get_session("PARTY_URL").get(party_url)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(responses.calls), 1)
+        mock_sleep.assert_not_called()
+
+    @responses.activate
+    def test_retry_disabled(self, _):
+        self.app.config["HTTP_RETRY_ENABLED"] = False
+        responses.add(responses.GET, party_url, status=503)
+        with self.app.app_context():
+            get_session("PARTY_URL").get(party_url)
+        self.assertEqual(len(responses.calls), 1)
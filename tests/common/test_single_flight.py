@@ -0,0 +1,205 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+from redis import RedisError
+
+from response_operations_ui import create_app
+from response_operations_ui.common.single_flight import (
+    KEY_PREFIX,
+    SingleFlight,
+    coalesce,
+    single_flight,
+)
+
+survey_id = "cb0711c3-0ac8-41d3-ae0e-567e5ea1ef87"
+key = f"collection-exercises-by-survey:{survey_id}"
+lock_key = f"{KEY_PREFIX}:{key}:lock"
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_call(self):
+        in_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        fetch = MagicMock()
+
+        def slow_fetch():
+            fetch()
+            started.set()
+            release.wait(1)
+            return {"id": survey_id}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(in_flight.do(key, slow_fetch)))
+        leader.start()
+        started.wait(1)
+        follower = threading.Thread(target=lambda: results.append(in_flight.do(key, slow_fetch)))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        fetch.assert_called_once()
+        self.assertEqual(results, [{"id": survey_id}, {"id": survey_id}])
+        self.assertIsNot(results[0], results[1])
+
+    def test_leader_changing_its_result_does_not_change_followers(self):
+        in_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch():
+            started.set()
+            release.wait(1)
+            return {"shortName": "Sand&Gravel"}
+
+        def leader_call():
+            result = in_flight.do(key, slow_fetch)
+            result["shortName"] = "Sand & Gravel"
+
+        results = []
+        leader = threading.Thread(target=leader_call)
+        leader.start()
+        started.wait(1)
+        follower = threading.Thread(target=lambda: results.append(in_flight.do(key, slow_fetch)))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(results, [{"shortName": "Sand&Gravel"}])
+
+    def test_exception_shared_with_waiting_calls(self):
+        in_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def failing_fetch():
+            started.set()
+            release.wait(1)
+            raise ValueError("failed")
+
+        def call():
+            try:
+                in_flight.do(key, failing_fetch)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(1)
+        follower = threading.Thread(target=call)
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(len(errors), 2)
+
+    def test_nothing_kept_after_call(self):
+        in_flight = SingleFlight()
+        self.assertEqual(in_flight.do(key, lambda: 1), 1)
+        self.assertEqual(in_flight.do(key, lambda: 2), 2)
+
+
+class TestSingleFlightAcrossWorkers(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["SINGLE_FLIGHT_WAIT_SECONDS"] = 1
+
+    def test_leader_publishes_result_and_releases_lock(self):
+        with self.app.app_context():
+            result = single_flight(key, lambda: [{"id": "ce"}])
+        self.assertEqual(result, [{"id": "ce"}])
+        self.assertIsNone(self.app.redis.get(lock_key))
+        self.assertEqual(len(self.app.redis.keys(f"{KEY_PREFIX}:{key}:result:*")), 1)
+
+    def test_waits_for_other_workers_result(self):
+        self.app.redis.set(lock_key, "other-worker")
+
+        def publish():
+            time.sleep(0.1)
+            self.app.redis.set(f"{KEY_PREFIX}:{key}:result:other-worker", json.dumps([{"id": "ce"}]))
+
+        fetch = MagicMock()
+        publisher = threading.Thread(target=publish)
+        publisher.start()
+        with self.app.app_context():
+            result = single_flight(key, fetch)
+        publisher.join()
+        self.assertEqual(result, [{"id": "ce"}])
+        fetch.assert_not_called()
+
+    def test_calls_itself_when_other_worker_fails(self):
+        self.app.redis.set(lock_key, "other-worker")
+
+        def fail():
+            time.sleep(0.1)
+            self.app.redis.delete(lock_key)
+
+        failer = threading.Thread(target=fail)
+        failer.start()
+        with self.app.app_context():
+            result = single_flight(key, lambda: [{"id": "mine"}])
+        failer.join()
+        self.assertEqual(result, [{"id": "mine"}])
+
+    def test_gives_up_waiting_at_deadline(self):
+        self.app.redis.set(lock_key, "other-worker")
+        with self.app.app_context():
+            with patch("response_operations_ui.common.single_flight.time_remaining", return_value=0.1):
+                start = time.monotonic()
+                result = single_flight(key, lambda: [{"id": "mine"}])
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(result, [{"id": "mine"}])
+
+    def test_redis_error_makes_the_call(self):
+        with self.app.app_context():
+            with patch.object(self.app.redis, "pipeline", side_effect=RedisError):
+                self.assertEqual(single_flight(key, lambda: "result"), "result")
+
+    def test_lock_released_when_call_fails(self):
+        def fail():
+            raise ValueError
+
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                single_flight(key, fail)
+        self.assertIsNone(self.app.redis.get(lock_key))
+
+    def test_coalesce_keys_by_arguments(self):
+        fetch = MagicMock(side_effect=lambda survey: survey)
+        coalesced = coalesce("collection-exercises-by-survey")(fetch)
+        with self.app.app_context():
+            self.assertEqual(coalesced(survey_id), survey_id)
+        fetch.assert_called_once_with(survey_id)
+        self.assertEqual(len(self.app.redis.keys(f"{KEY_PREFIX}:{key}:result:*")), 1)
+
+    def test_lock_taken_by_another_worker_not_released(self):
+        def overrun():
+            # The call outlasts the lock and another worker takes it
+            self.app.redis.set(lock_key, "other-worker")
+            return [{"id": "ce"}]
+
+        with self.app.app_context():
+            self.assertEqual(single_flight(key, overrun), [{"id": "ce"}])
+        self.assertEqual(self.app.redis.get(lock_key), b"other-worker")
+
+    def test_lock_taken_by_another_worker_not_released_when_call_fails(self):
+        def overrun():
+            self.app.redis.set(lock_key, "other-worker")
+            raise ValueError
+
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                single_flight(key, overrun)
+        self.assertEqual(self.app.redis.get(lock_key), b"other-worker")
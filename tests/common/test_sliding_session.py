@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+
+import fakeredis
+from flask import session
+
+from response_operations_ui import create_app
+from response_operations_ui.common.sliding_session import (
+    create_sliding_session_interface,
+)
+
+
+class TestSlidingSession(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.config["SESSION_REDIS"] = self.redis = fakeredis.FakeRedis()
+        self.app.session_interface = create_sliding_session_interface(self.app)
+
+        @self.app.route("/test-session/<value>")
+        def set_value(value):
+            session["value"] = value
+            return ""
+
+        @self.app.route("/test-session")
+        def get_value():
+            return session.get("value", "")
+
+        self.client = self.app.test_client()
+
+    def test_unchanged_session_only_has_its_expiry_moved_on(self):
+        self.client.get("/test-session/a")
+        (store_id,) = self.redis.keys("session:*")
+        self.redis.expire(store_id, 10)
+
+        with patch.object(self.redis, "set", wraps=self.redis.set) as redis_set:
+            response = self.client.get("/test-session")
+
+        self.assertEqual(response.data, b"a")
+        redis_set.assert_not_called()
+        self.assertEqual(self.redis.ttl(store_id), self.app.config["PERMANENT_SESSION_LIFETIME"])
+
+    def test_changed_session_is_written(self):
+        self.client.get("/test-session/a")
+        self.client.get("/test-session/b")
+
+        self.assertEqual(self.client.get("/test-session").data, b"b")
+
+    def test_unchanged_session_that_has_expired_is_written_again(self):
+        interface = self.app.session_interface
+        unchanged_session = interface.session_class({"value": "a"}, sid="expired")
+
+        with self.app.app_context():
+            interface._upsert_session(self.app.permanent_session_lifetime, unchanged_session, "session:expired")
+
+        self.assertTrue(self.redis.exists("session:expired"))
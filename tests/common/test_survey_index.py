@@ -0,0 +1,178 @@
+import json
+import os
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import responses
+from redis import RedisError
+
+from config import TestingConfig
+from response_operations_ui import create_app
+from response_operations_ui.common.controller_cache import invalidate
+from response_operations_ui.common.survey_index import (
+    SurveyIndex,
+    read_survey_list,
+    store_survey_list,
+)
+from response_operations_ui.controllers import survey_controllers
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+
+with open(f"{project_root}/test_data/survey/survey_list.json") as json_data:
+    survey_list = json.load(json_data)
+
+url_get_surveys_list = f"{TestingConfig.SURVEY_URL}/surveys/surveytype/Business"
+survey_list_fresh_key = "response-operations-ui:survey-list:fresh"
+bres_id = "cb0711c3-0ac8-41d3-ae0e-567e5ea1ef87"
+social_survey = {"id": "social-survey-id", "shortName": "LMS", "surveyRef": "LMS", "surveyType": "Social"}
+
+
+class TestSurveyIndex(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.load = MagicMock(return_value=survey_list)
+        self.index = SurveyIndex(self.load)
+
+    def test_lookups_by_id_short_name_and_ref(self):
+        with self.app.app_context():
+            self.assertEqual(self.index.get_by_id(bres_id)["shortName"], "BRES")
+            self.assertEqual(self.index.get_by_short_name("bres")["id"], bres_id)
+            self.assertEqual(self.index.get_by_short_name(" B R E S ")["id"], bres_id)
+            self.assertEqual(self.index.get_by_ref("221")["id"], bres_id)
+            self.assertIsNone(self.index.get_by_ref("999"))
+        self.load.assert_called_once()
+
+    def test_lookups_get_a_copy(self):
+        with self.app.app_context():
+            self.index.get_by_id(bres_id)["shortName"] = "changed"
+            self.assertEqual(self.index.get_by_id(bres_id)["shortName"], "BRES")
+
+    def test_not_loaded_when_asked_not_to(self):
+        with self.app.app_context():
+            self.assertIsNone(self.index.get_by_id(bres_id, load=False))
+            self.load.assert_not_called()
+            self.index.get_by_ref("221")
+            self.assertEqual(self.index.get_by_id(bres_id, load=False)["shortName"], "BRES")
+
+    def test_reloaded_once_local_copy_expires(self):
+        self.app.config["SURVEY_INDEX_LOCAL_EXPIRY"] = 0
+        with self.app.app_context():
+            self.index.get_by_id(bres_id)
+            self.index.get_by_id(bres_id)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_refreshed_on_miss_when_asked(self):
+        with self.app.app_context():
+            self.assertIsNone(self.index.get_by_id("new-survey-id"))
+            self.assertEqual(self.load.call_count, 1)
+            self.assertIsNone(self.index.get_by_id("new-survey-id", refresh_on_miss=True))
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_surveys_outside_the_index_remembered(self):
+        with self.app.app_context():
+            self.index.remember("social-survey-id", social_survey)
+            self.assertEqual(self.index.get_by_id("social-survey-id"), social_survey)
+            self.index.clear()
+            self.assertIsNone(self.index.get_by_id("social-survey-id"))
+
+
+class TestSurveyIndexWithRedis(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["SURVEY_INDEX_REDIS_ENABLED"] = True
+        self.load = MagicMock(return_value=survey_list)
+        self.index = SurveyIndex(self.load)
+
+    def test_loaded_index_shared_through_redis(self):
+        with self.app.app_context():
+            self.index.get_by_id(bres_id)
+            other_worker = SurveyIndex(self.load)
+            self.assertEqual(other_worker.get_by_ref("221")["id"], bres_id)
+            self.assertEqual(len(read_survey_list(self.load)), len(survey_list))
+        self.load.assert_called_once()
+
+    def test_survey_list_stored_in_ref_order(self):
+        with self.app.app_context():
+            store_survey_list(survey_list)
+            refs = [survey["surveyRef"] for survey in read_survey_list(self.load)]
+        self.assertEqual(refs, sorted(refs))
+        self.assertEqual(self.app.redis.ttl("response-operations-ui:survey-list"), 86400)
+        self.assertEqual(self.app.redis.keys("response-operations-ui:survey-list:*"), [survey_list_fresh_key.encode()])
+        self.load.assert_not_called()
+
+    def test_stale_survey_list_served_while_refreshed_once_in_background(self):
+        refreshed_list = [{"id": "new-survey-id", "shortName": "NEW", "surveyRef": "999"}]
+        self.load.return_value = refreshed_list
+        with self.app.app_context():
+            store_survey_list(survey_list)
+            self.app.redis.delete(survey_list_fresh_key)
+            self.assertEqual(len(read_survey_list(self.load)), len(survey_list))
+            self.assertEqual(len(read_survey_list(self.load)), len(survey_list))
+            for _ in range(50):
+                if self.app.redis.exists(survey_list_fresh_key):
+                    break
+                time.sleep(0.05)
+            self.assertEqual(read_survey_list(self.load), refreshed_list)
+        self.load.assert_called_once()
+
+    def test_refresh_not_started_while_another_is_running(self):
+        with self.app.app_context():
+            store_survey_list(survey_list)
+            self.app.redis.delete(survey_list_fresh_key)
+            self.app.redis.set("response-operations-ui:survey-list:refresh-lock", "other-worker")
+            self.assertEqual(len(read_survey_list(self.load)), len(survey_list))
+        self.load.assert_not_called()
+
+    def test_invalidation_published_to_other_workers(self):
+        with self.app.app_context():
+            self.index.get_by_id(bres_id)
+            invalidate("survey-list")
+            for _ in range(50):
+                if self.index._loaded_at is None:
+                    break
+                time.sleep(0.05)
+            self.index.get_by_id(bres_id)
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_redis_error_loads_from_service(self):
+        with self.app.app_context():
+            with patch.object(self.app.redis, "hvals", side_effect=RedisError):
+                self.assertEqual(self.index.get_by_id(bres_id)["shortName"], "BRES")
+        self.load.assert_called_once()
+
+
+class TestSurveyControllersOnIndex(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+
+    @responses.activate
+    def test_lookups_share_one_survey_list_call(self):
+        responses.add(responses.GET, url_get_surveys_list, json=survey_list)
+        with self.app.app_context():
+            self.assertEqual(survey_controllers.get_survey_short_name_by_id("QOFDI_id"), "FDI")
+            self.assertEqual(survey_controllers.get_survey_ref_by_id(bres_id), "221")
+            self.assertEqual(survey_controllers.get_survey_id_by_short_name("BRES"), bres_id)
+            self.assertEqual(survey_controllers.get_survey_by_id(bres_id)["longName"], survey_list[0]["longName"])
+            self.assertEqual(survey_controllers.get_survey_by_ref("221")["id"], bres_id)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_survey_by_id_not_in_index_fetched_once(self):
+        responses.add(responses.GET, url_get_surveys_list, json=survey_list)
+        responses.add(responses.GET, f"{TestingConfig.SURVEY_URL}/surveys/social-survey-id", json=social_survey)
+        with self.app.app_context():
+            survey_controllers.get_survey_short_name_by_id(bres_id)
+            self.assertEqual(survey_controllers.get_survey_by_id("social-survey-id"), social_survey)
+            self.assertEqual(survey_controllers.get_survey_by_id("social-survey-id"), social_survey)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_survey_by_id_doesnt_load_index(self):
+        responses.add(responses.GET, f"{TestingConfig.SURVEY_URL}/surveys/{bres_id}", json=survey_list[0])
+        with self.app.app_context():
+            self.assertEqual(survey_controllers.get_survey_by_id(bres_id), survey_list[0])
+        self.assertEqual(len(responses.calls), 1)
@@ -1,6 +1,8 @@
 import time
 import unittest
+from unittest.mock import patch
 
+from flask import session
 from itsdangerous import BadSignature, SignatureExpired
 from werkzeug.exceptions import InternalServerError
 
@@ -8,6 +10,7 @@ from response_operations_ui import create_app
 from response_operations_ui.common.token_decoder import (
     decode_email_token,
     generate_token,
+    get_access_token_claims,
 )
 
 
@@ -36,3 +39,31 @@ class TestTokenDecoder(unittest.TestCase):
 
             with self.assertRaises(BadSignature):
                 decode_email_token("absoluterubbish")
+
+    @patch("response_operations_ui.common.token_decoder.decode_access_token")
+    def test_access_token_claims_are_decoded_once_until_they_expire(self, mock_decode):
+        mock_decode.return_value = {"user_id": "123", "exp": time.time() + 60}
+        with self.app.test_request_context():
+            session["token"] = "access-token"
+
+            self.assertEqual(get_access_token_claims()["user_id"], "123")
+            self.assertEqual(get_access_token_claims()["user_id"], "123")
+            self.assertEqual(mock_decode.call_count, 1)
+
+            mock_decode.return_value = {"user_id": "123", "exp": time.time() - 1}
+            session["token_claims"]["claims"]["exp"] = time.time() - 1
+            get_access_token_claims()
+            self.assertEqual(mock_decode.call_count, 2)
+
+    @patch("response_operations_ui.common.token_decoder.decode_access_token")
+    def test_access_token_claims_are_decoded_again_for_a_new_token(self, mock_decode):
+        mock_decode.side_effect = [
+            {"user_id": "123", "exp": time.time() + 60},
+            {"user_id": "456", "exp": time.time() + 60},
+        ]
+        with self.app.test_request_context():
+            session["token"] = "access-token"
+            get_access_token_claims()
+            session["token"] = "another-access-token"
+
+            self.assertEqual(get_access_token_claims()["user_id"], "456")
@@ -3,11 +3,14 @@ import json
 import os
 import unittest
 
+import fakeredis
 import requests_mock
 import responses
 
 from config import TestingConfig
 from response_operations_ui import create_app
+from response_operations_ui.common.cache_codec import decode
+from response_operations_ui.common.request_memo import clear_request_memo
 from response_operations_ui.controllers import collection_exercise_controllers
 from response_operations_ui.exceptions.exceptions import ApiError
 
@@ -17,6 +20,7 @@ survey_id = "02b9c366-7397-42f7-942a-76dc5876d86d"
 
 url_ce_by_survey = f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises/survey/{survey_id}"
 ce_events_by_id_url = f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises/{ce_id}/events"
+ce_by_id_url = f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises"
 ce_nudge_events_by_id_url = f"{TestingConfig.COLLECTION_EXERCISE_URL}/collectionexercises/{ce_id}/events/nudge"
 
 project_root = os.path.dirname(os.path.dirname(__file__))
@@ -122,3 +126,137 @@ class TestCollectionExerciseController(unittest.TestCase):
         with self.app.app_context():
             ce_list = collection_exercise_controllers.get_collection_exercises_by_survey(bres_survey["id"])
         self.assertEqual(ce_list, collection_exercises)
+
+    @requests_mock.mock()
+    def test_get_collection_exercises_by_ids(self, mock_request):
+        ce_id_2 = "14fb3e68-4dca-46db-bf49-04b84e07e77c"
+        mock_request.get(f"{ce_by_id_url}/{ce_id}", json={"id": ce_id})
+        mock_request.get(f"{ce_by_id_url}/{ce_id_2}", json={"id": ce_id_2})
+        with self.app.app_context():
+            collection_exercises = collection_exercise_controllers.get_collection_exercises_by_ids(
+                [ce_id, ce_id_2, ce_id]
+            )
+        self.assertEqual(collection_exercises, [{"id": ce_id}, {"id": ce_id_2}])
+        self.assertEqual(mock_request.call_count, 2)
+
+    @requests_mock.mock()
+    def test_get_collection_exercises_by_ids_uses_cache(self, mock_request):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"] = 60
+        ce_id_2 = "14fb3e68-4dca-46db-bf49-04b84e07e77c"
+        mock_request.get(f"{ce_by_id_url}/{ce_id}", json={"id": ce_id})
+        mock_request.get(f"{ce_by_id_url}/{ce_id_2}", json={"id": ce_id_2})
+        with self.app.app_context():
+            collection_exercise_controllers.get_collection_exercises_by_ids([ce_id])
+            collection_exercises = collection_exercise_controllers.get_collection_exercises_by_ids([ce_id_2, ce_id])
+        self.assertEqual(collection_exercises, [{"id": ce_id_2}, {"id": ce_id}])
+        self.assertEqual(
+            [request.url for request in mock_request.request_history],
+            [
+                f"{ce_by_id_url}/{ce_id}",
+                f"{ce_by_id_url}/{ce_id_2}",
+            ],
+        )
+
+    @requests_mock.mock()
+    def test_get_collection_exercises_by_ids_http_error(self, mock_request):
+        mock_request.get(f"{ce_by_id_url}/{ce_id}", status_code=500)
+        with self.app.app_context():
+            with self.assertRaises(ApiError):
+                collection_exercise_controllers.get_collection_exercises_by_ids([ce_id])
+
+    @requests_mock.mock()
+    def test_collection_exercises_cached_for_as_long_as_their_state_allows(self, mock_request):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"] = 60
+        collection_exercises = [
+            {"id": "ended-ce-id", "surveyId": survey_id, "state": "ENDED"},
+            {"id": "live-ce-id", "surveyId": survey_id, "state": "LIVE"},
+            {"id": "created-ce-id", "surveyId": survey_id, "state": "CREATED"},
+        ]
+        mock_request.get(url_ce_by_survey, json=collection_exercises)
+        with self.app.app_context():
+            collection_exercise_controllers.get_collection_exercises_by_survey(survey_id)
+            clear_request_memo()
+            self.assertEqual(
+                collection_exercise_controllers.get_collection_exercises_by_survey(survey_id), collection_exercises
+            )
+            self.assertEqual(
+                collection_exercise_controllers.get_collection_exercise_by_id("ended-ce-id"), collection_exercises[0]
+            )
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(self.app.redis.ttl("response-operations-ui:collection-exercise:ended-ce-id"), 86400)
+        self.assertEqual(self.app.redis.ttl("response-operations-ui:collection-exercise:live-ce-id"), 3600)
+        self.assertEqual(self.app.redis.ttl("response-operations-ui:collection-exercise:created-ce-id"), 60)
+        self.assertEqual(
+            self.app.redis.ttl(f"response-operations-ui:collection-exercises-by-survey:{survey_id}"),
+            60,
+        )
+
+    @requests_mock.mock()
+    def test_collection_exercise_write_invalidates_it_and_its_survey(self, mock_request):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"] = 60
+        collection_exercise = {"id": ce_id, "surveyId": survey_id, "state": "LIVE", "userDescription": "Old"}
+        updated_collection_exercise = {**collection_exercise, "userDescription": "New"}
+        mock_request.get(url_ce_by_survey, [{"json": [collection_exercise]}, {"json": [updated_collection_exercise]}])
+        mock_request.put(f"{ce_by_id_url}/{ce_id}/userDescription")
+        with self.app.app_context():
+            collection_exercise_controllers.get_collection_exercises_by_survey(survey_id)
+            collection_exercise_controllers.update_collection_exercise_user_description(ce_id, "New")
+            self.assertEqual(
+                collection_exercise_controllers.get_collection_exercises_by_survey(survey_id),
+                [updated_collection_exercise],
+            )
+        self.assertEqual(
+            decode(self.app.redis.get(f"response-operations-ui:collection-exercise:{ce_id}")),
+            updated_collection_exercise,
+        )
+
+    @requests_mock.mock()
+    def test_collection_exercise_write_invalidates_its_survey_once_it_is_no_longer_cached(self, mock_request):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"] = 60
+        collection_exercise = {"id": ce_id, "surveyId": survey_id, "state": "LIVE", "userDescription": "Old"}
+        mock_request.get(url_ce_by_survey, json=[collection_exercise])
+        mock_request.get(f"{ce_by_id_url}/{ce_id}", json=collection_exercise)
+        mock_request.put(f"{ce_by_id_url}/{ce_id}/userDescription")
+        with self.app.app_context():
+            collection_exercise_controllers.get_collection_exercises_by_survey(survey_id)
+            self.app.redis.delete(f"response-operations-ui:collection-exercise:{ce_id}")
+            collection_exercise_controllers.update_collection_exercise_user_description(ce_id, "New")
+        self.assertIsNone(self.app.redis.get(f"response-operations-ui:collection-exercises-by-survey:{survey_id}"))
+
+    @requests_mock.mock()
+    def test_live_collection_exercises_not_cached_past_their_end(self, mock_request):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["COLLECTION_EXERCISE_CACHE_EXPIRY"] = 60
+        now = datetime.datetime.now(datetime.timezone.utc)
+        collection_exercises = [
+            {
+                "id": "ending-ce-id",
+                "surveyId": survey_id,
+                "state": "LIVE",
+                "scheduledEndDateTime": (now + datetime.timedelta(minutes=10)).isoformat(),
+            },
+            {
+                "id": "ended-ce-id",
+                "surveyId": survey_id,
+                "state": "LIVE",
+                "scheduledEndDateTime": (now - datetime.timedelta(minutes=10)).isoformat(),
+            },
+        ]
+        mock_request.get(url_ce_by_survey, json=collection_exercises)
+        with self.app.app_context():
+            collection_exercise_controllers.get_collection_exercises_by_survey(survey_id)
+        self.assertIn(self.app.redis.ttl("response-operations-ui:collection-exercise:ending-ce-id"), range(590, 601))
+        self.assertEqual(self.app.redis.ttl("response-operations-ui:collection-exercise:ended-ce-id"), 60)
+
+    @requests_mock.mock()
+    def test_create_collection_exercise_invalidates_its_survey(self, mock_request):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.redis.set(f"response-operations-ui:collection-exercises-by-survey:{survey_id}", "[]")
+        mock_request.post(f"{ce_by_id_url}", status_code=201)
+        with self.app.app_context():
+            collection_exercise_controllers.create_collection_exercise(survey_id, "BRES", "Description", "202401")
+        self.assertIsNone(self.app.redis.get(f"response-operations-ui:collection-exercises-by-survey:{survey_id}"))
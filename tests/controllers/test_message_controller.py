@@ -1,11 +1,15 @@
+import time
 import unittest
 from unittest.mock import patch
 
+import jwt
 import responses
+from flask import session
 
 from config import TestingConfig
 from response_operations_ui import create_app
 from response_operations_ui.controllers.message_controllers import (
+    _get_jwt,
     get_all_conversation_type_counts,
     patch_message,
     patch_thread,
@@ -99,3 +103,18 @@ class TestMessageController(unittest.TestCase):
             with self.app.app_context():
                 with self.assertRaises(ApiError):
                     patch_thread(thread_id, payload)
+
+    @patch("response_operations_ui.controllers.message_controllers.current_user")
+    @patch("response_operations_ui.common.token_decoder.decode_access_token")
+    def test_get_jwt_is_reused_within_a_session(self, mock_decode, _):
+        mock_decode.return_value = {"user_id": "123", "exp": time.time() + 60}
+        with self.app.test_request_context():
+            session["token"] = "access-token"
+            sm_token = _get_jwt()
+
+            self.assertEqual(_get_jwt(), sm_token)
+            self.assertEqual(mock_decode.call_count, 1)
+            self.assertEqual(
+                jwt.decode(sm_token, TestingConfig.SECURE_MESSAGE_JWT_SECRET, algorithms=["HS256"]),
+                {"party_id": "123", "role": "internal"},
+            )
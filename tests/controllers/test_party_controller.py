@@ -1,8 +1,11 @@
 import json
 import os
+import threading
 import unittest
 from collections import namedtuple
+from functools import partial
 
+import fakeredis
 import mock
 import requests_mock
 import responses
@@ -10,9 +13,12 @@ from requests.exceptions import ConnectionError, Timeout
 
 from config import TestingConfig
 from response_operations_ui import create_app
-from response_operations_ui.controllers import party_controller
+from response_operations_ui.common.fan_out import fan_out
+from response_operations_ui.controllers import party_controller, survey_controllers
+from response_operations_ui.exceptions.error_codes import ErrorCode
 from response_operations_ui.exceptions.exceptions import (
     ApiError,
+    ExternalApiError,
     SearchRespondentsException,
     ServiceUnavailableException,
 )
@@ -73,7 +79,46 @@ class TestPartyController(unittest.TestCase):
                 output = party_controller.get_respondent_enrolments(respondent_json)
             self.assertEqual(output, expected_enrolments_output)
 
-    @mock.patch("requests.get")
+    def test_respondent_enrolments_misses_fetched_at_the_same_time_within_fan_out(self):
+        # As on the respondent details page, where the enrolments are fanned out with the respondent's account.  Each
+        # fetch waits for the other three, so they only all finish if they're made at the same time
+        fetched_together = threading.Barrier(4, timeout=5)
+
+        def fetch(responses_by_id, requested_id):
+            fetched_together.wait()
+            return responses_by_id[requested_id]
+
+        businesses = {business_id: business_by_id_json, business_id_2: business_by_id_cf3e316a_json}
+        surveys = {survey_id: survey_json, survey_id_2: survey_06cad526_json}
+        with (
+            mock.patch.object(party_controller, "get_business_by_party_id", partial(fetch, businesses)),
+            mock.patch.object(survey_controllers, "get_survey_by_id", partial(fetch, surveys)),
+        ):
+            with self.app.app_context():
+                output = fan_out(
+                    {
+                        "enrolments": partial(party_controller.get_respondent_enrolments, respondent_json),
+                        "account": lambda: None,
+                    }
+                )
+        self.assertEqual(output["enrolments"], expected_enrolments_output)
+
+    def test_get_businesses_by_party_ids_uses_cache(self):
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.app.config["BUSINESS_CACHE_EXPIRY"] = 60
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, get_business_by_id_url + business_id, json=business_by_id_json)
+            rsps.add(rsps.GET, get_business_by_id_url + business_id_2, json=business_by_id_cf3e316a_json)
+
+            with self.app.app_context():
+                party_controller.get_businesses_by_party_ids([business_id])
+                businesses = party_controller.get_businesses_by_party_ids([business_id_2, business_id, business_id_2])
+            self.assertEqual(
+                businesses, {business_id: business_by_id_json, business_id_2: business_by_id_cf3e316a_json}
+            )
+            self.assertEqual(len(rsps.calls), 2)
+
+    @mock.patch("requests.Session.get")
     def test_import_search_respondents_raises_error_when_request_to_party_fails(self, requests_mock):
         with self.app.app_context():
             # Mock setups
@@ -159,7 +204,7 @@ class TestPartyController(unittest.TestCase):
         # When get_respondents_by_survey_and_business_id is called
         with self.app.app_context():
 
-            # Then a ServiceUnavailableException is raised with the correct error
-            with self.assertRaises(ServiceUnavailableException) as exception:
+            # Then an ExternalApiError is raised with the timeout error code
+            with self.assertRaises(ExternalApiError) as exception:
                 party_controller.get_respondents_by_survey_and_business_id(survey_id, business_id)
-        self.assertEqual(["Party has timed out"], exception.exception.errors)
+        self.assertEqual(ErrorCode.API_TIMEOUT_ERROR, exception.exception.error_code)
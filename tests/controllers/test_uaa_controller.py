@@ -1,7 +1,8 @@
 import json
 import os
+import time
 import unittest
-from datetime import datetime, timedelta
+from datetime import datetime
 from unittest.mock import patch
 
 import jwt
@@ -177,7 +178,7 @@ class TestUAAController(unittest.TestCase):
     def test_get_groups_connection_error(self, mock_request):
         mock_request.post(url_uaa_token, json={"access_token": self.access_token}, status_code=201)
         with self.app.test_request_context():
-            with patch("requests.get", side_effect=requests.ConnectionError):
+            with patch("requests.Session.get", side_effect=requests.ConnectionError):
                 with self.assertRaises(ServiceUnavailableException) as exception:
                     uaa_controller.get_groups()
         self.assertEqual(503, exception.exception.status_code)
@@ -187,12 +188,41 @@ class TestUAAController(unittest.TestCase):
     def test_get_groups_timeout(self, mock_request):
         mock_request.post(url_uaa_token, json={"access_token": self.access_token}, status_code=201)
         with self.app.test_request_context():
-            with patch("requests.get", side_effect=requests.Timeout):
+            with patch("requests.Session.get", side_effect=requests.Timeout):
                 with self.assertRaises(ServiceUnavailableException) as exception:
                     uaa_controller.get_groups()
         self.assertEqual(504, exception.exception.status_code)
         self.assertEqual(["UAA has timed out"], exception.exception.errors)
 
+    # login_admin
+
+    @requests_mock.mock()
+    def test_admin_token_is_shared_until_it_expires(self, mock_request):
+        mock_request.post(url_uaa_token, json={"access_token": self.access_token, "expires_in": 3600}, status_code=201)
+        mock_request.get(url_uaa_groups, json=get_groups_success_json, status_code=200)
+        with self.app.test_request_context():
+            uaa_controller.get_groups()
+            uaa_controller.get_groups()
+
+            self.assertEqual(mock_request.request_history[0].url.split("?")[0], url_uaa_token)
+            self.assertEqual([request.method for request in mock_request.request_history], ["POST", "GET", "GET"])
+            self.assertLessEqual(self.app.redis.ttl("response-operations-ui:uaa-admin-token"), 3540)
+
+    @requests_mock.mock()
+    def test_admin_token_is_replaced_once_when_rejected(self, mock_request):
+        mock_request.post(
+            url_uaa_token,
+            [
+                {"json": {"access_token": "revoked", "expires_in": 3600}},
+                {"json": {"access_token": self.access_token, "expires_in": 3600}},
+            ],
+        )
+        mock_request.get(url_uaa_groups, [{"status_code": 401}, {"json": get_groups_success_json}])
+        with self.app.test_request_context():
+            self.assertEqual(uaa_controller.get_groups(), get_groups_success_json)
+            self.assertEqual(self.app.redis.get("response-operations-ui:uaa-admin-token").decode(), self.access_token)
+        self.assertEqual(mock_request.request_history[-1].headers["Authorization"], f"Bearer {self.access_token}")
+
     # create_user_account_with_random_password
 
     @requests_mock.mock()
@@ -287,31 +317,77 @@ class TestUAAController(unittest.TestCase):
             self.assertEqual(output.json(), password_change_success_json)
 
     @patch("response_operations_ui.controllers.uaa_controller.refresh_permissions")
-    def test_user_has_permission_refresh_permissions_isoformat(self, refresh_permissions):
+    def test_user_has_permission_refresh_permissions_expired(self, refresh_permissions):
         with self.app.test_request_context():
-            session["permissions"] = {
-                "groups": test_groups,
-                "expiry": datetime.isoformat(datetime.now() + timedelta(minutes=-5)),
-            }
+            session["permissions"] = {"groups": ["oauth.approvals"], "fetched_at": time.time() - 301}
             uaa_controller.user_has_permission("oauth.approvals", user_id)
             refresh_permissions.assert_called_with(user_id)
             self.assertTrue(uaa_controller.user_has_permission("oauth.approvals", user_id))
 
     @patch("response_operations_ui.controllers.uaa_controller.refresh_permissions")
-    def test_user_has_permission_refresh_permissions_datetime(self, refresh_permissions):
+    def test_user_has_permission_refreshes_permissions_in_the_old_format(self, refresh_permissions):
+        def refresh(_):
+            session["permissions"] = {"groups": ["oauth.approvals"], "fetched_at": time.time()}
+
+        refresh_permissions.side_effect = refresh
         with self.app.test_request_context():
-            session["permissions"] = {
-                "groups": test_groups,
-                "expiry": str(datetime.now() + timedelta(minutes=-5)),
-            }
-            uaa_controller.user_has_permission("oauth.approvals", user_id)
-            refresh_permissions.assert_called_with(user_id)
+            session["permissions"] = {"groups": test_groups, "expiry": datetime.isoformat(datetime.now())}
             self.assertTrue(uaa_controller.user_has_permission("oauth.approvals", user_id))
+            refresh_permissions.assert_called_once_with(user_id)
+
+    @patch("response_operations_ui.controllers.uaa_controller.refresh_permissions")
+    def test_user_has_permission_is_an_exact_match(self, refresh_permissions):
+        with self.app.test_request_context():
+            session["permissions"] = {"groups": ["oauth.approvals"], "fetched_at": time.time()}
+            self.assertFalse(uaa_controller.user_has_permission("oauth", user_id))
+            refresh_permissions.assert_not_called()
+
+    def test_user_has_permission_does_not_call_redis_until_permissions_are_due_a_refresh(self):
+        with self.app.test_request_context():
+            session["permissions"] = {"groups": ["oauth.approvals"], "fetched_at": time.time() - 200}
+            with patch.object(self.app, "redis") as redis:
+                self.assertTrue(uaa_controller.user_has_permission("oauth.approvals", user_id))
+            self.assertEqual(redis.mock_calls, [])
+
+    @requests_mock.mock()
+    def test_permissions_are_refreshed_in_the_background_before_they_expire(self, mock_request):
+        mock_request.post(url_uaa_token, json={"access_token": self.access_token}, status_code=201)
+        mock_request.get(url_uaa_user_by_id, json=uaa_user_by_id_json, status_code=200)
+        with self.app.test_request_context():
+            session["permissions"] = {"groups": [], "fetched_at": time.time() - 250}
+            with patch("response_operations_ui.controllers.uaa_controller.threading.Thread") as thread:
+                self.assertFalse(uaa_controller.user_has_permission("oauth.approvals", user_id))
+                thread.call_args.kwargs["target"]()
+
+        with self.app.test_request_context():
+            session["permissions"] = {"groups": [], "fetched_at": time.time() - 250}
+            self.assertTrue(uaa_controller.user_has_permission("oauth.approvals", user_id))
+            self.assertGreater(session["permissions"]["fetched_at"], time.time() - 5)
+
+    @requests_mock.mock()
+    def test_permissions_are_refreshed_once_group_membership_changes(self, mock_request):
+        mock_request.post(url_uaa_token, json={"access_token": self.access_token}, status_code=201)
+        mock_request.get(url_uaa_user_by_id, json=uaa_user_by_id_json, status_code=200)
+        mock_request.delete(url_uaa_remove_from_group, json=uaa_group_remove_success_json, status_code=200)
+        with self.app.test_request_context():
+            session["user_id"] = user_id
+            session["permissions"] = {"groups": [], "fetched_at": time.time() - 1}
+            self.assertFalse(uaa_controller.user_has_permission("oauth.approvals"))
+
+            uaa_controller.remove_group_membership(user_id, group_id)
+
+            self.assertTrue(uaa_controller.user_has_permission("oauth.approvals"))
+
+    @requests_mock.mock()
+    def test_other_sessions_refresh_permissions_once_due_after_group_membership_changes(self, mock_request):
+        mock_request.post(url_uaa_token, json={"access_token": self.access_token}, status_code=201)
+        mock_request.get(url_uaa_user_by_id, json=uaa_user_by_id_json, status_code=200)
+        mock_request.delete(url_uaa_remove_from_group, json=uaa_group_remove_success_json, status_code=200)
+        with self.app.test_request_context():
+            session["user_id"] = "admin-user-id"
+            uaa_controller.remove_group_membership(user_id, group_id)
 
-    def test_user_has_permission_with_an_incorrect_datetime_format(self):
         with self.app.test_request_context():
-            incorrect_date_format = str((datetime.now().strftime("%d/%m/%Y, %H:%M:%S")))
-            session["permissions"] = {"groups": test_groups, "expiry": incorrect_date_format}
-            with self.assertRaises(ValueError) as e:
-                uaa_controller.user_has_permission("oauth.approvals", user_id)
-            self.assertEqual(e.exception.args[0], f"Invalid isoformat string: {incorrect_date_format!r}")
+            session["user_id"] = user_id
+            session["permissions"] = {"groups": [], "fetched_at": time.time() - 250}
+            self.assertTrue(uaa_controller.user_has_permission("oauth.approvals"))
@@ -14,7 +14,7 @@ class TestErrorHandlers(unittest.TestCase):
         )
         self.app = self.app.test_client()
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_exception_error_page(self, mock_post):
         mock_post.side_effect = Exception("error")
         response = self.app.post(
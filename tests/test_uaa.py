@@ -1,5 +1,8 @@
+import time
 import unittest
+from unittest.mock import patch
 
+import fakeredis
 import requests_mock
 
 from config import TestingConfig
@@ -10,6 +13,7 @@ from response_operations_ui.common import uaa
 class TestUaa(unittest.TestCase):
     def setUp(self):
         self.app = create_app("TestingConfig")
+        self.token_keys_url = f'{self.app.config["UAA_SERVICE_URL"]}/token_keys'
 
     def test_get_uaa_public_key_with_config_set(self):
         with self.app.app_context():
@@ -17,7 +21,7 @@ class TestUaa(unittest.TestCase):
 
     @requests_mock.mock()
     def test_get_uaa_public_key_with_no_config_set(self, mock_request):
-        mock_request.get(f'{self.app.config["UAA_SERVICE_URL"]}/token_key', json={"value": "Test"})
+        mock_request.get(self.token_keys_url, json={"keys": [{"kid": "key-1", "value": "Test"}]})
         self.app.config["UAA_PUBLIC_KEY"] = None
         with self.app.app_context():
             self.assertEqual("Test", uaa.get_uaa_public_key())
@@ -27,7 +31,7 @@ class TestUaa(unittest.TestCase):
         """When the getting of the public key fails a HTTPError exception is raised.  This test, however,
         assertIsNone because the exception is consumed, an exception is logged and then returns None.
         """
-        mock_request.get(f'{self.app.config["UAA_SERVICE_URL"]}/token_key', status_code=500)
+        mock_request.get(self.token_keys_url, status_code=500)
         self.app.config["UAA_PUBLIC_KEY"] = None
         with self.app.app_context():
             self.assertIsNone(uaa.get_uaa_public_key())
@@ -37,7 +41,86 @@ class TestUaa(unittest.TestCase):
         """When there isn't a 'value' key in the returned json, a KeyError exception is raised.  This test, however,
         assertIsNone because the exception is consumed, an exception is logged and then returns None.
         """
-        mock_request.get(f'{self.app.config["UAA_SERVICE_URL"]}/token_key', json={"notvalue": "text"})
+        mock_request.get(self.token_keys_url, json={"keys": [{"kid": "key-1", "notvalue": "text"}]})
         self.app.config["UAA_PUBLIC_KEY"] = None
         with self.app.app_context():
             self.assertIsNone(uaa.get_uaa_public_key())
+
+    @requests_mock.mock()
+    def test_get_uaa_public_key_by_kid(self, mock_request):
+        mock_request.get(
+            self.token_keys_url, json={"keys": [{"kid": "key-1", "value": "Old"}, {"kid": "key-2", "value": "New"}]}
+        )
+        self.app.config["UAA_PUBLIC_KEY"] = None
+        with self.app.app_context():
+            self.assertEqual("Old", uaa.get_uaa_public_key("key-1"))
+            self.assertEqual("New", uaa.get_uaa_public_key("key-2"))
+        self.assertEqual(mock_request.call_count, 1)
+
+    @requests_mock.mock()
+    def test_failed_fetch_is_not_retried_until_the_refetch_interval_has_passed(self, mock_request):
+        mock_request.get(self.token_keys_url, status_code=500)
+        self.app.config["UAA_PUBLIC_KEY"] = None
+        with self.app.app_context():
+            self.assertIsNone(uaa.get_uaa_public_key("key-1"))
+            self.assertIsNone(uaa.get_uaa_public_key("key-1"))
+        self.assertEqual(mock_request.call_count, 1)
+
+    @requests_mock.mock()
+    def test_unknown_kid_is_fetched_once_per_refetch_interval(self, mock_request):
+        mock_request.get(
+            self.token_keys_url,
+            [
+                {"json": {"keys": [{"kid": "key-1", "value": "Old"}]}},
+                {"json": {"keys": [{"kid": "key-1", "value": "Old"}, {"kid": "key-2", "value": "New"}]}},
+            ],
+        )
+        self.app.config["UAA_PUBLIC_KEY"] = None
+        with self.app.app_context():
+            self.assertEqual("Old", uaa.get_uaa_public_key("key-1"))
+            self.assertIsNone(uaa.get_uaa_public_key("key-2"))
+            self.assertEqual(mock_request.call_count, 1)
+
+            # Once the refetch interval has passed, the lock in redis has expired
+            self.app.redis.delete(f"{uaa.KEY_PREFIX}:refetch-lock")
+            with patch("response_operations_ui.common.uaa.time.monotonic", return_value=time.monotonic() + 31):
+                self.assertEqual("New", uaa.get_uaa_public_key("key-2"))
+        self.assertEqual(mock_request.call_count, 2)
+
+    @requests_mock.mock()
+    def test_signing_keys_are_shared_between_workers(self, mock_request):
+        mock_request.get(self.token_keys_url, json={"keys": [{"kid": "key-1", "value": "Test"}]})
+        self.app.config["UAA_PUBLIC_KEY"] = None
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        with self.app.app_context():
+            uaa.get_uaa_public_key("key-1")
+            self.app.uaa_signing_keys = uaa.SigningKeyCache()
+
+            self.assertEqual("Test", uaa.get_uaa_public_key("key-1"))
+        self.assertEqual(mock_request.call_count, 1)
+
+    @requests_mock.mock()
+    def test_rotated_key_fetched_by_another_worker_is_read_from_redis(self, mock_request):
+        mock_request.get(
+            self.token_keys_url,
+            [
+                {"json": {"keys": [{"kid": "key-1", "value": "Old"}]}},
+                {"json": {"keys": [{"kid": "key-1", "value": "Old"}, {"kid": "key-2", "value": "New"}]}},
+            ],
+        )
+        self.app.config["UAA_PUBLIC_KEY"] = None
+        self.app.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        worker_a = uaa.SigningKeyCache()
+        worker_b = uaa.SigningKeyCache()
+        with self.app.app_context():
+            self.assertEqual("Old", worker_a.get("key-1"))
+            self.assertEqual("Old", worker_b.get("key-1"))
+
+            # Worker a fetches the rotated key once the refetch lock taken at startup has expired
+            self.app.redis.delete(f"{uaa.KEY_PREFIX}:refetch-lock")
+            with patch("response_operations_ui.common.uaa.time.monotonic", return_value=time.monotonic() + 31):
+                self.assertEqual("New", worker_a.get("key-2"))
+
+            # Worker b hasn't got the lock, but finds the key worker a put in redis
+            self.assertEqual("New", worker_b.get("key-2"))
+        self.assertEqual(mock_request.call_count, 2)
@@ -2,6 +2,9 @@ import json
 import os
 import unittest
 from pathlib import Path
+from unittest.mock import patch
+
+from flask import session
 
 from response_operations_ui import create_app
 
@@ -45,3 +48,84 @@ class TestInfo(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('"name":"response-operations-ui"'.encode(), response.data)
         self.assertNotIn('"test":"test"'.encode(), response.data)
+
+    def test_info_does_not_call_redis(self):
+        app = create_app("TestingConfig")
+        app.config["CIRCUIT_BREAKER_ENABLED"] = True
+        app.config["HTTP_CACHE_ENABLED"] = True
+        app.config["CACHE_METRICS_ENABLED"] = True
+        with patch.object(app, "redis") as redis:
+            response = app.test_client().get("/info")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json), {"name", "version"})
+        self.assertEqual(redis.mock_calls, [])
+
+    def test_info_metrics_shows_circuit_breaker_states(self):
+        app = create_app("TestingConfig")
+        app.config["CIRCUIT_BREAKER_ENABLED"] = True
+        response = app.test_client().get("/info/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["circuit_breakers"]["party"], "closed")
+
+    def test_info_metrics_shows_http_cache_stats(self):
+        app = create_app("TestingConfig")
+        app.config["HTTP_CACHE_ENABLED"] = True
+        response = app.test_client().get("/info/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("survey", response.json["http_cache"])
+        self.assertNotIn("party", response.json["http_cache"])
+
+    def test_info_metrics_shows_cache_metrics(self):
+        app = create_app("TestingConfig")
+        app.config["CACHE_METRICS_ENABLED"] = True
+        app.cache_metrics.record("survey", "misses", 0.002)
+        response = app.test_client().get("/info/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["cache"]["survey"]["misses"], 1)
+        self.assertEqual(response.json["cache"]["survey"]["latency_ms"]["<=5"], 1)
+
+    def test_info_metrics_requires_sign_in(self):
+        app = create_app("TestingConfig")
+        app.config["LOGIN_DISABLED"] = False
+        app.config["CIRCUIT_BREAKER_ENABLED"] = True
+        response = app.test_client().get("/info/metrics")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/sign-in", response.headers["Location"])
+
+    def test_info_metrics_not_found_when_disabled(self):
+        response = self.client.get("/info/metrics")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_info_and_static_are_handled_without_a_session(self):
+        app = create_app("TestingConfig")
+        client = app.test_client()
+        with patch.object(app.session_interface.interface, "open_session") as open_session:
+            with patch("flask_wtf.csrf.CSRFProtect.protect") as protect:
+                info_response = client.get("/info")
+                static_response = client.get("/static/css/main.css")
+
+        self.assertEqual(info_response.status_code, 200)
+        self.assertEqual(static_response.status_code, 200)
+        self.assertNotIn("Set-Cookie", info_response.headers)
+        self.assertNotIn("Set-Cookie", static_response.headers)
+        open_session.assert_not_called()
+        protect.assert_not_called()
+
+    def test_only_sessionless_paths_are_without_a_session(self):
+        app = create_app("TestingConfig")
+        for path, sessionless in (
+            ("/info", True),
+            ("/info/", True),
+            ("/info/metrics", False),
+            ("/information", False),
+            ("/static/css/main.css", True),
+            ("/", False),
+        ):
+            with app.test_request_context(path):
+                self.assertEqual(app.session_interface.is_null_session(session), sessionless, path)
@@ -1,7 +1,6 @@
 import copy
 import json
 import os
-from contextlib import suppress
 from unittest.mock import MagicMock, patch
 
 import fakeredis
@@ -279,8 +278,7 @@ class TestSurvey(ViewTestCase):
     @requests_mock.mock()
     def test_get_survey_short_name_by_id_when_get_list_fails(self, mock_request):
         # Delete any existing survey cache
-        with suppress(AttributeError):
-            del self.app.surveys_dict
+        self.app.survey_index.clear()
 
         with self.app.app_context():
             # API error on first attempt